@@ -0,0 +1,102 @@
+"""
+응답 직렬화 벤치마크 (대기자 200명 목록)
+- 기존 경로: jsonable_encoder + json.dumps (FastAPI 기본 JSONResponse)
+- 변경 경로: services.fast_json.dumps (orjson)
+- SSE 프레임: json.dumps vs sse_frame
+
+사용법: cd backend && python benchmark_serialization.py [대기자 수] [반복 횟수]
+DB/서버 없이 목록 응답과 같은 모양의 데이터를 만들어 요청당 CPU 시간만 비교
+"""
+import json
+import sys
+import time
+from datetime import date, datetime, time as dt_time, timedelta
+
+from fastapi.encoders import jsonable_encoder
+
+from services.fast_json import dumps, orjson, sse_frame
+
+ENTRIES = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+ROUNDS = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+
+def make_waiting_list(count: int) -> list:
+    """build_waiting_list 결과와 같은 모양의 대기자 목록"""
+    now = datetime(2026, 10, 19, 10, 0, 0)
+    class_info = {
+        "id": 1, "class_number": 1, "class_name": "1교시",
+        "start_time": dt_time(10, 0), "end_time": dt_time(10, 50),
+        "max_capacity": 20, "is_active": True,
+        "weekday_schedule": {day: True for day in ("mon", "tue", "wed", "thu", "fri", "sat", "sun")},
+        "class_type": "all", "created_at": now, "updated_at": now, "current_count": 0
+    }
+    rows = []
+    for i in range(count):
+        registered_at = now + timedelta(seconds=i * 30)
+        rows.append({
+            "id": i + 1, "business_date": date(2026, 10, 19), "waiting_number": i + 1,
+            "phone": f"010{i:08d}", "name": f"회원{i}", "class_id": 1, "class_order": i + 1,
+            "member_id": i + 1, "is_empty_seat": False, "status": "waiting",
+            "registered_at": registered_at, "attended_at": None, "cancelled_at": None,
+            "call_count": 0, "last_called_at": None,
+            "message": f"대기번호 {i + 1}번\n1교시 {i + 1}번째",
+            "last_month_attendance_count": i % 7, "revisit_count": i % 3,
+            "created_at": registered_at, "updated_at": registered_at,
+            "class_info": class_info,
+            "member": {"id": i + 1, "name": f"회원{i}", "phone": f"010{i:08d}", "created_at": now},
+            "total_party_size": 1, "party_size_details": None
+        })
+    return rows
+
+
+def legacy_dumps(content) -> bytes:
+    """기존 JSONResponse 경로"""
+    return json.dumps(
+        jsonable_encoder(content), ensure_ascii=False, allow_nan=False,
+        indent=None, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def measure(label: str, func) -> float:
+    func()  # 워밍업
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        func()
+    per_call = (time.process_time() - start) / ROUNDS * 1000
+    print(f"  {label:<44} {per_call:8.3f} ms/요청")
+    return per_call
+
+
+def compare(title: str, legacy, fast):
+    print(title)
+    before = measure("기존", legacy)
+    after = measure("변경", fast)
+    saved = before - after
+    ratio = before / after if after else float("inf")
+    print(f"  -> 요청당 {saved:.3f} ms 절감 ({ratio:.1f}배)\n")
+
+
+def main():
+    print(f"대기자 {ENTRIES}명, {ROUNDS}회 반복 (orjson {'사용' if orjson else '미설치 - json.dumps 대체'})\n")
+
+    waiting_list = make_waiting_list(ENTRIES)
+    assert json.loads(legacy_dumps(waiting_list)) == json.loads(dumps(waiting_list))
+    compare(
+        "[/api/waiting/list] 직접 만든 dict 목록",
+        lambda: legacy_dumps(waiting_list),
+        lambda: dumps(waiting_list)
+    )
+
+    payloads = [
+        {"event": "status_changed", "data": {"waiting_id": row["id"], "status": "called"}, "store_id": "1"}
+        for row in waiting_list
+    ]
+    compare(
+        f"[SSE] 이벤트 프레임 {ENTRIES}개",
+        lambda: [f"data: {json.dumps(payload)}\n\n" for payload in payloads],
+        lambda: [sse_frame(payload) for payload in payloads]
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+JSON 응답 압축 (gzip / brotli)
+- application/json 응답 본문이 COMPRESSION_MIN_SIZE 이상일 때만 압축 (대기 목록, 통계, 회원 목록 등)
+- text/event-stream(SSE), 스트리밍 응답, 정적/첨부 파일은 압축하지 않음
+- brotli 패키지 설치 시 Accept-Encoding에 br이 있으면 brotli 우선
+- 압축한 응답의 ETag는 약한 ETag(W/)로 바꾸고 Vary: Accept-Encoding 추가
+- BaseHTTPMiddleware는 SSE와 충돌하므로 순수 ASGI 미들웨어로 구현
+"""
+import gzip
+import os
+from typing import Optional
+
+import anyio
+from starlette.datastructures import Headers, MutableHeaders
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+COMPRESSION_ENABLED = os.getenv("COMPRESSION_ENABLED", "true").lower() != "false"
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+# 이 크기 이상은 이벤트 루프를 막지 않도록 스레드에서 압축
+THREAD_THRESHOLD = 256 * 1024
+
+COMPRESSIBLE_TYPES = frozenset({"application/json"})
+EXCLUDED_TYPES = frozenset({"text/event-stream"})
+
+
+def choose_encoding(accept_encoding: str) -> Optional[str]:
+    """클라이언트가 받을 수 있는 압축 방식 (q=0 제외)"""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _is_compressible(status: int, headers: Headers) -> bool:
+    if status < 200 or status in (204, 304):
+        return False
+    if "content-encoding" in headers or "content-range" in headers:
+        return False
+    media_type = headers.get("content-type", "").split(";")[0].strip().lower()
+    return media_type in COMPRESSIBLE_TYPES and media_type not in EXCLUDED_TYPES
+
+
+class CompressionMiddleware:
+    """JSON 응답 압축 (순수 ASGI)"""
+
+    def __init__(self, app, minimum_size: int = COMPRESSION_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not COMPRESSION_ENABLED or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+            if passthrough:
+                await send(message)
+                return
+
+            if message["type"] == "http.response.start":
+                if _is_compressible(message["status"], Headers(raw=message["headers"])):
+                    # 본문 크기를 확인할 때까지 보류
+                    start_message = message
+                else:
+                    passthrough = True
+                    await send(message)
+                return
+
+            body = message.get("body", b"")
+            # 스트리밍 응답이거나 작은 응답은 그대로 전송
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if len(body) >= THREAD_THRESHOLD:
+                compressed = await anyio.to_thread.run_sync(compress, body, encoding)
+            else:
+                compressed = compress(body, encoding)
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers.add_vary_header("Accept-Encoding")
+            if len(compressed) >= len(body):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            etag = headers.get("etag")
+            if etag and not etag.startswith("W/"):
+                # 압축 표현은 원본과 바이트가 다르므로 약한 ETag (If-None-Match 비교는 그대로 동작)
+                headers["ETag"] = "W/" + etag
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -1,6 +1,6 @@
 import logging
 import sqlalchemy
-from sqlalchemy import inspect, text, Column
+from sqlalchemy import inspect, text, Column, func, select, and_
 from sqlalchemy.orm import DeclarativeMeta
 from typing import List, Type
 from database import engine
@@ -99,3 +99,70 @@ def check_and_migrate_table(model: Type[DeclarativeMeta]):
                 except Exception as e:
                     logger.error(f"Failed to add column '{col.name}' to '{table_name}': {e}")
                     # We don't raise here to attempt adding other columns
+
+
+def ensure_indexes(model: Type[DeclarativeMeta]):
+    """
+    Create indexes declared in the model's __table_args__ that are missing on an existing table.
+    create_all only creates indexes together with new tables.
+    Failures (e.g. existing rows violating a new unique index) are logged, not raised.
+    """
+    table = model.__table__
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return
+
+    existing = {index['name'] for index in inspector.get_indexes(table.name)}
+    for index in table.indexes:
+        if index.name in existing:
+            continue
+        try:
+            index.create(bind=engine)
+            logger.info(f"Created index '{index.name}' on '{table.name}'.")
+        except Exception as e:
+            logger.error(f"Failed to create index '{index.name}' on '{table.name}': {e}")
+            if index.unique:
+                log_duplicate_rows(index)
+
+
+def find_duplicate_rows(index, limit: int = 20) -> List[tuple]:
+    """
+    Rows blocking a unique index: [("col=value, ...", [primary keys])] for up to `limit` duplicate keys.
+    Honours the partial index WHERE clause of the current dialect.
+    """
+    table = index.table
+    columns = list(index.columns)
+    where = index.dialect_options[engine.dialect.name].get("where") if engine.dialect.name in ("sqlite", "postgresql") else None
+    pk = list(table.primary_key.columns)
+
+    groups = select(*columns).group_by(*columns).having(func.count() > 1).limit(limit)
+    if where is not None:
+        groups = groups.where(where)
+
+    duplicates = []
+    with engine.connect() as conn:
+        for key in conn.execute(groups).all():
+            rows = select(*pk).where(and_(*[c == v for c, v in zip(columns, key)])).order_by(*pk)
+            if where is not None:
+                rows = rows.where(where)
+            ids = [row[0] if len(pk) == 1 else tuple(row) for row in conn.execute(rows)]
+            duplicates.append((", ".join(f"{c.name}={v}" for c, v in zip(columns, key)), ids))
+    return duplicates
+
+
+def log_duplicate_rows(index) -> None:
+    """Log which rows prevent a unique index from being created and how to fix it."""
+    try:
+        duplicates = find_duplicate_rows(index)
+    except Exception as e:
+        logger.error(f"Could not look up duplicate rows for '{index.name}': {e}")
+        return
+    if not duplicates:
+        return
+    details = "; ".join(f"({key}) -> {index.table.name} ids {ids}" for key, ids in duplicates)
+    logger.warning(
+        f"Unique index '{index.name}' was NOT created because existing rows share the same key "
+        f"({len(duplicates)} keys shown): {details}. "
+        f"Resolve them (e.g. cancel or delete all but one row per key) and restart to create the index; "
+        f"until then duplicates are only prevented by the application check."
+    )
@@ -0,0 +1,104 @@
+"""
+CSV/XLSX 스트리밍 내보내기 유틸리티
+- CSV: 배치 단위로 생성하여 제너레이터로 전송
+- XLSX: openpyxl write-only 모드로 임시 파일에 기록 후 청크 단위로 전송
+- 모든 조회는 전용 세션과 yield_per를 사용하여 메모리 사용량을 일정하게 유지
+"""
+import csv
+import io
+import tempfile
+from datetime import date, datetime
+from typing import Any, Callable, List, Sequence, Tuple
+
+import openpyxl
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Query, Session
+
+from database import SessionLocal
+
+# (헤더명, 행 -> 값 변환 함수)
+ExportColumn = Tuple[str, Callable[[Any], Any]]
+
+EXPORT_BATCH_SIZE = 1000
+FILE_CHUNK_SIZE = 64 * 1024
+
+CSV_MEDIA_TYPE = "text/csv; charset=utf-8"
+XLSX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _cell_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, date):
+        return value.strftime("%Y-%m-%d")
+    return value
+
+
+def _iter_rows(build_query: Callable[[Session], Query], columns: Sequence[ExportColumn]):
+    db = SessionLocal()
+    try:
+        for row in build_query(db).yield_per(EXPORT_BATCH_SIZE):
+            yield [_cell_value(getter(row)) for _, getter in columns]
+    finally:
+        db.close()
+
+
+def _csv_stream(build_query: Callable[[Session], Query], columns: Sequence[ExportColumn]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    # 엑셀에서 한글이 깨지지 않도록 BOM 추가
+    buffer.write("\ufeff")
+    writer.writerow([header for header, _ in columns])
+
+    for i, values in enumerate(_iter_rows(build_query, columns), start=1):
+        writer.writerow(values)
+        if i % EXPORT_BATCH_SIZE == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate(0)
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+def _xlsx_stream(build_query: Callable[[Session], Query], columns: Sequence[ExportColumn], sheet_title: str):
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet(title=sheet_title)
+    ws.append([header for header, _ in columns])
+
+    for values in _iter_rows(build_query, columns):
+        ws.append(values)
+
+    with tempfile.TemporaryFile() as tmp:
+        wb.save(tmp)
+        tmp.seek(0)
+        while True:
+            chunk = tmp.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+def stream_export(
+    build_query: Callable[[Session], Query],
+    columns: List[ExportColumn],
+    filename: str,
+    file_format: str = "csv",
+    sheet_title: str = "Sheet1"
+) -> StreamingResponse:
+    """
+    쿼리 결과를 CSV 또는 XLSX 파일로 스트리밍
+    - filename: 확장자를 제외한 파일명 (ASCII)
+    """
+    if file_format == "xlsx":
+        content = _xlsx_stream(build_query, columns, sheet_title)
+        media_type = XLSX_MEDIA_TYPE
+    else:
+        content = _csv_stream(build_query, columns)
+        media_type = CSV_MEDIA_TYPE
+
+    return StreamingResponse(
+        content,
+        media_type=media_type,
+        headers={"Content-Disposition": f"attachment; filename={filename}.{file_format}"}
+    )
@@ -0,0 +1,121 @@
+"""
+정적 파일 / 첨부파일 캐시 헤더
+- 파일 내용 해시(sha256)로 강한 ETag 생성 (파일 경로 + 수정 시각 + 크기 기준으로 해시 캐시)
+- 내용 해시가 포함된 URL(?v=해시)은 1년 immutable, 그 외는 짧은 max-age(STATIC_MAX_AGE) 후 ETag 재검증(304)
+- 템플릿은 static_url()로 버전 URL을 만들어 사용 (Jinja 전역 함수로 등록)
+- 해시 계산(파일 읽기)은 이벤트 루프를 막지 않도록 스레드에서 수행
+- 업로드 첨부파일은 저장 파일명이 매번 새로 생성되어 내용이 바뀌지 않으므로 항상 장기 캐시
+"""
+import hashlib
+import os
+import stat
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs
+
+from fastapi import Request
+from fastapi.responses import FileResponse, Response
+from starlette.datastructures import Headers
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+LONG_MAX_AGE = 365 * 24 * 60 * 60
+# 버전 없는 정적 파일 캐시 시간 (초) - 배포 후 이 시간 안에 새 파일로 교체됨
+STATIC_MAX_AGE = int(os.getenv("STATIC_MAX_AGE", "300"))
+VERSION_LENGTH = 12
+STATIC_DIR = "static"
+STATIC_URL_PREFIX = "/static"
+IMMUTABLE_CACHE_CONTROL = f"public, max-age={LONG_MAX_AGE}, immutable"
+STATIC_CACHE_CONTROL = f"public, max-age={STATIC_MAX_AGE}"
+
+_hashes: Dict[str, Tuple[int, int, str]] = {}  # 경로: (수정 시각, 크기, 해시)
+_lock = threading.Lock()
+
+
+def file_hash(path: str, stat_result: Optional[os.stat_result] = None) -> str:
+    """파일 내용 sha256 (수정 시각/크기가 같으면 캐시된 값 사용)"""
+    path = os.fspath(path)
+    stat_result = stat_result or os.stat(path)
+    cached = _hashes.get(path)
+    if cached and cached[0] == stat_result.st_mtime_ns and cached[1] == stat_result.st_size:
+        return cached[2]
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b""):
+            digest.update(chunk)
+    value = digest.hexdigest()
+    with _lock:
+        _hashes[path] = (stat_result.st_mtime_ns, stat_result.st_size, value)
+    return value
+
+
+def static_url(path: str) -> str:
+    """
+    정적 파일 버전 URL (/static/경로?v=내용 해시 앞 12자리 - HashedStaticFiles가 장기 캐시로 응답)
+    - 템플릿: {{ static_url('js/index.js') }}
+    - 파일이 없으면 버전 없이 반환
+    """
+    path = path.lstrip("/")
+    try:
+        digest = file_hash(os.path.join(STATIC_DIR, path))
+    except OSError:
+        return f"{STATIC_URL_PREFIX}/{path}"
+    return f"{STATIC_URL_PREFIX}/{path}?v={digest[:VERSION_LENGTH]}"
+
+
+def content_etag(body: bytes) -> str:
+    """응답 본문 내용 기반 강한 ETag"""
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    return etag in [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+
+
+class HashedStaticFiles(StaticFiles):
+    """내용 해시 ETag + 버전 URL 장기 캐시를 적용한 정적 파일"""
+
+    def lookup_path(self, path: str) -> Tuple[str, Optional[os.stat_result]]:
+        # StaticFiles가 스레드에서 호출 - 여기서 해시를 미리 계산해 file_response는 캐시만 사용
+        full_path, stat_result = super().lookup_path(path)
+        if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+            file_hash(full_path, stat_result)
+        return full_path, stat_result
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        digest = file_hash(full_path, stat_result)
+        version = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("v", [""])[0]
+        versioned = version == digest[:VERSION_LENGTH]
+
+        headers = {
+            "ETag": f'"{digest}"',
+            "Cache-Control": IMMUTABLE_CACHE_CONTROL if versioned else STATIC_CACHE_CONTROL,
+        }
+        response = FileResponse(full_path, status_code=status_code, headers=headers, stat_result=stat_result)
+        if _etag_matches(Headers(scope=scope).get("if-none-match"), headers["ETag"]):
+            return NotModifiedResponse(response.headers)
+        return response
+
+
+def cached_file_response(request: Request, path, immutable: bool = False, public: bool = True,
+                         **kwargs) -> Response:
+    """
+    파일 응답 + 내용 해시 ETag
+    - immutable: 같은 URL의 내용이 바뀌지 않는 경우(업로드 첨부파일 등) 장기 캐시
+    - If-None-Match 일치 시 304
+    - 파일을 읽어 해시하므로 동기(def) 엔드포인트에서 호출 (스레드풀 실행)
+    """
+    digest = file_hash(path)
+    etag = f'"{digest}"'
+    scope = "public" if public else "private"
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"{scope}, max-age={LONG_MAX_AGE}, immutable" if immutable else f"{scope}, no-cache",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return FileResponse(path, headers=headers, **kwargs)
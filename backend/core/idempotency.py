@@ -0,0 +1,230 @@
+"""
+대기열 변경 요청 멱등성 처리 (Idempotency-Key)
+- 대기 등록/상태 변경 등 변경 요청에 Idempotency-Key 헤더가 있으면 첫 응답을 짧은 시간 보관
+- 같은 키로 재시도하면 요청을 다시 실행하지 않고 보관된 응답을 그대로 반환 (중복 등록/중복 브로드캐스트 방지)
+- 첫 요청이 처리 중일 때 도착한 재시도는 완료를 기다렸다가 같은 응답 반환
+- 같은 키를 다른 요청 본문에 재사용하면 422
+- 5xx/409/429 등 일시적 응답은 보관하지 않음 (재시도 시 다시 실행)
+- 키는 인증 정보(Authorization/쿠키/매장 ID)별로 구분하여 다른 사용자의 응답이 재생되지 않도록 함
+- BaseHTTPMiddleware는 SSE와 충돌하므로 순수 ASGI 미들웨어로 구현
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from core.logger import logger
+
+IDEMPOTENCY_ENABLED = os.getenv("IDEMPOTENCY_ENABLED", "true").lower() != "false"
+# 응답 보관 시간 (초)
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "300"))
+# 처리 중인 첫 요청을 기다리는 최대 시간 (초)
+IN_FLIGHT_WAIT_SECONDS = 15.0
+MAX_KEY_LENGTH = 255
+# 만료 항목 정리 주기 (저장 횟수)
+PRUNE_EVERY = 200
+
+_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+_PATHS = (
+    re.compile(r"^/api/(waiting|board)(/|$)"),
+    re.compile(r"^/api/public/waiting/[^/]+/register$"),
+)
+# 보관하지 않는 일시적 응답 (5xx는 별도 처리)
+_TRANSIENT_STATUSES = frozenset({408, 409, 425, 429})
+# 재생 시 그대로 돌려줄 응답 헤더
+_REPLAY_HEADERS = frozenset({b"content-type", b"retry-after", b"location"})
+
+
+@dataclass
+class StoredResponse:
+    fingerprint: str
+    expires_at: float
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+    status: Optional[int] = None
+    headers: List[Tuple[bytes, bytes]] = field(default_factory=list)
+    body: bytes = b""
+
+
+class IdempotencyStore:
+    """키별 응답 보관 (프로세스 메모리)"""
+
+    def __init__(self):
+        self._entries: Dict[str, StoredResponse] = {}
+        self._stores = 0
+        self.replayed = 0
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        entry = self._entries.get(key)
+        if entry and entry.expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        return entry
+
+    def begin(self, key: str, fingerprint: str) -> StoredResponse:
+        entry = StoredResponse(fingerprint=fingerprint, expires_at=time.monotonic() + IDEMPOTENCY_TTL)
+        self._entries[key] = entry
+        self._stores += 1
+        if self._stores % PRUNE_EVERY == 0:
+            self._prune()
+        return entry
+
+    def discard(self, key: str, entry: StoredResponse) -> None:
+        """보관하지 않을 응답 - 기다리던 재시도는 직접 실행하도록 깨움"""
+        if self._entries.get(key) is entry:
+            del self._entries[key]
+        entry.done.set()
+
+    def _prune(self) -> None:
+        now = time.monotonic()
+        expired = [key for key, entry in self._entries.items() if entry.expires_at < now]
+        for key in expired:
+            del self._entries[key]
+
+    def stats(self) -> dict:
+        return {
+            "enabled": IDEMPOTENCY_ENABLED,
+            "ttl_seconds": IDEMPOTENCY_TTL,
+            "entries": len(self._entries),
+            "replayed": self.replayed,
+        }
+
+
+idempotency_store = IdempotencyStore()
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+def _scope_key(scope, idempotency_key: str) -> str:
+    """요청자(인증 정보/매장) + 메서드/경로 + 키"""
+    owner = "|".join(
+        _header(scope, name) or "" for name in (b"authorization", b"cookie", b"x-store-id")
+    )
+    raw = f"{owner}\n{scope['method']} {scope['path']}\n{idempotency_key}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class IdempotencyMiddleware:
+    """Idempotency-Key 헤더가 있는 대기열 변경 요청의 응답 보관/재생 (순수 ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    async def _send_json(send, status: int, detail: str) -> None:
+        body = json.dumps({"detail": detail}, ensure_ascii=False).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": status,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    @staticmethod
+    async def _replay(send, entry: StoredResponse) -> None:
+        idempotency_store.replayed += 1
+        headers = [(k, v) for k, v in entry.headers if k in _REPLAY_HEADERS]
+        headers.append((b"content-length", str(len(entry.body)).encode()))
+        headers.append((b"idempotent-replayed", b"true"))
+        await send({"type": "http.response.start", "status": entry.status, "headers": headers})
+        await send({"type": "http.response.body", "body": entry.body})
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not IDEMPOTENCY_ENABLED
+            or scope["method"] not in _METHODS
+            or not any(pattern.match(scope["path"]) for pattern in _PATHS)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        idempotency_key = _header(scope, b"idempotency-key")
+        if not idempotency_key:
+            await self.app(scope, receive, send)
+            return
+        if len(idempotency_key) > MAX_KEY_LENGTH:
+            await self._send_json(send, 400, "Idempotency-Key가 너무 깁니다.")
+            return
+
+        # 요청 본문을 읽어 지문 계산 후 하위 앱에 다시 전달
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                return
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+        fingerprint = hashlib.sha256(
+            scope.get("query_string", b"") + b"\n" + body
+        ).hexdigest()
+
+        key = _scope_key(scope, idempotency_key)
+        while True:
+            entry = idempotency_store.get(key)
+            if entry is None:
+                break
+            if entry.fingerprint != fingerprint:
+                await self._send_json(send, 422, "같은 Idempotency-Key가 다른 요청에 사용되었습니다.")
+                return
+            if not entry.done.is_set():
+                try:
+                    await asyncio.wait_for(entry.done.wait(), IN_FLIGHT_WAIT_SECONDS)
+                except asyncio.TimeoutError:
+                    await self._send_json(send, 409, "같은 요청이 처리 중입니다. 잠시 후 다시 시도해주세요.")
+                    return
+            if entry.status is not None:
+                await self._replay(send, entry)
+                return
+            # 첫 요청이 보관되지 않고 끝남 (일시적 오류) - 다시 확인 후 먼저 깨어난 요청 하나만 새로 실행
+
+        entry = idempotency_store.begin(key, fingerprint)
+        body_sent = False
+
+        async def replay_receive():
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        status = None
+        headers: List[Tuple[bytes, bytes]] = []
+        response_chunks = []
+
+        async def capture_send(message):
+            nonlocal status, headers
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = [(k.lower(), v) for k, v in message.get("headers", [])]
+            elif message["type"] == "http.response.body":
+                response_chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+        except Exception:
+            idempotency_store.discard(key, entry)
+            raise
+
+        if status is None or status >= 500 or status in _TRANSIENT_STATUSES:
+            idempotency_store.discard(key, entry)
+            return
+        entry.status = status
+        entry.headers = headers
+        entry.body = b"".join(response_chunks)
+        entry.done.set()
+        logger.debug(f"[Idempotency] stored {scope['method']} {scope['path']} status={status}")
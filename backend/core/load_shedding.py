@@ -0,0 +1,190 @@
+"""
+우선순위 기반 부하 차단 (load shedding)
+- 요청을 경로/메서드로 분류: critical(대기 등록/호출/상태 변경/고객 조회) > normal(현황판/목록 조회) > low(통계/출석 리포트/내보내기)
+- 이벤트 루프 지연과 DB 커넥션 풀(쓰기 + 읽기 전용 복제본) 사용률을 주기적으로 측정하여 부하 단계 판단
+  - elevated: low 요청 즉시 거절
+  - severe: low + normal 요청 거절 (critical은 항상 처리)
+- low 요청은 평상시에도 동시 실행 수를 제한하고 잠시 대기열에서 기다리게 함
+- 거절 시 503 + Retry-After
+- BaseHTTPMiddleware는 SSE와 충돌하므로 순수 ASGI 미들웨어로 구현
+"""
+import asyncio
+import json
+import os
+import re
+from collections import defaultdict
+from typing import Dict, List, Pattern, Tuple
+
+from core.logger import logger
+import database
+
+CRITICAL, NORMAL, LOW = "critical", "normal", "low"
+
+LOAD_SHEDDING_ENABLED = os.getenv("LOAD_SHEDDING_ENABLED", "true").lower() != "false"
+# 이벤트 루프 지연 임계값 (초)
+LOOP_LAG_ELEVATED = float(os.getenv("LOOP_LAG_ELEVATED_SECONDS", "0.1"))
+LOOP_LAG_SEVERE = float(os.getenv("LOOP_LAG_SEVERE_SECONDS", "0.5"))
+# DB 풀 사용률 임계값 (checked out / (pool_size + max_overflow))
+POOL_USAGE_ELEVATED = 0.8
+# 측정 주기 (초)
+MONITOR_INTERVAL = 0.5
+# low 요청 동시 실행 수 및 대기 시간 (초)
+LOW_PRIORITY_CONCURRENCY = int(os.getenv("LOW_PRIORITY_CONCURRENCY", "4"))
+LOW_PRIORITY_QUEUE_TIMEOUT = 2.0
+RETRY_AFTER_SECONDS = 5
+
+# (메서드 집합 또는 None(전체), 경로 패턴, 우선순위) - 위에서부터 먼저 일치하는 규칙 적용
+_RULES: List[Tuple[frozenset, Pattern, str]] = [
+    (frozenset({"POST", "PUT", "DELETE", "PATCH"}), re.compile(r"^/api/(waiting|board)(/|$)"), CRITICAL),
+    (None, re.compile(r"^/api/public/waiting/[^/]+/(register|status|ticket)"), CRITICAL),
+    (None, re.compile(r"^/api/auth(/|$)"), CRITICAL),
+    # 장시간 유지되는 SSE 스트림은 low 동시 실행 슬롯을 점유하지 않도록 normal로 분류
+    (None, re.compile(r"^.*/sse/stream$"), NORMAL),
+    (None, re.compile(r"^/api/franchise/stats(/|$)"), LOW),
+    (None, re.compile(r"^/api/stores/[^/]+/stats$"), LOW),
+    # 출석 현황/순위/신규 회원 리포트 (기간 집계)
+    (None, re.compile(r"^/api/attendance(/|$)"), LOW),
+    # 시스템 관리자 분석 대시보드/통계 (모니터링용 /api/system/load 등은 normal 유지)
+    (None, re.compile(r"^/api/system/(stats(/|$)|franchises/[^/]+/stats$)"), LOW),
+    (None, re.compile(r"^/api/(exports|debug)(/|$)"), LOW),
+    (None, re.compile(r"^/logs(/|$)"), LOW),
+]
+
+
+def classify(method: str, path: str) -> str:
+    """요청 우선순위 분류"""
+    for methods, pattern, priority in _RULES:
+        if (methods is None or method in methods) and pattern.match(path):
+            return priority
+    return NORMAL
+
+
+class LoadMonitor:
+    """이벤트 루프 지연 / DB 풀 사용률 측정 및 부하 단계 판단"""
+
+    def __init__(self):
+        self.loop_lag = 0.0  # 지수 평활 이벤트 루프 지연 (초)
+        self._low_slots: asyncio.Semaphore = None
+        self._counters: Dict[Tuple[str, str], int] = defaultdict(int)
+
+    @staticmethod
+    def _usage(pool) -> float:
+        try:
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            return pool.checkedout() / capacity if capacity > 0 else 0.0
+        except (AttributeError, TypeError):
+            # QueuePool 이외(StaticPool 등)는 측정하지 않음
+            return 0.0
+
+    @classmethod
+    def pool_usage(cls) -> float:
+        """쓰기/읽기 전용 풀 중 더 혼잡한 쪽의 사용률 (통계/목록 조회는 복제본 풀 사용)"""
+        engines = [database.engine, database.read_engine]
+        return max(cls._usage(e.pool) for e in engines if e is not None)
+
+    @property
+    def level(self) -> str:
+        """normal / elevated / severe"""
+        usage = self.pool_usage()
+        if self.loop_lag >= LOOP_LAG_SEVERE or usage >= 1.0:
+            return "severe"
+        if self.loop_lag >= LOOP_LAG_ELEVATED or usage >= POOL_USAGE_ELEVATED:
+            return "elevated"
+        return "normal"
+
+    def low_slots(self) -> asyncio.Semaphore:
+        if self._low_slots is None:
+            self._low_slots = asyncio.Semaphore(LOW_PRIORITY_CONCURRENCY)
+        return self._low_slots
+
+    def record(self, priority: str, outcome: str) -> None:
+        self._counters[(priority, outcome)] += 1
+
+    def stats(self) -> dict:
+        counters: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for (priority, outcome), count in list(self._counters.items()):
+            counters[priority][outcome] = count
+        return {
+            "enabled": LOAD_SHEDDING_ENABLED,
+            "level": self.level,
+            "loop_lag_ms": round(self.loop_lag * 1000, 1),
+            "db_pool_usage": round(self.pool_usage(), 2),
+            "counters": counters,
+        }
+
+    async def run(self) -> None:
+        """이벤트 루프 지연 측정 (예정 시각 대비 깨어난 시각 차이)"""
+        loop = asyncio.get_running_loop()
+        level = "normal"
+        while True:
+            started = loop.time()
+            await asyncio.sleep(MONITOR_INTERVAL)
+            lag = max(0.0, loop.time() - started - MONITOR_INTERVAL)
+            self.loop_lag = self.loop_lag * 0.7 + lag * 0.3
+            if self.level != level:
+                level = self.level
+                logger.warning(
+                    f"[LoadShedding] level={level} loop_lag={self.loop_lag * 1000:.0f}ms "
+                    f"db_pool_usage={self.pool_usage():.2f}"
+                )
+
+
+load_monitor = LoadMonitor()
+
+
+class LoadSheddingMiddleware:
+    """우선순위별 요청 차단/대기 (순수 ASGI)"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def _reject(self, send) -> None:
+        body = json.dumps(
+            {"detail": "서버가 혼잡합니다. 잠시 후 다시 시도해주세요."}, ensure_ascii=False
+        ).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"retry-after", str(RETRY_AFTER_SECONDS).encode()),
+                (b"content-length", str(len(body)).encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not LOAD_SHEDDING_ENABLED or scope["method"] == "OPTIONS":
+            await self.app(scope, receive, send)
+            return
+
+        priority = classify(scope["method"], scope["path"])
+        if priority == CRITICAL:
+            load_monitor.record(priority, "accepted")
+            await self.app(scope, receive, send)
+            return
+
+        level = load_monitor.level
+        if level == "severe" or (level == "elevated" and priority == LOW):
+            load_monitor.record(priority, "shed")
+            await self._reject(send)
+            return
+
+        if priority == NORMAL:
+            load_monitor.record(priority, "accepted")
+            await self.app(scope, receive, send)
+            return
+
+        # low: 동시 실행 수 제한, 잠시 대기 후에도 자리가 없으면 거절
+        slots = load_monitor.low_slots()
+        try:
+            await asyncio.wait_for(slots.acquire(), LOW_PRIORITY_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            load_monitor.record(priority, "shed")
+            await self._reject(send)
+            return
+        try:
+            load_monitor.record(priority, "accepted")
+            await self.app(scope, receive, send)
+        finally:
+            slots.release()
@@ -0,0 +1,177 @@
+"""
+키셋(커서) 페이지네이션 및 NDJSON 스트리밍 유틸리티
+- 커서는 정렬 키 값(예: business_date, attended_at, id)을 base64 JSON으로 인코딩한 문자열
+- 다음 페이지 커서는 응답 헤더(X-Next-Cursor)로 전달하여 기존 목록 응답 형태를 유지
+- 대용량 조회는 NDJSON으로 스트리밍하여 메모리 사용량을 일정하게 유지
+- NULL이 될 수 있는 시각 정렬 키는 not_null_key()로 감싸 ORDER BY와 키셋 조건이 같은 값을 비교하도록 함
+  (NULL 비교는 참이 아니므로 그대로 쓰면 페이지 경계에서 행이 빠지거나 반복됨)
+"""
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, and_, literal, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.orm import Query, Session
+
+from database import SessionLocal
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+MAX_PAGE_SIZE = 1000
+STREAM_BATCH_SIZE = 500
+# NULL 시각 정렬 키의 대체값 (실제 데이터보다 앞서도록)
+NULL_DATETIME = datetime(1970, 1, 1)
+
+
+class not_null_key(FunctionElement):
+    """
+    NULL이 될 수 있는 시각 정렬 키 - coalesce(column, NULL_DATETIME)
+    - 행 키 함수에서도 같은 대체값 사용 (value or NULL_DATETIME)
+    - 커서 값도 bind()로 같은 식을 거쳐 비교
+    """
+    type = DateTime()
+    inherit_cache = True
+
+    def __init__(self, column):
+        super().__init__(column, literal(NULL_DATETIME, DateTime()))
+
+    @staticmethod
+    def bind(value: Any) -> "not_null_key":
+        return not_null_key(literal(value, DateTime()))
+
+
+@compiles(not_null_key)
+def _compile_not_null_key(element, compiler, **kw):
+    return f"coalesce({compiler.process(element.clauses, **kw)})"
+
+
+@compiles(not_null_key, "sqlite")
+def _compile_not_null_key_sqlite(element, compiler, **kw):
+    # SQLite는 시각을 문자열로 저장하고 형식이 섞여 있음 (CURRENT_TIMESTAMP 기본값은 소수초 없음)
+    # -> 양쪽을 같은 형식으로 맞춰 비교
+    return f"strftime('%Y-%m-%d %H:%M:%f', coalesce({compiler.process(element.clauses, **kw)}))"
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+    if isinstance(value, (dict, list)):
+        # 정렬 키는 스칼라 또는 날짜/시각만 허용 (그대로 쿼리에 넣으면 500)
+        raise ValueError("non-scalar cursor value")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """정렬 키 값 목록을 커서 문자열로 인코딩"""
+    raw = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_count: int) -> List[Any]:
+    """커서 문자열을 정렬 키 값 목록으로 디코딩"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if not isinstance(values, list) or len(values) != key_count:
+            raise ValueError("cursor length mismatch")
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError, KeyError):
+        raise HTTPException(status_code=400, detail="잘못된 커서입니다.")
+
+
+def apply_keyset(query: Query, keys: Sequence[Any], cursor: Optional[str] = None, descending: bool = True) -> Query:
+    """
+    키셋 조건과 정렬을 쿼리에 적용
+    - (k1, k2, k3) < (v1, v2, v3) 형태를 OR/AND 조합으로 전개 (SQLite/Postgres 공통)
+    """
+    if cursor:
+        values = decode_cursor(cursor, len(keys))
+        clauses = []
+        values = [
+            key.bind(value) if isinstance(key, not_null_key) else value
+            for key, value in zip(keys, values)
+        ]
+        for i, key in enumerate(keys):
+            prefix = [keys[j] == values[j] for j in range(i)]
+            bound = key < values[i] if descending else key > values[i]
+            clauses.append(and_(*prefix, bound))
+        query = query.filter(or_(*clauses))
+
+    return query.order_by(*[k.desc() if descending else k.asc() for k in keys])
+
+
+def keyset_page(
+    query: Query,
+    keys: Sequence[Any],
+    row_key: Callable[[Any], Tuple],
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = True,
+    offset: int = 0
+) -> Tuple[list, Optional[str]]:
+    """
+    키셋 페이지 조회
+    - offset은 기존 skip 기반 호출 호환용 (cursor가 있으면 무시)
+    Returns: (rows, next_cursor) - 다음 페이지가 없으면 next_cursor는 None
+    """
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    query = apply_keyset(query, keys, cursor, descending)
+    if offset and not cursor:
+        query = query.offset(offset)
+    rows = query.limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(row_key(rows[-1]))
+    return rows, next_cursor
+
+
+def set_next_cursor(response: Response, next_cursor: Optional[str]) -> None:
+    """다음 페이지 커서를 응답 헤더에 기록"""
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def stream_ndjson(
+    build_query: Callable[[Session], Query],
+    serialize: Callable[[Any], dict],
+    batch_size: int = STREAM_BATCH_SIZE,
+    session_factory: Callable[[], Session] = SessionLocal
+) -> StreamingResponse:
+    """
+    쿼리 결과를 NDJSON으로 스트리밍
+    - 요청 세션 종료와 무관하게 동작하도록 session_factory로 만든 전용 세션 사용
+      (get_read_db 엔드포인트는 session_factory_for(db)를 넘겨 요청과 같은 복제본 사용)
+    - yield_per로 배치 단위 조회하여 전체 결과를 메모리에 올리지 않음
+    """
+    def generate():
+        db = session_factory()
+        try:
+            for row in build_query(db).yield_per(batch_size):
+                yield json.dumps(serialize(row), ensure_ascii=False, default=_json_default) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
@@ -1,8 +1,11 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from fastapi import Request
+from datetime import date, timedelta
 
 import os
+import time
 
 # Get DATABASE_URL from environment variable, default to SQLite
 SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./database/waiting_system.db")
@@ -40,16 +43,38 @@ engine = create_engine(
     pool_pre_ping=True
 )
 
+# Optional read replica for analytics/reporting (READ_DATABASE_URL)
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL")
+if READ_DATABASE_URL and READ_DATABASE_URL.startswith("postgres://"):
+    READ_DATABASE_URL = READ_DATABASE_URL.replace("postgres://", "postgresql://", 1)
+
+read_engine = None
+if READ_DATABASE_URL:
+    read_engine = create_engine(
+        READ_DATABASE_URL,
+        connect_args={"check_same_thread": False} if READ_DATABASE_URL.startswith("sqlite") else {},
+        pool_pre_ping=True
+    )
+
 # Ensure PostgreSQL sessions use Asia/Seoul timezone
+def _set_timezone(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET timezone TO 'Asia/Seoul'")
+    cursor.close()
+
+from sqlalchemy import event
 if SQLALCHEMY_DATABASE_URL.startswith("postgresql"):
-    from sqlalchemy import event
-    @event.listens_for(engine, "connect")
-    def set_timezone(dbapi_connection, connection_record):
-        cursor = dbapi_connection.cursor()
-        cursor.execute("SET timezone TO 'Asia/Seoul'")
-        cursor.close()
+    event.listen(engine, "connect", _set_timezone)
+if READ_DATABASE_URL and READ_DATABASE_URL.startswith("postgresql"):
+    event.listen(read_engine, "connect", _set_timezone)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine) if read_engine else None
+
+# Replica lag tolerance (seconds) and how long a lag measurement is reused
+READ_REPLICA_MAX_LAG = float(os.getenv("READ_REPLICA_MAX_LAG_SECONDS", "30"))
+READ_REPLICA_LAG_CHECK_INTERVAL = 10.0
+_replica_lag_state = {"checked_at": 0.0, "healthy": False}
 
 Base = declarative_base()
 
@@ -59,3 +84,69 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def _replica_is_healthy() -> bool:
+    """복제 지연이 허용 범위 이내인지 확인 (결과는 잠시 캐시)"""
+    now = time.monotonic()
+    if now - _replica_lag_state["checked_at"] < READ_REPLICA_LAG_CHECK_INTERVAL:
+        return _replica_lag_state["healthy"]
+
+    healthy = True
+    if READ_DATABASE_URL.startswith("postgresql"):
+        try:
+            with read_engine.connect() as conn:
+                lag = conn.execute(text(
+                    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+                )).scalar()
+            healthy = lag is not None and float(lag) <= READ_REPLICA_MAX_LAG
+        except Exception as e:
+            print(f"[DB] Read replica lag check failed, using primary: {e}")
+            healthy = False
+
+    _replica_lag_state.update(checked_at=now, healthy=healthy)
+    return healthy
+
+
+def _is_historical_request(request: Request) -> bool:
+    """
+    조회 기간이 과거로 한정되는지 확인 (end_date 또는 date 쿼리 파라미터 기준)
+    - 종료일이 없으면 오늘 포함으로 간주
+    - 전일은 영업일 시작 시각 전까지 진행 중일 수 있으므로 제외
+    """
+    raw = request.query_params.get("end_date") or request.query_params.get("date")
+    if not raw:
+        return False
+    try:
+        end_date = date.fromisoformat(raw)
+    except ValueError:
+        return False
+
+    from utils import get_kst_now
+    return end_date < get_kst_now().date() - timedelta(days=1)
+
+
+def session_factory_for(db: Session):
+    """요청 세션과 같은 DB(기본/복제본)에 연결하는 세션 팩토리 (스트리밍 응답 전용 세션용)"""
+    if ReadSessionLocal is not None and db.get_bind() is read_engine:
+        return ReadSessionLocal
+    return SessionLocal
+
+
+def get_read_db(request: Request):
+    """
+    분석/리포트용 읽기 세션
+    - READ_DATABASE_URL이 설정되어 있고, 과거 기간 조회이며, 복제 지연이 허용 범위일 때만 복제본 사용
+    - 그 외에는 기본 DB 사용
+    """
+    use_replica = (
+        ReadSessionLocal is not None
+        and _is_historical_request(request)
+        and _replica_is_healthy()
+    )
+    db = ReadSessionLocal() if use_replica else SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -1,9 +1,9 @@
 from fastapi import FastAPI, Request
-from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import RedirectResponse, FileResponse
+from fastapi.responses import RedirectResponse
 import uvicorn
 import os
+import asyncio
 
 # Load environment variables from .env file manually - MUST BE DONE BEFORE IMPORTS
 def load_env_file():
@@ -21,7 +21,9 @@ load_env_file()
 from database import engine, Base
 from models import (
     AuditLog, SettingsSnapshot, Notice, NoticeAttachment, PrintTemplate,
-    ProxyUnit, PrinterUnit
+    ProxyUnit, PrinterUnit, StoreSettings, Store, User, ClassClosure, Holiday,
+    ClassInfo, WaitingList, DailyClosing, Franchise, Member, WaitingHistory,
+    StoreDataVersion
 )
 
 from routers import (
@@ -47,17 +49,24 @@ from routers import (
     system, # System/SSE Monitoring Router
     polling, # Polling Optimization Router
     public, # Public Router (QR/Mobile)
+    exports, # CSV/XLSX Export Router
     tts, # Google Cloud TTS Router
     printer_queue, # Printer Queue Router
     # templates, # Print Template Router (Removed)
     printer_units, # New Proxy/Printer Units Registry Router
+    bootstrap, # Screen Bootstrap Router
     debug, # DEBUG ROUTER
 )
 from core.logger import logger
+from core.http_cache import STATIC_DIR, STATIC_URL_PREFIX, HashedStaticFiles, cached_file_response, static_url
 from starlette.middleware.base import BaseHTTPMiddleware
 import time
 
-app = FastAPI(title="Waiting System")
+# 기본 응답 클래스: orjson 직렬화 (Default로 감싸 response_model 엔드포인트의 pydantic-core 직렬화 경로는 유지)
+from fastapi.datastructures import Default
+from services.fast_json import FastJSONResponse
+
+app = FastAPI(title="Waiting System", default_response_class=Default(FastJSONResponse))
 
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -67,6 +76,18 @@ origins = [
     "*", # Allow all origins for tablet/mobile compatibility in local network
 ]
 
+# 대기열 변경 요청 Idempotency-Key 처리 (재시도 시 첫 응답 재생)
+from core.idempotency import IdempotencyMiddleware
+app.add_middleware(IdempotencyMiddleware)
+
+# 우선순위 기반 부하 차단 (CORS보다 안쪽에 두어 503 응답에도 CORS 헤더 포함)
+from core.load_shedding import LoadSheddingMiddleware
+app.add_middleware(LoadSheddingMiddleware)
+
+# 일정 크기 이상 JSON 응답 gzip/brotli 압축 (SSE 제외, 멱등 재생 응답도 요청별로 압축)
+from core.compression import CompressionMiddleware
+app.add_middleware(CompressionMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     # allow_origins=origins, # Disable explicit list to use regex for wildcard with credentials
@@ -74,18 +95,21 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],  # 키셋 페이지네이션 다음 커서, 멱등 재생 여부
 )
 
 # 데이터베이스 테이블 생성 (모든 환경에서 수행)
 Base.metadata.create_all(bind=engine)
 
 # 정적 파일 및 템플릿 설정
-app.mount("/static", StaticFiles(directory="static"), name="static")
-# templates = Jinja2Templates(directory="templates")
+# 내용 해시 ETag, ?v=해시 URL은 장기 캐시 (core/http_cache)
+app.mount(STATIC_URL_PREFIX, HashedStaticFiles(directory=STATIC_DIR), name="static")
+templates = Jinja2Templates(directory="templates")
+templates.env.globals["static_url"] = static_url  # {{ static_url('js/index.js') }} -> ?v=내용 해시
 
 from create_initial_superuser import create_initial_superuser
 from database import SessionLocal
-from core.db_auto_migrator import check_and_migrate_table
+from core.db_auto_migrator import check_and_migrate_table, ensure_indexes
 
 @app.on_event("startup")
 async def startup_event():
@@ -110,6 +134,8 @@ async def startup_event():
         # check_and_migrate_table(PrintTemplate) # Auto-migrate new table (Removed)
         check_and_migrate_table(ProxyUnit)
         check_and_migrate_table(PrinterUnit)
+        check_and_migrate_table(StoreDataVersion)
+        ensure_indexes(WaitingList)
         
         # Ensure TTS cache directory exists
         from services.tts_service import TTS_CACHE_DIR
@@ -127,6 +153,22 @@ async def startup_event():
     finally:
         db.close()
 
+    # SSE 이벤트 디스패처 (커밋 후 백그라운드 전송)
+    from services.sse_outbox import sse_outbox
+    sse_outbox.start()
+
+    # 분석용 Parquet 야간 내보내기 (duckdb 설치 시에만 동작)
+    from services.analytics_store import analytics_store
+    asyncio.create_task(analytics_store.run_nightly())
+
+    # 매장별 business_day_start 시각 자동 영업일 전환 (리더 워커만 실행)
+    from services.rollover_scheduler import rollover_scheduler
+    asyncio.create_task(rollover_scheduler.run())
+
+    # 이벤트 루프 지연 측정 (부하 차단 단계 판단)
+    from core.load_shedding import load_monitor
+    asyncio.create_task(load_monitor.run())
+
 # Logging Middleware (Disabled to prevent SSE interference)
 # class RequestLoggingMiddleware(BaseHTTPMiddleware):
 #     async def dispatch(self, request: Request, call_next):
@@ -168,7 +210,9 @@ app.include_router(notices.router)
 app.include_router(file_upload.router, prefix="/api/files", tags=["File Upload"])
 app.include_router(system.router, prefix="/api/system", tags=["System Monitoring"])
 app.include_router(polling.router, prefix="/api/polling", tags=["Polling Optimization"])
+app.include_router(bootstrap.router, prefix="/api/bootstrap", tags=["Screen Bootstrap"])
 app.include_router(public.router, prefix="/api/public", tags=["Public Access"])
+app.include_router(exports.router, prefix="/api/exports", tags=["Data Export"])
 app.include_router(tts.router, prefix="/api/tts", tags=["Text to Speech"])
 app.include_router(printer_queue.router, prefix="/api/printer", tags=["Printer Queue"])
 # app.include_router(templates.router, prefix="/api/templates", tags=["Print Templates"]) # Removed
@@ -182,8 +226,8 @@ async def main_page(request: Request):
     return RedirectResponse(url="http://localhost:3000")
 
 @app.get("/favicon.ico", include_in_schema=False)
-async def favicon():
-    return FileResponse("static/favicon.ico")
+def favicon(request: Request):
+    return cached_file_response(request, "static/favicon.ico")
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8088, reload=True)
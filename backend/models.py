@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Time, Table, Float, func
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, ForeignKey, Date, Time, Table, Float, Index, func, text
 from sqlalchemy.orm import relationship
 from database import Base
 from datetime import datetime, date, time
@@ -193,6 +193,7 @@ class StoreSettings(Base):
     enable_reception_desk = Column(Boolean, default=True)  # 대기접수 데스크 사용 여부 (SSE 연결 제어)
     max_dashboard_connections = Column(Integer, default=2)  # 동시 대시보드 접속 허용 대수
     dashboard_connection_policy = Column(String, default="eject_old")  # eject_old(밀어내기) or block_new(차단)
+    sse_coalesce_window_ms = Column(Integer, default=200)  # 대기열 변경 이벤트 병합 시간 (ms, 0이면 병합 안 함)
     
     # 테마 설정
     theme = Column(String, default="zinc")  # zinc, blue, green
@@ -256,7 +257,9 @@ class DailyClosing(Base):
     is_closed = Column(Boolean, default=False)  # 마감 여부
     total_waiting = Column(Integer, default=0)  # 총 대기 수
     total_attended = Column(Integer, default=0)  # 총 출석 수
-    total_cancelled = Column(Integer, default=0)  # 총 취소 수
+    total_cancelled = Column(Integer, default=0)  # 총 취소 수 (노쇼 포함)
+    total_called = Column(Integer, default=0)  # 호출된 대기 수
+    total_no_show = Column(Integer, default=0)  # 노쇼 수
     created_at = Column(DateTime, default=func.now())
 
     # 관계 설정
@@ -336,6 +339,17 @@ class WaitingList(Base):
     class_info = relationship("ClassInfo", back_populates="waiting_list")
     member = relationship("Member", back_populates="waiting_list")
 
+    __table_args__ = (
+        # 같은 영업일에 같은 번호로 중복 대기 불가 (빈 좌석 제외) - 동시 접수 경합 시 최종 보장
+        Index(
+            "uq_waiting_list_active_phone",
+            "store_id", "business_date", "phone",
+            unique=True,
+            sqlite_where=text("status = 'waiting' AND phone <> 'empty'"),
+            postgresql_where=text("status = 'waiting' AND phone <> 'empty'")
+        ),
+    )
+
 class ClassClosure(Base):
     """교시 마감 정보"""
     __tablename__ = "class_closure"
@@ -347,6 +361,16 @@ class ClassClosure(Base):
     closed_at = Column(DateTime, default=func.now())  # 마감 시간
     created_at = Column(DateTime, default=func.now())
 
+class StoreDataVersion(Base):
+    """매장별 데이터 버전 (변경 트랜잭션에서 함께 증가, 워커 간 공유)"""
+    __tablename__ = "store_data_version"
+
+    store_id = Column(Integer, ForeignKey("store.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    analytics_version = Column(Integer, nullable=False, default=0, server_default="0")  # 분석 캐시 세대 (과거 데이터 변경 시 증가)
+    analytics_exported_through = Column(Date, nullable=True)  # Parquet 내보내기 완료 영업일 (services/analytics_store)
+    analytics_exported_version = Column(Integer, nullable=True)  # 내보낼 때의 analytics_version (다르면 무효)
+
 class WaitingHistory(Base):
     """대기 이력 (통계용)"""
     __tablename__ = "waiting_history"
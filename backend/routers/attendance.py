@@ -3,7 +3,7 @@ from fastapi import APIRouter, Depends, Request, HTTPException
 # from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, and_, or_, Date
-from database import get_db
+from database import get_read_db
 from models import WaitingList, Member, Store, ClassInfo
 from auth import get_current_store
 from datetime import datetime, timedelta, date
@@ -24,7 +24,7 @@ async def get_attendance_status(
     date: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_store: Store = Depends(get_current_store)
 ):
     target_date = datetime.strptime(date, "%Y-%m-%d").date()
@@ -88,7 +88,7 @@ async def get_waiting_status(
     date: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_store: Store = Depends(get_current_store)
 ):
     target_date = datetime.strptime(date, "%Y-%m-%d").date()
@@ -188,7 +188,7 @@ async def get_waiting_status(
 @router.get("/individual/search")
 async def search_member_for_attendance(
     query: str,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_store: Store = Depends(get_current_store)
 ):
     # 이름 또는 전화번호 뒷자리로 검색
@@ -209,7 +209,7 @@ async def get_member_attendance_detail(
     date: str = None,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_store: Store = Depends(get_current_store)
 ):
     try:
@@ -326,7 +326,7 @@ async def get_new_members(
     end_date: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_store: Store = Depends(get_current_store)
 ):
     # 날짜가 없으면 오늘로 설정
@@ -429,7 +429,7 @@ async def get_attendance_ranking(
     end_date: Optional[str] = None,
     skip: int = 0,
     limit: int = 20,
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_read_db),
     current_store: Store = Depends(get_current_store)
 ):
     # 날짜 처리
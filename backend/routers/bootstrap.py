@@ -0,0 +1,170 @@
+"""
+화면 초기 상태 일괄 조회 (bootstrap)
+- 대기관리/접수대/현황판 화면이 로드·재연결 시 호출하던 여러 API를 한 번의 응답으로 제공
+- 인증, 매장 확인, 영업일 계산을 요청당 1회만 수행하고 같은 세션에서 모든 데이터를 조회
+- 응답의 version 이후 변경분은 SSE/롱폴링(since=version)으로 이어서 반영
+- 데이터 버전 ETag 일치 시 304, 같은 버전의 동시 요청(재연결 폭주)은 한 번만 계산하여 결과 공유
+"""
+from datetime import date
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+from sqlalchemy.orm import Session
+
+from auth import get_current_store
+from database import get_db
+from models import DailyClosing, Store
+from schemas import StoreSettings as StoreSettingsSchema
+from routers.daily_closing import predict_business_date
+from routers.store_settings import get_or_create_store_settings
+from routers.waiting import build_next_slot, build_waiting_list, build_waiting_list_by_class
+from routers.waiting_board import build_board_snapshot
+from services.board_snapshot import board_snapshots
+from services.business_date import get_current_business_date
+from services.data_version import data_versions, etag_headers, is_not_modified, not_modified_response
+from services.registration_check import load_registration_snapshot
+from services.single_flight import render_json, single_flight
+
+router = APIRouter()
+
+
+def _common_state(db: Session, store_id: int, today: date, etag: str) -> dict:
+    """매장 설정, 영업 상태, SSE 수신 설정, 버전 정보"""
+    store = db.get(Store, store_id)
+    settings = get_or_create_store_settings(db, store)
+    business = db.query(
+        DailyClosing.is_closed,
+        DailyClosing.opening_time
+    ).filter(
+        DailyClosing.store_id == store.id,
+        DailyClosing.business_date == today
+    ).first()
+    is_open = business is not None and not business.is_closed
+
+    return {
+        "version": data_versions.current(store.id),
+        "sync_token": etag.strip('"'),
+        "business_date": today,
+        "business": {
+            "is_open": is_open,
+            "opening_time": business.opening_time if business else None,
+            # /api/daily/predict-date와 같은 표시용 날짜
+            "display_date": today.strftime("%Y-%m-%d") if is_open else predict_business_date(db, store.id)
+        },
+        "store": StoreSettingsSchema.model_validate(settings),
+        "sse_status": {
+            "enable_waiting_board": settings.enable_waiting_board,
+            "enable_reception_desk": settings.enable_reception_desk
+        },
+        "_settings": settings
+    }
+
+
+def build_manager_state(db: Session, store_id: int, today: date, etag: str,
+                        class_id: Optional[int], status: str) -> dict:
+    """대기관리 화면 초기 상태"""
+    state = _common_state(db, store_id, today, etag)
+    snapshot = load_registration_snapshot(db, store_id, today, "")
+    classes = build_waiting_list_by_class(db, store_id, today)
+    closed_class_ids = sorted(snapshot.closed_class_ids)
+
+    # 선택 교시가 없으면 마감되지 않은 첫 교시 (화면 자동 선택과 동일)
+    if class_id is None:
+        class_id = next(
+            (cls["class_id"] for cls in classes if cls["class_id"] not in snapshot.closed_class_ids),
+            classes[0]["class_id"] if classes else None
+        )
+
+    state.update({
+        "classes": classes,
+        "closed_class_ids": closed_class_ids,
+        "current_class_id": class_id,
+        "waiting_list": build_waiting_list(db, store_id, today, status, class_id) if class_id else [],
+        "next_slot": build_next_slot(db, store_id, today, state.pop("_settings"), snapshot)
+    })
+    return state
+
+
+def build_reception_state(db: Session, store_id: int, today: date, etag: str) -> dict:
+    """접수대 화면 초기 상태"""
+    state = _common_state(db, store_id, today, etag)
+    state["next_slot"] = build_next_slot(db, store_id, today, state.pop("_settings"))
+    return state
+
+
+def build_board_state(db: Session, store_id: int, today: date, etag: str) -> bytes:
+    """현황판 화면 초기 상태 - 현황판은 캐시된 스냅샷 본문을 다시 직렬화하지 않고 그대로 포함"""
+    state = _common_state(db, store_id, today, etag)
+    state.pop("_settings")
+    board = board_snapshots.get(store_id, etag) or build_board_snapshot(db, store_id, today, etag)
+    return render_json(state)[:-1] + b',"board":' + board.body + b"}"
+
+
+@router.get("/manager")
+async def bootstrap_manager(
+    request: Request,
+    class_id: Optional[int] = None,
+    status: str = "waiting,called",
+    db: Session = Depends(get_db),
+    current_store: Store = Depends(get_current_store)
+):
+    """
+    대기관리 화면 초기 상태
+    - 매장 설정, 영업 상태, 교시별 현황, 마감 교시, 선택 교시 대기자 목록, 다음 배정 교시
+    - class_id 미지정 시 마감되지 않은 첫 교시
+    """
+    today = get_current_business_date(db, current_store.id)
+    etag = data_versions.etag(current_store.id, today)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    return await single_flight.response(
+        ("bootstrap_manager", current_store.id, etag, class_id, status),
+        build_manager_state, current_store.id, today, etag, class_id, status,
+        headers=etag_headers(etag)
+    )
+
+
+@router.get("/reception")
+async def bootstrap_reception(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_store: Store = Depends(get_current_store)
+):
+    """
+    접수대 화면 초기 상태
+    - 매장 설정, 영업 상태, 다음 배정 교시
+    """
+    today = get_current_business_date(db, current_store.id)
+    etag = data_versions.etag(current_store.id, today)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    return await single_flight.response(
+        ("bootstrap_reception", current_store.id, etag),
+        build_reception_state, current_store.id, today, etag,
+        headers=etag_headers(etag)
+    )
+
+
+@router.get("/board")
+async def bootstrap_board(
+    request: Request,
+    db: Session = Depends(get_db),
+    current_store: Store = Depends(get_current_store)
+):
+    """
+    현황판 화면 초기 상태
+    - 매장 설정, 영업 상태, 현황판 데이터 (/api/board/display와 같은 형식)
+    """
+    today = get_current_business_date(db, current_store.id)
+    etag = data_versions.etag(current_store.id, today)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    body = await single_flight.run(
+        ("bootstrap_board", current_store.id, etag),
+        build_board_state, current_store.id, today, etag
+    )
+    return Response(content=body, media_type="application/json", headers=etag_headers(etag))
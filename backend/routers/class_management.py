@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func
 from typing import List, Dict, Optional
@@ -13,6 +13,8 @@ from schemas import (
     ClassInfoUpdate
 )
 from auth import get_current_store
+from services.timetable import timetable_resolver
+from services.data_version import data_versions, etag_headers, is_not_modified, not_modified_response
 
 router = APIRouter()
 
@@ -147,7 +149,9 @@ async def create_class(
 
     db_class = ClassInfo(**data, store_id=current_store.id)
     db.add(db_class)
+    data_versions.mark(db, current_store.id)
     db.commit()
+    timetable_resolver.invalidate_classes(current_store.id)
     db.refresh(db_class)
 
     # 헬퍼 함수를 사용하여 응답 생성
@@ -155,12 +159,19 @@ async def create_class(
 
 @router.get("", response_model=List[ClassInfoSchema])
 async def get_classes(
+    request: Request,
+    response: Response,
     include_inactive: bool = False,
     class_type: Optional[str] = None,
     current_store: Store = Depends(get_current_store),
     db: Session = Depends(get_db)
 ):
-    """클래스 목록 조회"""
+    """클래스 목록 조회 (데이터 버전 ETag 일치 시 304)"""
+    etag = data_versions.etag(current_store.id, date.today())
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+    response.headers.update(etag_headers(etag))
+
     query = db.query(ClassInfo).filter(ClassInfo.store_id == current_store.id)
 
     if not include_inactive:
@@ -241,7 +252,9 @@ async def update_class(
     for field, value in update_data.items():
         setattr(db_class, field, value)
 
+    data_versions.mark(db, current_store.id)
     db.commit()
+    timetable_resolver.invalidate_classes(current_store.id)
     db.refresh(db_class)
 
     # 헬퍼 함수를 사용하여 응답 생성
@@ -264,7 +277,9 @@ async def delete_class(
 
     # 실제 삭제 대신 비활성화
     db_class.is_active = False
+    data_versions.mark(db, current_store.id)
     db.commit()
+    timetable_resolver.invalidate_classes(current_store.id)
 
     return {"message": f"{db_class.class_name}이(가) 비활성화되었습니다."}
 
@@ -284,7 +299,9 @@ async def activate_class(
         raise HTTPException(status_code=404, detail="클래스를 찾을 수 없습니다.")
 
     db_class.is_active = True
+    data_versions.mark(db, current_store.id)
     db.commit()
+    timetable_resolver.invalidate_classes(current_store.id)
 
     return {"message": f"{db_class.class_name}이(가) 활성화되었습니다."}
 
@@ -382,6 +399,8 @@ async def clone_classes(
         )
         db.add(new_class)
 
+    data_versions.mark(db, current_store.id)
     db.commit()
+    timetable_resolver.invalidate_classes(current_store.id)
     
     return {"message": "클래스 설정이 성공적으로 복제되었습니다.", "count": len(source_classes)}
@@ -1,46 +1,172 @@
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from sqlalchemy import func
+from sqlalchemy import func, update
 from datetime import datetime, date, timedelta
-from typing import List, Dict
+from typing import List, Dict, Optional, Sequence
 
 from database import get_db
 from models import DailyClosing, WaitingList, ClassInfo, Store, StoreSettings
 from schemas import DailyClosing as DailyClosingSchema, DailyClosingCreate, DailyStatistics
 from auth import get_current_store
 from utils import get_today_date
+from services.business_date import get_current_business_date, business_date_resolver
+from services.daily_counters import sync_daily_counters
+from services.analytics_cache import analytics_cache
+from services.data_version import data_versions
 
 router = APIRouter()
 
-def get_current_business_date(db: Session, store_id: int) -> date:
+
+def _resolve_pending_waitings(db: Session, store_id: int, business_date: date, closing_action: str) -> int:
     """
-    현재 영업일 조회
-    1. 현재 활성화된(is_closed=False) 영업일이 있으면 그 날짜를 반환 (우선순위 높음 - 당일 2회 개점 등 지원)
-    2. 없으면 시간/설정 기반의 자연적인 영업일 반환
+    영업일의 대기 중인 고객 일괄 처리 (단일 UPDATE)
+    - closing_action == 'attended': 출석 처리, 그 외: 취소 처리
+    Returns: 처리된 건수
     """
-    # 1. 활성화된 영업일 확인
-    active_closing = db.query(DailyClosing).filter(
+    now = datetime.now()
+    if closing_action == 'attended':
+        values = {WaitingList.status: 'attended', WaitingList.attended_at: now}
+    else:
+        values = {WaitingList.status: 'cancelled', WaitingList.cancelled_at: now}
+
+    return db.query(WaitingList).filter(
+        WaitingList.store_id == store_id,
+        WaitingList.business_date == business_date,
+        WaitingList.status == 'waiting'
+    ).update(values, synchronize_session=False)
+
+
+def _carry_over_waitings(db: Session, store_id: int, from_date: date, to_date: date) -> int:
+    """
+    이전 영업일의 대기 중인 고객을 새 영업일로 이월 (단일 UPDATE)
+    - 기존 대기번호 순서대로 새 영업일의 기존 대기 건수 다음 번호부터 재발급
+    Returns: 이월된 건수
+    """
+    today_waitings_count = db.query(func.count(WaitingList.id)).filter(
+        WaitingList.store_id == store_id,
+        WaitingList.business_date == to_date
+    ).scalar()
+
+    ranked = db.query(
+        WaitingList.id.label("id"),
+        func.row_number().over(
+            order_by=(WaitingList.waiting_number, WaitingList.id)
+        ).label("rn")
+    ).filter(
+        WaitingList.store_id == store_id,
+        WaitingList.business_date == from_date,
+        WaitingList.status == 'waiting'
+    ).subquery()
+
+    result = db.execute(
+        update(WaitingList)
+        .where(WaitingList.id == ranked.c.id)
+        .values(
+            business_date=to_date,
+            waiting_number=ranked.c.rn + today_waitings_count,
+            registered_at=datetime.now()
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+def process_pending_waitings(db: Session, store_id: int, from_dates: Sequence[date], to_date: date) -> None:
+    """
+    지난 영업일들의 미처리 대기자 처리 (커밋은 호출자)
+    - 자동 마감: closing_action 설정대로 일괄 처리 후 해당 영업일 통계 반영
+    - 그 외: 오래된 영업일부터 순서대로 to_date로 이월 (대기번호 재발급)
+    """
+    closings = db.query(DailyClosing).filter(
         DailyClosing.store_id == store_id,
-        DailyClosing.is_closed == False
-    ).order_by(DailyClosing.business_date.desc()).first()
+        DailyClosing.business_date.in_(list(from_dates))
+    ).order_by(DailyClosing.business_date).all()
+    if not closings:
+        return
 
-    if active_closing:
-        return active_closing.business_date
+    # Fetch auto-closing settings safely
+    settings_closing = db.query(
+        StoreSettings.auto_closing,
+        StoreSettings.closing_action
+    ).filter(StoreSettings.store_id == store_id).first()
+
+    for last_daily_closing in closings:
+        last_business_date = last_daily_closing.business_date
+        # 미처리 대기자 처리 (자동 마감인 경우)
+        if settings_closing and settings_closing.auto_closing:
+            processed = _resolve_pending_waitings(
+                db, store_id, last_business_date, settings_closing.closing_action
+            )
+            print(f"[OPEN] Auto-closed {processed} waiting users of {last_business_date} for store {store_id}")
+            # 마감 후 처리된 대기자를 이전 영업일 통계에 반영
+            sync_daily_counters(db, last_daily_closing)
+
+        # 자동 마감이 아닌 경우 대기자를 개점일로 이월 (대기번호 재발급)
+        else:
+            carried = _carry_over_waitings(db, store_id, last_business_date, to_date)
+            print(f"[OPEN] Carried over {carried} waiting users from {last_business_date} for store {store_id}")
+
+
+def open_business_day(db: Session, store_id: int, business_date: date,
+                      carry_from: Optional[Sequence[date]] = None) -> DailyClosing:
+    """
+    새 영업일 개점 (개점 API 및 자동 영업일 전환 공용)
+    - 이전 영업일들(carry_from, 기본값: 개점일 - 1일)의 대기자를 설정에 따라 자동 마감 또는 이월
+    """
+    process_pending_waitings(db, store_id, carry_from or [business_date - timedelta(days=1)], business_date)
+    db.commit()  # 이월 처리 확정
+
+    # 새로운 영업일 생성
+    new_business = DailyClosing(
+        store_id=store_id,
+        business_date=business_date,
+        opening_time=datetime.now(),
+        is_closed=False
+    )
+    # 이월된 대기자 등 기존 데이터로 실시간 카운터 초기화
+    sync_daily_counters(db, new_business)
+    db.add(new_business)
+    data_versions.mark(db, store_id)
+    db.commit()
+    db.refresh(new_business)
+    business_date_resolver.invalidate(store_id)
+
+    return new_business
+
+
+def close_business_day(db: Session, store_id: int, business: DailyClosing) -> DailyClosing:
+    """
+    영업일 마감 (마감 API 및 자동 영업일 전환 공용)
+    - 대기 중인 고객 자동 처리 (설정에 따라)
+    - 통계 계산 및 저장
+    """
+    business_date = business.business_date
+
+    # 매장 설정 조회 (Safe)
+    settings_closing = db.query(
+        StoreSettings.auto_closing,
+        StoreSettings.closing_action
+    ).filter(StoreSettings.store_id == store_id).first()
+    
+    # 마감 시 대기 중인 고객 자동 처리
+    if settings_closing and settings_closing.auto_closing:
+        processed = _resolve_pending_waitings(db, store_id, business_date, settings_closing.closing_action)
+        print(f"[CLOSING] Processed {processed} waiting users for store {store_id}")
+
+    # 통계 계산 (매장별) - 처리 후 다시 계산하여 실시간 카운터 보정
+    sync_daily_counters(db, business)
+
+    # 마감 처리
+    business.closing_time = datetime.now()
+    business.is_closed = True
+
+    data_versions.mark(db, store_id)
+    db.commit()
+    db.refresh(business)
+    business_date_resolver.invalidate(store_id)
+
+    return business
 
-    # 2. 설정 기반 계산
-    start_hour = 5
-    try:
-        start_hour_scalar = db.query(StoreSettings.business_day_start).filter(
-            StoreSettings.store_id == store_id
-        ).scalar()
-        
-        if start_hour_scalar is not None:
-             start_hour = start_hour_scalar
-    except Exception as e:
-        # 컬럼 미생성 등 에러 시 기본값 사용
-        pass
-        
-    return get_today_date(start_hour)
 
 @router.get("/predict-date", response_model=Dict[str, str])
 async def predict_next_business_date(
@@ -51,18 +177,23 @@ async def predict_next_business_date(
     개점 예정 날짜 예측
     - 현재 상태와 설정(Strict/Flexible)을 기반으로 개점 시 사용할 날짜를 계산
     """
+    return {"business_date": predict_business_date(db, current_store.id)}
+
+
+def predict_business_date(db: Session, store_id: int) -> str:
+    """개점 중인 영업일(YYYY-MM-DD) 또는 개점 시 사용할 날짜(YYYY년 MM월 DD일)"""
     # 현재 활성화된 영업일이 있다면 그 날짜 반환
     active_closing = db.query(DailyClosing).filter(
-        DailyClosing.store_id == current_store.id,
+        DailyClosing.store_id == store_id,
         DailyClosing.is_closed == False
     ).order_by(DailyClosing.business_date.desc()).first()
 
     if active_closing:
-        return {"business_date": active_closing.business_date.strftime("%Y-%m-%d")}
+        return active_closing.business_date.strftime("%Y-%m-%d")
 
     # 없으면 계산
     settings_data = db.query(StoreSettings.business_day_start, StoreSettings.daily_opening_rule).filter(
-        StoreSettings.store_id == current_store.id
+        StoreSettings.store_id == store_id
     ).first()
     
     start_hour = settings_data.business_day_start if settings_data else 5
@@ -74,7 +205,7 @@ async def predict_next_business_date(
     # 로직 시뮬레이션
     while True:
         existing = db.query(DailyClosing).filter(
-            DailyClosing.store_id == current_store.id,
+            DailyClosing.store_id == store_id,
             DailyClosing.business_date == target_date
         ).first()
 
@@ -103,7 +234,7 @@ async def predict_next_business_date(
             # Flexible -> 다음날
             target_date = target_date + timedelta(days=1)
             
-    return {"business_date": target_date.strftime("%Y년 %m월 %d일")}
+    return target_date.strftime("%Y년 %m월 %d일")
 
 @router.post("/open", response_model=DailyClosingSchema)
 async def open_business(
@@ -156,8 +287,12 @@ async def open_business(
                  # 필요하다면 total_waiting 등을 리셋할 수도 있지만, 
                  # "잠깐 닫았다가 다시 여는" 실수 상황을 고려하면 유지가 더 안전함.
                  
+                 data_versions.mark(db, current_store.id)
+                 # 마감된 영업일이 다시 열렸으므로 분석 캐시 무효화 (같은 트랜잭션)
+                 analytics_cache.invalidate_store(db, current_store.id, f"reopen date={target_date}")
                  db.commit()
                  db.refresh(existing)
+                 business_date_resolver.invalidate(current_store.id)
                  return existing
             else:
                  # 미래 날짜의 마감 기록이 있다면? (이론상 드묾) -> 다음 날짜 확인
@@ -166,100 +301,10 @@ async def open_business(
             # 2회 이상 개점 허용 (다음 날로 이월 모드)
             # 마감된 날짜가 있으면 다음 날짜로 넘어감
             target_date = target_date + timedelta(days=1)
-
-
-    # 이월 로직을 위한 '이전 영업일' 기준은?
-    # 기본적으로 '오늘 - 1일' 이지만, Next Day 모드에서는 target_date - 1일이 맞음.
-    today = target_date # today 변수를 실제 개점할 날짜로 업데이트
     # --- Logic End ---
 
-    # --- Carry Over Logic Start ---
-    # 이전 영업일이 있고, 자동 마감이 꺼져있는 경우 대기자 이월
-    # 1. 이전 영업일 조회
-    last_business_date = today - timedelta(days=1)
-    last_daily_closing = db.query(DailyClosing).filter(
-        DailyClosing.store_id == current_store.id,
-        DailyClosing.business_date == last_business_date
-    ).first()
-
-    if last_daily_closing:
-        # Fetch auto-closing settings safely
-        settings_closing = db.query(
-            StoreSettings.auto_closing, 
-            StoreSettings.closing_action
-        ).filter(StoreSettings.store_id == current_store.id).first()
-        
-        # 2. 미처리 대기자 처리 (자동 마감인 경우)
-        if settings_closing and settings_closing.auto_closing:
-            # 2-1. 이전 영업일의 대기 중인 고객 조회
-            pending_waitings = db.query(WaitingList).filter(
-                WaitingList.store_id == current_store.id,
-                WaitingList.business_date == last_business_date,
-                WaitingList.status == 'waiting'
-            ).all()
-
-            for waiting in pending_waitings:
-                if settings_closing.closing_action == 'attended':
-                    # 출석 처리
-                    waiting.status = 'attended'
-                    waiting.attended_at = datetime.now() # 혹은 마감 시간? 현재 시간으로 처리
-                else:
-                    # 리셋 (취소 처리)
-                    waiting.status = 'cancelled'
-                    waiting.cancelled_at = datetime.now()
-
-        # 3. 자동 마감이 아닌 경우 (이월 로직 - 기존 로직 유지)
-        else:
-            # 3-1. 이전 영업일의 대기 중인 고객 조회
-            pending_waitings = db.query(WaitingList).filter(
-                WaitingList.store_id == current_store.id,
-                WaitingList.business_date == last_business_date,
-                WaitingList.status == 'waiting'
-            ).order_by(WaitingList.waiting_number).all()
-
-            # 3-2. 오늘 날짜로 이월
-            current_max_waiting_number = 0
-            
-            # 오늘 이미 대기자가 있는지 확인 (드문 경우지만)
-            today_waitings_count = db.query(WaitingList).filter(
-                WaitingList.store_id == current_store.id,
-                WaitingList.business_date == today
-            ).count()
-            
-            start_waiting_number = today_waitings_count + 1
-
-            for i, waiting in enumerate(pending_waitings):
-                # 새로운 대기 레코드 생성 (이력 관리를 위해 복사본 생성 추천하지만, 여기서는 업데이트로 가정)
-                # *중요*: 날짜 기반 파티셔닝이라면 업데이트, 아니라면 새 레코드.
-                # 여기서는 WaitingList 모델이 business_date를 PK로 쓰지 않으므로 업데이트 가능.
-                # 하지만 '이월'이라는 명시적 기록을 남기려면 어떻게 할지?
-                # -> 일단 business_date 변경 및 waiting_number 재발급
-                
-                # 기존 레코드 정보
-                old_waiting_number = waiting.waiting_number
-                
-                # 정보 업데이트
-                waiting.business_date = today
-                waiting.waiting_number = start_waiting_number + i
-                waiting.registered_at = datetime.now() # 재등록 시간? 아니면 유지? -> 이월됨을 알리기 위해 유지 또는 별도 표시 필요하지만, 일단 날짜 변경.
-                
-                # (선택사항) 이월 로그 남기기 또는 비고란 추가
-        
-        db.commit() # 이월 처리 확정
-    # --- Carry Over Logic End ---
-
-    # 새로운 영업일 생성
-    new_business = DailyClosing(
-        store_id=current_store.id,
-        business_date=today,
-        opening_time=datetime.now(),
-        is_closed=False
-    )
-    db.add(new_business)
-    db.commit()
-    db.refresh(new_business)
-
-    return new_business
+    # 이월 기준 '이전 영업일'은 실제 개점할 날짜(target_date) - 1일 (Next Day 모드 포함)
+    return open_business_day(db, current_store.id, target_date)
 
 @router.post("/close", response_model=DailyClosingSchema)
 async def close_business(
@@ -284,63 +329,7 @@ async def close_business(
     if not business:
         raise HTTPException(status_code=404, detail="개점된 영업일이 없습니다.")
 
-    # 매장 설정 조회 (Safe)
-    settings_closing = db.query(
-        StoreSettings.auto_closing,
-        StoreSettings.closing_action
-    ).filter(StoreSettings.store_id == current_store.id).first()
-    
-    # 마감 시 대기 중인 고객 자동 처리
-    if settings_closing and settings_closing.auto_closing:
-        pending_waitings = db.query(WaitingList).filter(
-            WaitingList.store_id == current_store.id,
-            WaitingList.business_date == today,
-            WaitingList.status == 'waiting'
-        ).all()
-        
-        print(f"[CLOSING] Processing {len(pending_waitings)} waiting users for store {current_store.id}")
-        
-        for waiting in pending_waitings:
-            if settings_closing.closing_action == 'attended':
-                # 출석 처리
-                waiting.status = 'attended'
-                waiting.attended_at = datetime.now()
-                print(f"[CLOSING] Marked waiting #{waiting.waiting_number} as attended")
-            else:
-                # 취소 처리
-                waiting.status = 'cancelled'
-                waiting.cancelled_at = datetime.now()
-                print(f"[CLOSING] Marked waiting #{waiting.waiting_number} as cancelled")
-
-    # 통계 계산 (매장별) - 처리 후 다시 계산
-    total_waiting = db.query(func.count(WaitingList.id)).filter(
-        WaitingList.store_id == current_store.id,
-        WaitingList.business_date == today
-    ).scalar()
-
-    total_attended = db.query(func.count(WaitingList.id)).filter(
-        WaitingList.store_id == current_store.id,
-        WaitingList.business_date == today,
-        WaitingList.status == "attended"
-    ).scalar()
-
-    total_cancelled = db.query(func.count(WaitingList.id)).filter(
-        WaitingList.store_id == current_store.id,
-        WaitingList.business_date == today,
-        WaitingList.status.in_(["cancelled", "no_show"])
-    ).scalar()
-
-    # 마감 처리
-    business.closing_time = datetime.now()
-    business.is_closed = True
-    business.total_waiting = total_waiting
-    business.total_attended = total_attended
-    business.total_cancelled = total_cancelled
-
-    db.commit()
-    db.refresh(business)
-
-    return business
+    return close_business_day(db, current_store.id, business)
 
 @router.get("/current", response_model=DailyClosingSchema)
 async def get_current_business(
@@ -5,77 +5,12 @@ from database import get_db, engine
 from models import Base, StoreSettings, WaitingList, Member, ClassInfo, DailyClosing, User, Store, Notice, NoticeAttachment, Holiday
 import os
 import json
+from services.timetable import timetable_resolver
 from datetime import datetime, date, time, timedelta, timezone
+from services.business_date import get_current_business_date
 
 router = APIRouter()
 
-# --- Helper Functions (Copied to avoid import issues) ---
-def get_today_date(start_hour: int = 7) -> date:
-    kst = timezone(timedelta(hours=9))
-    now = datetime.now(kst)
-    if not (0 <= start_hour <= 23):
-        start_hour = 7
-    cutoff_time = time(start_hour, 0, 0)
-    if now.time() < cutoff_time:
-        return (now - timedelta(days=1)).date()
-    else:
-        return now.date()
-
-def get_current_business_date(db: Session, store_id: int) -> date:
-    active_closing = db.query(DailyClosing).filter(
-        DailyClosing.store_id == store_id,
-        DailyClosing.is_closed == False
-    ).order_by(DailyClosing.business_date.desc()).first()
-
-    if active_closing:
-        return active_closing.business_date
-
-    start_hour = 7
-    try:
-        start_hour_scalar = db.query(StoreSettings.business_day_start).filter(
-            StoreSettings.store_id == store_id
-        ).scalar()
-        if start_hour_scalar is not None:
-             start_hour = start_hour_scalar
-    except:
-        pass
-        
-    return get_today_date(start_hour)
-
-WEEKDAY_MAP = {0: "mon", 1: "tue", 2: "wed", 3: "thu", 4: "fri", 5: "sat", 6: "sun"}
-
-def parse_weekday_schedule(schedule_str: str):
-    if not schedule_str: return {"mon":True,"tue":True,"wed":True,"thu":True,"fri":True,"sat":True,"sun":True}
-    try:
-        s = json.loads(schedule_str)
-        if isinstance(s, dict): return s
-    except: pass
-    return {"mon":True,"tue":True,"wed":True,"thu":True,"fri":True,"sat":True,"sun":True}
-
-def filter_classes_by_weekday(classes, target_date, db, store_id):
-    is_holiday = db.query(Holiday).filter(Holiday.store_id == store_id, Holiday.date == target_date).first()
-    filtered = []
-    if is_holiday:
-        for cls in classes:
-            if hasattr(cls, 'class_type') and cls.class_type == 'holiday':
-                filtered.append(cls)
-        return filtered
-
-    weekday_idx = target_date.weekday()
-    weekday = WEEKDAY_MAP[weekday_idx]
-    is_weekend = weekday_idx >= 5
-
-    for cls in classes:
-        if hasattr(cls, 'class_type'):
-            if cls.class_type == 'holiday': continue
-            if cls.class_type == 'weekday' and is_weekend: continue
-            if cls.class_type == 'weekend' and not is_weekend: continue
-            
-        schedule = parse_weekday_schedule(cls.weekday_schedule)
-        if schedule.get(weekday, True):
-            filtered.append(cls)
-    return filtered
-
 # --- Endpoints ---
 
 @router.get("/db-check")
@@ -142,7 +77,7 @@ def debug_classes(store_id: int, db: Session = Depends(get_db)):
     raw_classes = db.query(ClassInfo).filter(ClassInfo.store_id == store_id).all()
     filtered = []
     if today:
-        filtered = filter_classes_by_weekday(raw_classes, today, db, store_id)
+        filtered = timetable_resolver.get_classes(db, store_id, today)
         
     return {
         "store_id": store_id,
@@ -0,0 +1,273 @@
+"""
+데이터 내보내기 라우터 (CSV/XLSX)
+- 출석 목록, 출석 순위, 회원 목록, 대기 이력
+- 서버에서 스트리밍 생성하므로 다년간의 프랜차이즈 데이터도 일정한 메모리로 처리
+"""
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+from sqlalchemy import func, desc
+from datetime import date
+from typing import Optional
+
+from models import Member, Store, WaitingList, WaitingHistory, User
+from auth import get_current_store, require_franchise_admin
+from core.export import stream_export
+from routers.statistics import (
+    check_franchise_permission,
+    store_attendance_query,
+    franchise_attendance_query,
+    franchise_waiting_query,
+    ATTENDANCE_KEYS,
+    WAITING_KEYS
+)
+from core.pagination import apply_keyset
+
+router = APIRouter()
+
+FORMAT_QUERY = Query("csv", enum=["csv", "xlsx"])
+
+
+def _period_suffix(start_date: Optional[date], end_date: Optional[date]) -> str:
+    parts = [d.strftime("%Y%m%d") for d in (start_date, end_date) if d]
+    return "_" + "_".join(parts) if parts else ""
+
+
+STORE_ATTENDANCE_COLUMNS = [
+    ("영업일", lambda r: r.business_date),
+    ("이름", lambda r: r.member_name if r.member_pk is not None else r.name),
+    ("핸드폰번호", lambda r: r.member_phone if r.member_pk is not None else r.phone),
+    ("클래스", lambda r: r.class_name if r.class_name is not None else f"{r.class_order}교시"),
+    ("출석시간", lambda r: r.attended_at),
+]
+
+FRANCHISE_ATTENDANCE_COLUMNS = [
+    ("영업일", lambda r: r.business_date),
+    ("매장", lambda r: r.store_name),
+    ("이름", lambda r: r.member_name or "비회원"),
+    ("핸드폰번호", lambda r: r.phone),
+    ("출석일시", lambda r: r.attended_at),
+]
+
+RANKING_COLUMNS = [
+    ("회원ID", lambda r: r.id),
+    ("이름", lambda r: r.name),
+    ("핸드폰번호", lambda r: r.phone),
+    ("출석횟수", lambda r: r.visit_count),
+    ("최근출석", lambda r: r.last_visit),
+]
+
+MEMBER_COLUMNS = [
+    ("회원ID", lambda m: m.id),
+    ("이름", lambda m: m.name),
+    ("핸드폰번호", lambda m: m.phone),
+    ("바코드", lambda m: m.barcode),
+    ("등록일", lambda m: m.created_at),
+]
+
+WAITING_HISTORY_COLUMNS = [
+    ("영업일", lambda h: h.business_date),
+    ("대기번호", lambda h: h.waiting_number),
+    ("이름", lambda h: h.name),
+    ("핸드폰번호", lambda h: h.phone),
+    ("클래스", lambda h: h.class_name),
+    ("상태", lambda h: h.status),
+    ("접수시간", lambda h: h.registered_at),
+    ("완료시간", lambda h: h.completed_at),
+    ("대기시간(분)", lambda h: h.waiting_time_minutes),
+]
+
+FRANCHISE_WAITING_COLUMNS = [
+    ("영업일", lambda r: r.business_date),
+    ("매장", lambda r: r.store_name),
+    ("대기번호", lambda r: r.waiting_number),
+    ("이름", lambda r: r.member_name or "비회원"),
+    ("핸드폰번호", lambda r: r.phone),
+    ("상태", lambda r: r.status),
+    ("접수시간", lambda r: r.created_at),
+]
+
+
+def _ranking_query(db: Session, store_ids, start_date: Optional[date], end_date: Optional[date]):
+    """출석 순위 집계 쿼리 (회원별 출석 횟수)"""
+    query = db.query(
+        Member.id,
+        Member.name,
+        Member.phone,
+        func.count(WaitingList.id).label("visit_count"),
+        func.max(WaitingList.attended_at).label("last_visit")
+    ).join(
+        WaitingList, Member.id == WaitingList.member_id
+    ).filter(
+        WaitingList.store_id.in_(store_ids),
+        WaitingList.status == "attended"
+    )
+
+    if start_date:
+        query = query.filter(WaitingList.business_date >= start_date)
+    if end_date:
+        query = query.filter(WaitingList.business_date <= end_date)
+
+    return query.group_by(
+        Member.id, Member.name, Member.phone
+    ).order_by(
+        desc("visit_count"), Member.id
+    )
+
+
+# ========== 매장 ==========
+
+@router.get("/attendance")
+async def export_store_attendance(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    format: str = FORMAT_QUERY,
+    current_store: Store = Depends(get_current_store)
+):
+    """매장 출석 목록 내보내기"""
+    store_id = current_store.id
+    return stream_export(
+        lambda s: apply_keyset(store_attendance_query(s, store_id, start_date, end_date), ATTENDANCE_KEYS),
+        STORE_ATTENDANCE_COLUMNS,
+        f"attendance_{store_id}{_period_suffix(start_date, end_date)}",
+        format,
+        sheet_title="출석목록"
+    )
+
+
+@router.get("/ranking")
+async def export_store_ranking(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    format: str = FORMAT_QUERY,
+    current_store: Store = Depends(get_current_store)
+):
+    """매장 출석 순위 내보내기 (전체 회원)"""
+    store_id = current_store.id
+    return stream_export(
+        lambda s: _ranking_query(s, [store_id], start_date, end_date),
+        RANKING_COLUMNS,
+        f"ranking_{store_id}{_period_suffix(start_date, end_date)}",
+        format,
+        sheet_title="출석순위"
+    )
+
+
+@router.get("/members")
+async def export_store_members(
+    format: str = FORMAT_QUERY,
+    current_store: Store = Depends(get_current_store)
+):
+    """매장 회원 목록 내보내기"""
+    store_id = current_store.id
+    return stream_export(
+        lambda s: s.query(Member).filter(Member.store_id == store_id).order_by(Member.id),
+        MEMBER_COLUMNS,
+        f"members_{store_id}",
+        format,
+        sheet_title="회원목록"
+    )
+
+
+@router.get("/waiting-history")
+async def export_store_waiting_history(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    format: str = FORMAT_QUERY,
+    current_store: Store = Depends(get_current_store)
+):
+    """매장 대기 이력 내보내기"""
+    store_id = current_store.id
+
+    def build_query(s: Session):
+        query = s.query(WaitingHistory).filter(WaitingHistory.store_id == store_id)
+        if start_date:
+            query = query.filter(WaitingHistory.business_date >= start_date)
+        if end_date:
+            query = query.filter(WaitingHistory.business_date <= end_date)
+        return query.order_by(WaitingHistory.business_date, WaitingHistory.waiting_number, WaitingHistory.id)
+
+    return stream_export(
+        build_query,
+        WAITING_HISTORY_COLUMNS,
+        f"waiting_history_{store_id}{_period_suffix(start_date, end_date)}",
+        format,
+        sheet_title="대기이력"
+    )
+
+
+# ========== 프랜차이즈 ==========
+
+@router.get("/franchise/{franchise_id}/attendance")
+async def export_franchise_attendance(
+    franchise_id: int,
+    start_date: date,
+    end_date: date,
+    store_id: Optional[int] = None,
+    format: str = FORMAT_QUERY,
+    current_user: User = Depends(require_franchise_admin)
+):
+    """프랜차이즈 출석 목록 내보내기"""
+    allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
+    return stream_export(
+        lambda s: apply_keyset(
+            franchise_attendance_query(s, franchise_id, start_date, end_date, store_id, allowed_store_ids),
+            ATTENDANCE_KEYS
+        ),
+        FRANCHISE_ATTENDANCE_COLUMNS,
+        f"franchise_attendance_{franchise_id}{_period_suffix(start_date, end_date)}",
+        format,
+        sheet_title="출석목록"
+    )
+
+
+@router.get("/franchise/{franchise_id}/ranking")
+async def export_franchise_ranking(
+    franchise_id: int,
+    start_date: date,
+    end_date: date,
+    store_id: Optional[int] = None,
+    format: str = FORMAT_QUERY,
+    current_user: User = Depends(require_franchise_admin)
+):
+    """프랜차이즈 출석 순위 내보내기"""
+    allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
+
+    def build_query(s: Session):
+        if store_id:
+            store_ids = [store_id]
+        elif allowed_store_ids is not None:
+            store_ids = allowed_store_ids
+        else:
+            store_ids = s.query(Store.id).filter(Store.franchise_id == franchise_id)
+        return _ranking_query(s, store_ids, start_date, end_date)
+
+    return stream_export(
+        build_query,
+        RANKING_COLUMNS,
+        f"franchise_ranking_{franchise_id}{_period_suffix(start_date, end_date)}",
+        format,
+        sheet_title="출석순위"
+    )
+
+
+@router.get("/franchise/{franchise_id}/waiting")
+async def export_franchise_waiting(
+    franchise_id: int,
+    start_date: date,
+    end_date: date,
+    store_id: Optional[int] = None,
+    format: str = FORMAT_QUERY,
+    current_user: User = Depends(require_franchise_admin)
+):
+    """프랜차이즈 대기 목록 내보내기"""
+    allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
+    return stream_export(
+        lambda s: apply_keyset(
+            franchise_waiting_query(s, franchise_id, start_date, end_date, store_id, allowed_store_ids),
+            WAITING_KEYS, descending=False
+        ),
+        FRANCHISE_WAITING_COLUMNS,
+        f"franchise_waiting_{franchise_id}{_period_suffix(start_date, end_date)}",
+        format,
+        sheet_title="대기목록"
+    )
@@ -1,7 +1,7 @@
 """
 파일 업로드 API
 """
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Request, status
 from sqlalchemy.orm import Session
 from typing import List
 import uuid
@@ -11,6 +11,7 @@ from pathlib import Path
 from database import get_db
 from models import User, NoticeAttachment
 from auth import require_system_admin
+from core.http_cache import cached_file_response
 
 router = APIRouter()
 
@@ -132,13 +133,16 @@ async def delete_upload(
 
 
 @router.get("/download/{attachment_id}")
-async def download_file(
+def download_file(
     attachment_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
-    """첨부파일 다운로드"""
-    from fastapi.responses import FileResponse
-    
+    """
+    첨부파일 다운로드
+    - 저장 파일명이 업로드마다 새로 생성되므로 내용 해시 ETag + 장기 캐시 (If-None-Match 일치 시 304)
+    - 공지 대상 매장에만 보이는 파일이므로 공유 캐시(private) 제외
+    """
     attachment = db.query(NoticeAttachment).filter(
         NoticeAttachment.id == attachment_id
     ).first()
@@ -157,8 +161,11 @@ async def download_file(
             detail="파일을 찾을 수 없습니다"
         )
     
-    return FileResponse(
-        path=file_path,
+    return cached_file_response(
+        request,
+        file_path,
+        immutable=True,
+        public=False,
         filename=attachment.filename,
         media_type=attachment.file_type
     )
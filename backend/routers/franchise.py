@@ -11,7 +11,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import datetime, date
 
-from database import get_db
+from database import get_db, get_read_db
 from models import Franchise, Store, User, WaitingList, DailyClosing, Member
 from schemas import Franchise as FranchiseSchema, FranchiseUpdate
 from auth import get_current_user, require_franchise_admin
@@ -89,7 +89,7 @@ async def update_franchise(
 @router.get("/stats")
 async def get_franchise_stats(
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """프랜차이즈 전체 통계 조회
 
@@ -120,7 +120,9 @@ async def get_franchise_stats(
                 'today_stats': {
                     'total_waiting': 0,
                     'total_attended': 0,
-                    'total_cancelled': 0
+                    'total_cancelled': 0,
+                    'total_called': 0,
+                    'total_no_show': 0
                 },
                 'current_waiting': 0,
                 'stores': []
@@ -150,52 +152,52 @@ async def get_franchise_stats(
         )
     total_users = user_query.scalar()
 
-    # 오늘의 대기 통계 (모든 매장 합계)
-    today_stats = db.query(
-        func.coalesce(func.sum(DailyClosing.total_waiting), 0).label('total_waiting'),
-        func.coalesce(func.sum(DailyClosing.total_attended), 0).label('total_attended'),
-        func.coalesce(func.sum(DailyClosing.total_cancelled), 0).label('total_cancelled')
-    ).filter(
-        DailyClosing.store_id.in_(store_ids),
-        DailyClosing.business_date == today
-    ).first()
+    # 오늘의 대기 통계 - 영업 중 실시간으로 갱신되는 DailyClosing 카운터를 매장별로 1회 조회
+    today_closings = {
+        c.store_id: c for c in db.query(DailyClosing).filter(
+            DailyClosing.store_id.in_(store_ids),
+            DailyClosing.business_date == today
+        ).all()
+    } if store_ids else {}
 
-    # 현재 대기 중인 고객 수 (모든 매장 합계)
-    current_waiting = db.query(func.count(WaitingList.id)).filter(
+    # 현재 대기 중인 고객 수 (매장별 1회 집계)
+    waiting_counts = dict(db.query(WaitingList.store_id, func.count(WaitingList.id)).filter(
         WaitingList.store_id.in_(store_ids),
         WaitingList.status == 'waiting'
-    ).scalar()
-
-
+    ).group_by(WaitingList.store_id).all()) if store_ids else {}
+    current_waiting = sum(waiting_counts.values())
 
     # 총 회원 수 (모든 매장 합계)
     total_members = db.query(func.count(Member.id)).filter(
         Member.store_id.in_(store_ids)
     ).scalar() if store_ids else 0
 
+    today_stats = {
+        'total_waiting': 0,
+        'total_attended': 0,
+        'total_cancelled': 0,
+        'total_called': 0,
+        'total_no_show': 0
+    }
+
     # 매장별 간단한 통계
     store_stats = []
     for store in stores:
-        # 매장의 오늘 통계
-        store_today = db.query(DailyClosing).filter(
-            DailyClosing.store_id == store.id,
-            DailyClosing.business_date == today
-        ).first()
-
-        # 매장의 현재 대기 수
-        store_waiting = db.query(func.count(WaitingList.id)).filter(
-            WaitingList.store_id == store.id,
-            WaitingList.status == 'waiting'
-        ).scalar()
+        store_today = today_closings.get(store.id)
+        if store_today:
+            for key in today_stats:
+                today_stats[key] += getattr(store_today, key) or 0
 
         store_stats.append({
             'store_id': store.id,
             'store_name': store.name,
             'store_code': store.code,
-            'current_waiting': store_waiting,
+            'current_waiting': waiting_counts.get(store.id, 0),
             'today_total': store_today.total_waiting if store_today else 0,
             'today_attended': store_today.total_attended if store_today else 0,
             'today_cancelled': store_today.total_cancelled if store_today else 0,
+            'today_called': (store_today.total_called or 0) if store_today else 0,
+            'today_no_show': (store_today.total_no_show or 0) if store_today else 0,
             'is_open': store_today.is_closed == False if store_today else False
         })
 
@@ -205,11 +207,7 @@ async def get_franchise_stats(
         'active_stores': active_stores,
         'total_users': total_users,
         'total_members': total_members,
-        'today_stats': {
-            'total_waiting': today_stats.total_waiting if today_stats else 0,
-            'total_attended': today_stats.total_attended if today_stats else 0,
-            'total_cancelled': today_stats.total_cancelled if today_stats else 0
-        },
+        'today_stats': today_stats,
         'current_waiting': current_waiting,
         'stores': store_stats
     }
@@ -222,7 +220,7 @@ async def get_franchise_dashboard_stats(
     store_id: Optional[int] = None,
     period: str = "hourly",
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """프랜차이즈 대시보드 통계 조회 (기간별)"""
     
@@ -275,7 +273,7 @@ async def get_my_franchise_dashboard_stats(
     store_id: Optional[int] = None,
     period: str = "hourly",
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """(Frontend Wrapper) Logged-in franchise admin dashboard stats"""
     if not current_user.franchise_id:
@@ -6,6 +6,8 @@ from datetime import date, datetime
 from database import get_db
 from models import Holiday, Store
 from auth import get_current_store
+from services.timetable import timetable_resolver
+from services.data_version import data_versions
 from pydantic import BaseModel
 
 router = APIRouter(
@@ -53,7 +55,9 @@ def create_holiday(
         name=holiday.name
     )
     db.add(new_holiday)
+    data_versions.mark(db, current_store.id)
     db.commit()
+    timetable_resolver.invalidate_holidays(current_store.id)
     db.refresh(new_holiday)
     return new_holiday
 
@@ -72,7 +76,9 @@ def delete_holiday(
         raise HTTPException(status_code=404, detail="Holiday not found")
         
     db.delete(holiday)
+    data_versions.mark(db, current_store.id)
     db.commit()
+    timetable_resolver.invalidate_holidays(current_store.id)
     return {"status": "success"}
 
 @router.post("/import/{year}")
@@ -124,7 +130,9 @@ def import_holidays(
             db.add(new_holiday)
             imported_count += 1
         
+        data_versions.mark(db, current_store.id)
         db.commit()
+        timetable_resolver.invalidate_holidays(current_store.id)
         
         return {
             "message": f"{year}년 공휴일 {imported_count}개를 불러왔습니다. (중복 {skipped_count}개 제외)",
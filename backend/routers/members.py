@@ -6,7 +6,7 @@ import openpyxl
 from io import BytesIO
 from datetime import datetime, date, timedelta
 
-from database import get_db
+from database import get_db, get_read_db
 from models import Member, Store, WaitingList, StoreSettings
 from schemas import (
     Member as MemberSchema,
@@ -15,8 +15,10 @@ from schemas import (
     MemberBulkCreate
 )
 from auth import get_current_store
-from sse_manager import sse_manager
+from services.sse_outbox import sse_outbox
+from services.analytics_cache import analytics_cache
 from core.logger import logger
+from core.pagination import keyset_page, set_next_cursor
 
 router = APIRouter()
 
@@ -105,10 +107,9 @@ async def create_member(
         # w.name = db_member.name # 이름도 동기화 (선택적)
     
     if active_waitings:
-        db.commit()
-        
         # 1. 관리자(Admin)에게는 무조건 전송
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="member_updated",
             data={
@@ -131,7 +132,8 @@ async def create_member(
                 logger.debug(f"Skipping member_updated broadcast to BOARD/RECEPTION (Board: disabled, Reception: disabled): store_id={current_store.id}")
 
         if should_broadcast_board:
-            await sse_manager.broadcast(
+            sse_outbox.publish(
+                db,
                 store_id=str(current_store.id),
                 event_type="member_updated",
                 data={
@@ -143,17 +145,26 @@ async def create_member(
                 target_role='board'
             )
 
+        # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+        db.commit()
+
     return db_member
 
 @router.get("", response_model=List[MemberSchema])
 async def get_members(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
     search: Optional[str] = None,
+    cursor: Optional[str] = None,
     current_store: Store = Depends(get_current_store),
     db: Session = Depends(get_db)
 ):
-    """회원 목록 조회"""
+    """
+    회원 목록 조회
+    - cursor 지정 시 offset 대신 키셋(id) 페이지네이션 사용
+    - 다음 페이지 커서는 X-Next-Cursor 헤더로 전달
+    """
     query = db.query(Member).filter(Member.store_id == current_store.id)
 
     # 검색 조건 (이름 또는 핸드폰번호)
@@ -178,7 +189,10 @@ async def get_members(
                 )
             )
 
-    members = query.offset(skip).limit(limit).all()
+    members, next_cursor = keyset_page(
+        query, (Member.id,), lambda m: (m.id,), limit, cursor, descending=False, offset=skip
+    )
+    set_next_cursor(response, next_cursor)
     return members
 
 @router.get("/{member_id}", response_model=MemberSchema)
@@ -251,11 +265,9 @@ async def update_member(
     for field, value in update_data.items():
         setattr(db_member, field, value)
 
-    db.commit()
-    db.refresh(db_member)
-
     # 1. 관리자(Admin)에게는 무조건 전송
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="member_updated",
         data={
@@ -278,7 +290,8 @@ async def update_member(
             logger.debug(f"Skipping member_updated broadcast to BOARD/RECEPTION (Board: disabled, Reception: disabled): store_id={current_store.id}")
 
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="member_updated",
             data={
@@ -301,9 +314,12 @@ async def update_member(
     for w in active_waitings:
         if w.member_id != db_member.id:
             w.member_id = db_member.id
-    
-    if active_waitings:
-        db.commit()
+
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    # 과거 통계(출석 순위/신규 회원)에 회원 정보가 포함되므로 분석 캐시 무효화
+    analytics_cache.invalidate_store(db, current_store.id, f"member updated id={member_id}")
+    db.commit()
+    db.refresh(db_member)
 
     return db_member
 
@@ -323,6 +339,7 @@ async def delete_member(
         raise HTTPException(status_code=404, detail="회원을 찾을 수 없습니다.")
 
     db.delete(db_member)
+    analytics_cache.invalidate_store(db, current_store.id, f"member deleted id={member_id}")
     db.commit()
 
     return {"message": "회원이 삭제되었습니다."}
@@ -428,7 +445,7 @@ async def get_member_attendance_ranking(
     end_date: Optional[date] = None,
     limit: int = 10,
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     회원 출석 순위 조회 (기본값: 이번달)
@@ -474,7 +491,7 @@ async def get_member_attendance_ranking(
 async def get_new_members_statistics(
     period: str = "month", # today, week, month
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     신규 회원 목록 조회
@@ -511,7 +528,7 @@ async def get_new_members_statistics(
 async def get_inactive_members(
     threshold_days: int = 30,
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     장기 미출석 회원 조회 (최근 방문이 threshold_days 이전인 회원)
@@ -560,7 +577,7 @@ async def get_returning_members(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     재방문 회원 조회 (기간 내 2회 이상 방문)
@@ -1,62 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from datetime import date
-from typing import Dict, Any
+from typing import Optional
 
 from database import get_db
-from models import WaitingList, ClassClosure, Store
 from routers.waiting import get_current_business_date
+from services.data_version import data_versions, etag_headers, is_not_modified, not_modified_response
 
 router = APIRouter()
 
 @router.get("/sync-check/{store_id}")
 async def sync_check(
     store_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Lightweight endpoint to check for data changes.
-    Returns a combined hash/token of relevant timestamps.
+    Returns the store's data version token (bumped on every queue, class or closure change).
+    Answers If-None-Match with 304 without touching the DB.
     """
     today = get_current_business_date(db, store_id)
-    
-    # 1. Latest activity in WaitingList (today)
-    # Using MAX of created_at as a proxy for any change
-    latest_waiting = db.query(func.max(WaitingList.created_at)).filter(
-        WaitingList.store_id == store_id,
-        WaitingList.business_date == today
-    ).scalar()
-    
-    # 2. Latest class closure (today)
-    latest_closure = db.query(func.max(ClassClosure.created_at)).filter(
-        ClassClosure.store_id == store_id,
-        ClassClosure.business_date == today
-    ).scalar()
-    
-    # 3. Store heartbeat/update
-    store_update = db.query(Store.updated_at).filter(Store.id == store_id).scalar()
-    
-    # 4. Count of active waiters (status change detection)
-    # Since we don't have updated_at on WaitingList, count is a reliable way to detect 
-    # additions/removals/status changes (if they happen via batch actions that delete/re-add)
-    # Better: aggregate status counts
-    status_counts = db.query(WaitingList.status, func.count(WaitingList.id)).filter(
-        WaitingList.store_id == store_id,
-        WaitingList.business_date == today
-    ).group_by(WaitingList.status).all()
-    
-    # Create a stable token string
-    token_parts = [
-        str(latest_waiting) if latest_waiting else "0",
-        str(latest_closure) if latest_closure else "0",
-        str(store_update) if store_update else "0",
-        str(dict(status_counts))
-    ]
-    
-    sync_token = "|".join(token_parts)
-    
+    etag = data_versions.etag(store_id, today)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    return JSONResponse(
+        content={
+            "sync_token": etag.strip('"'),
+            "version": data_versions.current(store_id),
+            "business_date": str(today)
+        },
+        headers=etag_headers(etag)
+    )
+
+
+@router.get("/wait/{store_id}")
+async def wait_for_change(
+    store_id: int,
+    since: Optional[int] = None,
+    timeout: int = Query(25, ge=1, le=55)
+):
+    """
+    Long-poll change feed (fallback for clients that cannot hold SSE).
+    Holds the request until the store's data version differs from `since` or `timeout` seconds pass.
+    Returns the current version and the classes changed since `since`
+    (class_ids is null when unknown - refresh everything). No DB session is held while waiting.
+    """
+    version = await data_versions.wait_for_change(store_id, since, timeout)
+    if since is None:
+        class_ids = None
+    elif version == since:
+        class_ids = []
+    else:
+        class_ids = data_versions.changed_classes(store_id, since)
     return {
-        "sync_token": sync_token,
-        "business_date": str(today)
+        "version": version,
+        "changed": version != since,
+        "class_ids": class_ids
     }
@@ -1,11 +1,15 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, date
 from typing import List, Optional
+import asyncio
+import os
 from utils import get_kst_now
 
-from database import get_db
+from database import get_db, SessionLocal
 from models import (
     Store, StoreSettings, WaitingList, ClassInfo, DailyClosing, 
     Member, ClassClosure, Holiday
@@ -14,19 +18,33 @@ from schemas import (
     WaitingListCreate, WaitingListResponse, 
     StoreBase
 )
-from routers.waiting import (
-    get_current_business_date, filter_classes_by_weekday, 
-    get_next_waiting_number
-)
-from sse_manager import sse_manager
+from routers.waiting import get_current_business_date
+from services.timetable import timetable_resolver
+from services.daily_counters import record_registration
+from services.sse_outbox import sse_outbox
+from services.data_version import data_versions, is_not_modified
+from services.fast_json import dumps, sse_frame
+from services.queue_rank import queue_rank, StoreQueue, TicketPosition
+from services.store_codes import store_codes
+from services.rate_limiter import rate_limit
+from services.registration_check import load_registration_snapshot, is_duplicate_waiting_error
 from core.logger import logger
+from core.http_cache import content_etag
 
 router = APIRouter()
 
+# 티켓 채널 heartbeat 간격 (초)
+TICKET_PING_SECONDS = 25
+# 공개 매장 정보 공유 캐시 유효 시간 (초) - 대기 인원 표시가 늦어지는 최대 시간
+PUBLIC_STORE_MAX_AGE = int(os.getenv("PUBLIC_STORE_CACHE_SECONDS", "10"))
+PUBLIC_STORE_STALE_SECONDS = 30
+
 @router.get("/store/{store_code}")
-def get_public_store_info(store_code: str, db: Session = Depends(get_db)):
+def get_public_store_info(store_code: str, request: Request, db: Session = Depends(get_db)):
     """
     공용: 매장 기본 정보 조회
+    - QR 접속이 몰리는 공개 조회이므로 CDN/프록시가 짧게 캐시하도록 public max-age + 내용 기반 ETag
+    - If-None-Match 일치 시 304
     """
     store = db.query(Store).filter(Store.code == store_code, Store.is_active == True).first()
     if not store:
@@ -60,7 +78,7 @@ def get_public_store_info(store_code: str, db: Session = Depends(get_db)):
                     if settings.break_start_time <= now_time <= settings.break_end_time:
                         is_break_time = True
 
-    return {
+    body = dumps({
         "id": store.id,
         "name": store.name,
         "current_waiting_count": current_waiting_count,
@@ -84,9 +102,17 @@ def get_public_store_info(store_code: str, db: Session = Depends(get_db)):
             "party_size_config": settings.party_size_config if settings else None,
             "enable_menu_ordering": settings.enable_menu_ordering if settings else False
         }
+    })
+    etag = content_etag(body)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"public, max-age={PUBLIC_STORE_MAX_AGE}, stale-while-revalidate={PUBLIC_STORE_STALE_SECONDS}"
     }
+    if is_not_modified(request, etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
 
-@router.post("/waiting/{store_code}/register")
+@router.post("/waiting/{store_code}/register", dependencies=[Depends(rate_limit("register"))])
 async def public_register_waiting(
     store_code: str,
     waiting: WaitingListCreate,
@@ -104,25 +130,15 @@ async def public_register_waiting(
     current_store_id = store.id
     today = get_current_business_date(db, current_store_id)
     
-    # 2. 영업 확인
-    business = db.query(DailyClosing).filter(
-        DailyClosing.business_date == today,
-        DailyClosing.is_closed == False,
-        DailyClosing.store_id == current_store_id
-    ).first()
+    # 사전 검사 값 묶음 조회
+    snapshot = load_registration_snapshot(db, current_store_id, today, waiting.phone)
 
-    if not business:
+    # 2. 영업 확인
+    if not snapshot.is_open:
         raise HTTPException(status_code=400, detail="영업 중이 아닙니다.")
 
     # 3. 중복 대기 확인
-    existing = db.query(WaitingList).filter(
-        WaitingList.business_date == today,
-        WaitingList.phone == waiting.phone,
-        WaitingList.status == "waiting",
-        WaitingList.store_id == current_store_id
-    ).first()
-
-    if existing:
+    if snapshot.is_duplicate:
         raise HTTPException(status_code=400, detail="이미 대기 중인 번호입니다.")
 
     # 4. 설정 확인 (Limits & Hours)
@@ -154,23 +170,15 @@ async def public_register_waiting(
                         )
 
         if settings.use_max_waiting_limit and settings.max_waiting_limit > 0:
-            current_waiting_count = db.query(func.count(WaitingList.id)).filter(
-                WaitingList.business_date == today,
-                WaitingList.status == "waiting",
-                WaitingList.store_id == current_store_id
-            ).scalar()
-            
-            if current_waiting_count >= settings.max_waiting_limit:
+            if snapshot.waiting_count >= settings.max_waiting_limit:
                  raise HTTPException(status_code=400, detail="대기 인원이 가득 찼습니다.")
 
     # 5. 멤버 조회 및 생성 (필요 시)
-    member = db.query(Member).filter(
-        Member.phone == waiting.phone,
-        Member.store_id == current_store_id
-    ).first()
+    member_id = snapshot.member_id
+    name = snapshot.member_name if member_id else (waiting.name or "고객")
     
     is_new_member = False
-    if not member:
+    if not member_id:
         is_new_member = True
         # 자동 가입 설정이 있거나, public 등록은 기본적으로 가벼운 멤버 생성을 할 수 있음
         # 하지만 기존 로직을 따라 설정이 있을때만 하거나, 아니면 public은 이름만 받아서 WaitingList에만 넣을 수도 있음.
@@ -186,27 +194,15 @@ async def public_register_waiting(
             )
              db.add(new_member)
              db.flush()
-             member = new_member
-    
-    member_id = member.id if member else None
-    name = member.name if member else (waiting.name or "고객")
+             member_id = new_member.id
+             name = new_member.name
     
     # 6. 클래스 배정 (기존 로직 재사용)
-    all_classes_raw = db.query(ClassInfo).filter(
-        ClassInfo.store_id == current_store_id,
-        ClassInfo.is_active == True
-    ).order_by(ClassInfo.class_number).all()
-    
-    all_classes = filter_classes_by_weekday(all_classes_raw, today, db, current_store_id)
+    all_classes = timetable_resolver.get_classes(db, current_store_id, today)
     if not all_classes:
          raise HTTPException(status_code=400, detail="운영 교시가 없습니다.")
          
-    closed_class_ids = [
-        cc.class_id for cc in db.query(ClassClosure).filter(
-            ClassClosure.store_id == current_store_id,
-            ClassClosure.business_date == today
-        ).all()
-    ]
+    closed_class_ids = snapshot.closed_class_ids
     
     target_class = None
     class_order = 0
@@ -215,12 +211,7 @@ async def public_register_waiting(
         if cls.id in closed_class_ids:
             continue
             
-        current_count = db.query(func.count(WaitingList.id)).filter(
-            WaitingList.class_id == cls.id,
-            WaitingList.business_date == today,
-            WaitingList.status.in_(["waiting", "called", "attended"]),
-            WaitingList.store_id == current_store_id
-        ).scalar()
+        current_count = snapshot.occupancy.get(cls.id, 0)
         
         if current_count < cls.max_capacity:
             target_class = cls
@@ -231,7 +222,7 @@ async def public_register_waiting(
         raise HTTPException(status_code=400, detail="모든 교시가 마감되었습니다.")
 
     # 7. 대기 등록
-    waiting_number = get_next_waiting_number(db, today, current_store_id)
+    waiting_number = snapshot.next_waiting_number
     
     new_waiting = WaitingList(
         business_date=today,
@@ -249,8 +240,15 @@ async def public_register_waiting(
     )
     
     db.add(new_waiting)
-    db.commit()
-    db.refresh(new_waiting)
+    record_registration(db, current_store_id, today)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        # 동시 접수 경합 (부분 유니크 인덱스)
+        db.rollback()
+        if is_duplicate_waiting_error(e):
+            raise HTTPException(status_code=400, detail="이미 대기 중인 번호입니다.")
+        raise
     
     # 8. SSE Broadcast (중요: 관리자/보드 업데이트용)
     try:
@@ -267,14 +265,16 @@ async def public_register_waiting(
         }
         
         # Admin
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store_id),
             event_type="new_user",
             data=common_data,
             target_role='admin'
         )
         # Board/Reception (Check settings if needed, but safe to send)
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store_id),
             event_type="new_user",
             data=common_data,
@@ -283,7 +283,10 @@ async def public_register_waiting(
          
     except Exception as e:
         logger.error(f"Public register broadcast failed: {e}")
-        
+
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return WaitingListResponse(
         id=new_waiting.id,
         waiting_number=waiting_number,
@@ -298,7 +301,7 @@ async def public_register_waiting(
         is_new_member=is_new_member
     )
 
-@router.get("/waiting/{store_code}/status")
+@router.get("/waiting/{store_code}/status", dependencies=[Depends(rate_limit("status"))])
 def get_public_waiting_status(
     store_code: str, 
     phone: str, 
@@ -306,38 +309,114 @@ def get_public_waiting_status(
 ):
     """
     공용: 대기 상태 조회
+    - 매장 코드 캐시와 대기 순위 인덱스 사용 (데이터 변경이 없으면 DB 조회 없음)
     """
-    store = db.query(Store).filter(Store.code == store_code, Store.is_active == True).first()
-    if not store:
+    store = store_codes.get(db, store_code)
+    if not store or not store.is_active:
         raise HTTPException(status_code=404, detail="매장을 찾을 수 없습니다.")
 
     today = get_current_business_date(db, store.id)
-    
-    waiting = db.query(WaitingList).filter(
-        WaitingList.business_date == today,
-        WaitingList.phone == phone,
-        WaitingList.status == "waiting",
-        WaitingList.store_id == store.id
-    ).first()
-    
-    if not waiting:
+
+    queue = queue_rank.get(store.id, today, db)
+    ticket = queue.find_by_phone(phone)
+
+    if not ticket:
         return {"found": False, "message": "대기 내역이 없습니다."}
-        
-    class_info = db.query(ClassInfo).get(waiting.class_id)
-    
-    ahead_count = db.query(func.count(WaitingList.id)).filter(
-        WaitingList.business_date == today,
-        WaitingList.status == "waiting",
-        WaitingList.waiting_number < waiting.waiting_number,
-        WaitingList.store_id == store.id
-    ).scalar()
-    
+
     return {
         "found": True,
-        "waiting_number": waiting.waiting_number,
-        "class_name": class_info.class_name,
-        "class_order": waiting.class_order,
-        "ahead_count": ahead_count,
-        "name": waiting.name,
+        "waiting_id": ticket.waiting_id,
+        "waiting_number": ticket.waiting_number,
+        "class_name": ticket.class_name,
+        "class_order": ticket.class_order,
+        "ahead_count": queue.ahead_count(ticket),
+        "name": ticket.name,
         "store_name": store.name
     }
+
+
+def _ticket_payload(queue: StoreQueue, ticket: TicketPosition) -> dict:
+    return {
+        "waiting_id": ticket.waiting_id,
+        "waiting_number": ticket.waiting_number,
+        "class_name": ticket.class_name,
+        "class_order": ticket.class_order,
+        "ahead_count": queue.ahead_count(ticket),
+        "call_count": ticket.call_count,
+        "last_called_at": ticket.last_called_at.isoformat() if ticket.last_called_at else None
+    }
+
+
+def _ticket_final_status(waiting_id: int) -> Optional[str]:
+    db = SessionLocal()
+    try:
+        return db.query(WaitingList.status).filter(WaitingList.id == waiting_id).scalar()
+    finally:
+        db.close()
+
+
+@router.get("/waiting/{store_code}/ticket/{waiting_id}/stream", dependencies=[Depends(rate_limit("status"))])
+async def stream_public_ticket(
+    store_code: str,
+    waiting_id: int,
+    phone: str,
+    request: Request
+):
+    """
+    공용: 대기 티켓 실시간 채널 (SSE)
+    - ticket_status: 순서/앞 대기 팀 수 변경 시 전송
+    - ticket_called: 호출 시 전송 ("입장 차례")
+    - ticket_closed: 입장/취소 등으로 대기가 끝나면 전송 후 종료
+    - 매장 데이터 버전이 바뀔 때만 깨어나며 대기 중에는 DB 세션을 잡지 않음
+    """
+    db = SessionLocal()
+    try:
+        store = store_codes.get(db, store_code)
+        if not store or not store.is_active:
+            raise HTTPException(status_code=404, detail="매장을 찾을 수 없습니다.")
+        today = get_current_business_date(db, store.id)
+        queue, ticket = queue_rank.locate(store.id, today, waiting_id, db)
+    finally:
+        db.close()
+
+    if not ticket or ticket.phone != phone:
+        raise HTTPException(status_code=404, detail="대기 내역이 없습니다.")
+
+    def message(event: str, data: dict) -> str:
+        return sse_frame({'event': event, 'data': data})
+
+    async def ticket_events():
+        current_queue, current_ticket = queue, ticket
+        last_payload = _ticket_payload(current_queue, current_ticket)
+        yield message("ticket_status", last_payload)
+
+        while not await request.is_disconnected():
+            version = await data_versions.wait_for_change(store.id, current_queue.version, TICKET_PING_SECONDS)
+            if version == current_queue.version:
+                yield message("ping", {})
+                continue
+
+            current_queue, current_ticket = await asyncio.to_thread(
+                queue_rank.locate, store.id, today, waiting_id
+            )
+            if current_ticket is None:
+                status = await asyncio.to_thread(_ticket_final_status, waiting_id)
+                yield message("ticket_closed", {"waiting_id": waiting_id, "status": status})
+                return
+
+            payload = _ticket_payload(current_queue, current_ticket)
+            if payload["call_count"] > last_payload["call_count"]:
+                yield message("ticket_called", payload)
+            elif payload != last_payload:
+                yield message("ticket_status", payload)
+            last_payload = payload
+
+    return StreamingResponse(
+        ticket_events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            "Content-Encoding": "none",
+        }
+    )
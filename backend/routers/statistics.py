@@ -1,18 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from starlette.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import func, desc, case, and_, or_, text
 from datetime import datetime, date, timedelta
 from typing import List, Optional
 
-from database import get_db
+from database import get_read_db, session_factory_for
 from models import Franchise, Store, Member, WaitingList, DailyClosing, User
 from auth import require_franchise_admin, get_current_store
 from sse_manager import sse_manager, event_generator
 import schemas
 import models
-from utils import get_today_date
+from utils import get_today_date, get_kst_now
 from core.logger import logger
+from core.pagination import (
+    MAX_PAGE_SIZE,
+    NULL_DATETIME,
+    not_null_key,
+    apply_keyset,
+    keyset_page,
+    set_next_cursor,
+    stream_ndjson
+)
+from services.analytics_cache import analytics_cache
+from services.analytics_store import analytics_store
 
 router = APIRouter()
 
@@ -48,6 +59,47 @@ def check_franchise_permission(current_user: User, franchise_id: int, store_id:
 
     raise HTTPException(status_code=403, detail="권한이 없습니다.")
 
+
+def _analytics_store_scope(store_id: Optional[int], allowed_store_ids: Optional[List[int]]) -> Optional[tuple]:
+    """분석 캐시용 매장 범위 (None이면 프랜차이즈 전체)"""
+    if store_id:
+        return (store_id,)
+    if allowed_store_ids is not None:
+        return tuple(sorted(allowed_store_ids))
+    return None
+
+
+def _analytics_cache_key(db: Session, endpoint: str, franchise_id: int, store_scope: Optional[tuple], start_date: date, end_date: date, **params) -> tuple:
+    """분석 캐시 키 (조회 범위 매장들의 분석 세대 포함 - 다른 워커의 무효화도 반영)"""
+    generation = analytics_cache.generation(db, franchise_id=franchise_id, store_ids=store_scope)
+    return analytics_cache.make_key(endpoint, (franchise_id, store_scope, generation), start_date, end_date, **params)
+
+
+def _cache_analytics_result(db: Session, cache_key: tuple, result, franchise_id: int, store_scope: Optional[tuple], end_date: date):
+    """분석 결과 캐시 저장 (마감된 기간이면 무기한, 아니면 짧은 TTL)"""
+    immutable = analytics_cache.is_closed_range(db, end_date, store_ids=store_scope, franchise_id=franchise_id)
+    analytics_cache.set(cache_key, result, immutable=immutable)
+    return result
+
+def _historical_store_ids(db: Session, franchise_id: int, store_scope: Optional[tuple], end_date: date, active_only: bool = False) -> Optional[List[int]]:
+    """
+    Parquet(DuckDB) 조회 대상이면 매장 ID 목록 반환
+    - 종료일이 오늘 이전이고 대상 매장 모두 종료일까지 내보내기 된 경우만 해당
+    - 그 외에는 None (운영 DB에서 조회)
+    """
+    if not analytics_store.enabled or end_date >= get_kst_now().date():
+        return None
+
+    if store_scope is not None:
+        store_ids = list(store_scope)
+    else:
+        query = db.query(Store.id).filter(Store.franchise_id == franchise_id)
+        if active_only:
+            query = query.filter(Store.is_active == True)
+        store_ids = [s[0] for s in query.all()]
+
+    return store_ids if analytics_store.covers(db, store_ids, end_date) else None
+
 # Duplicate endpoints removed:
 # 1. SSE Stream -> Handled in routers/sse.py (or needs to be) and routers/franchise.py
 # 2. Dashboard Stats -> Handled in routers/franchise.py (get_franchise_dashboard_stats)
@@ -59,25 +111,12 @@ def check_franchise_permission(current_user: User, franchise_id: int, store_id:
 # Removing it clarifies that logic resides in franchise.py.
 
 
-@router.get("/{franchise_id}/attendance/list")
-async def get_attendance_list(
-    franchise_id: int,
-    start_date: date,
-    end_date: date,
-    store_id: Optional[int] = None,
-    current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
-):
-    """
-    출석 목록 상세 조회 (전체 매장 또는 특정 매장)
-    - 기간 내 출석 완료된 목록
-    """
-    allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
-    
-    # 기본 쿼리: WaitingList와 Store, Member 조인
+def franchise_attendance_query(db: Session, franchise_id: int, start_date: date, end_date: date, store_id: Optional[int], allowed_store_ids: Optional[List[int]]):
+    """프랜차이즈 출석 목록 기본 쿼리 (WaitingList + Store + Member 조인)"""
     query = db.query(
         WaitingList.id,
         WaitingList.phone,
+        WaitingList.business_date,
         WaitingList.attended_at,
         WaitingList.status,
         Store.name.label("store_name"),
@@ -94,29 +133,76 @@ async def get_attendance_list(
         WaitingList.attended_at >= datetime.combine(start_date, datetime.min.time()),
         WaitingList.attended_at <= datetime.combine(end_date, datetime.max.time())
     )
-    
+
     if store_id:
         query = query.filter(WaitingList.store_id == store_id)
-    
+
     if allowed_store_ids is not None:
         query = query.filter(Store.id.in_(allowed_store_ids))
-        
-    results = query.order_by(
-        desc(WaitingList.attended_at)
-    ).all()
-    
-    return [
-        {
-            "id": r.id,
-            "phone": r.phone,
-            "attended_at": r.attended_at,
-            "status": r.status,
-            "store_name": r.store_name,
-            "member_name": r.member_name or "비회원",
-            "member_id": r.member_id
-        }
-        for r in results
-    ]
+
+    return query
+
+
+def _serialize_franchise_attendance(r) -> dict:
+    return {
+        "id": r.id,
+        "phone": r.phone,
+        "attended_at": r.attended_at,
+        "status": r.status,
+        "store_name": r.store_name,
+        "member_name": r.member_name or "비회원",
+        "member_id": r.member_id
+    }
+
+
+# 출석 목록 커서 정렬 키: (business_date, attended_at, id) 내림차순
+ATTENDANCE_KEYS = (WaitingList.business_date, not_null_key(WaitingList.attended_at), WaitingList.id)
+
+
+def _attendance_row_key(r) -> tuple:
+    return (r.business_date, r.attended_at or NULL_DATETIME, r.id)
+
+
+@router.get("/{franchise_id}/attendance/list")
+async def get_attendance_list(
+    franchise_id: int,
+    start_date: date,
+    end_date: date,
+    response: Response,
+    store_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: str = Query("json", enum=["json", "ndjson"]),
+    current_user: User = Depends(require_franchise_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    출석 목록 상세 조회 (전체 매장 또는 특정 매장)
+    - 기간 내 출석 완료된 목록
+    - limit/cursor 지정 시 키셋 페이지네이션 (다음 커서는 X-Next-Cursor 헤더)
+    - format=ndjson 이면 전체 기간을 스트리밍
+    """
+    allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
+
+    if format == "ndjson":
+        return stream_ndjson(
+            lambda s: apply_keyset(
+                franchise_attendance_query(s, franchise_id, start_date, end_date, store_id, allowed_store_ids),
+                ATTENDANCE_KEYS, cursor
+            ),
+            _serialize_franchise_attendance,
+            session_factory=session_factory_for(db)
+        )
+
+    query = franchise_attendance_query(db, franchise_id, start_date, end_date, store_id, allowed_store_ids)
+
+    if limit or cursor:
+        results, next_cursor = keyset_page(query, ATTENDANCE_KEYS, _attendance_row_key, limit or MAX_PAGE_SIZE, cursor)
+        set_next_cursor(response, next_cursor)
+    else:
+        results = apply_keyset(query, ATTENDANCE_KEYS).all()
+
+    return [_serialize_franchise_attendance(r) for r in results]
 
 @router.get("/{franchise_id}/attendance/ranking")
 async def get_attendance_ranking(
@@ -126,7 +212,7 @@ async def get_attendance_ranking(
     store_id: Optional[int] = None,
     limit: int = 10,
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     회원 출석 순위 조회
@@ -134,6 +220,34 @@ async def get_attendance_ranking(
     """
     allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
 
+    store_scope = _analytics_store_scope(store_id, allowed_store_ids)
+    cache_key = _analytics_cache_key(db, "attendance_ranking", franchise_id, store_scope, start_date, end_date, limit=limit)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    historical_store_ids = _historical_store_ids(db, franchise_id, store_scope, end_date)
+    if historical_store_ids:
+        store_names = dict(db.query(Store.id, Store.name).filter(Store.id.in_(historical_store_ids)).all())
+        rows = analytics_store.attendance_ranking(
+            historical_store_ids,
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date, datetime.max.time()),
+            limit
+        )
+        result = [
+            {
+                "member_id": member_id,
+                "name": name,
+                "phone": phone,
+                "store_name": store_names.get(sid),
+                "attendance_count": count,
+                "last_attended_at": last_attended_at
+            }
+            for member_id, name, phone, sid, count, last_attended_at in rows
+        ]
+        return _cache_analytics_result(db, cache_key, result, franchise_id, store_scope, end_date)
+
     # 기본 쿼리: WaitingList와 Member, Store 조인
     query = db.query(
         Member.id,
@@ -171,7 +285,7 @@ async def get_attendance_ranking(
         desc("attendance_count")
     ).limit(limit).all()
 
-    return [
+    result = [
         {
             "member_id": r.id,
             "name": r.name,
@@ -182,6 +296,7 @@ async def get_attendance_ranking(
         }
         for r in results
     ]
+    return _cache_analytics_result(db, cache_key, result, franchise_id, store_scope, end_date)
 
 @router.get("/{franchise_id}/attendance/trends")
 async def get_attendance_trends(
@@ -191,7 +306,7 @@ async def get_attendance_trends(
     period: str = Query("day", enum=["day", "month", "week"]),
     store_id: Optional[int] = None,
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     출석 추세 조회 (일별/주별/월별)
@@ -200,6 +315,12 @@ async def get_attendance_trends(
     if current_user.role == "franchise_admin" and current_user.franchise_id != franchise_id:
         raise HTTPException(status_code=403, detail="권한이 없습니다.")
 
+    store_scope = _analytics_store_scope(store_id, None)
+    cache_key = _analytics_cache_key(db, "attendance_trends", franchise_id, store_scope, start_date, end_date, period=period)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # 날짜 포맷 설정 (SQLite 기준)
     if period == "month":
         date_format = "%Y-%m"
@@ -216,6 +337,19 @@ async def get_attendance_trends(
     
     # Using generic dispatch or simple check
     is_sqlite = 'sqlite' in str(db.get_bind().url)
+
+    historical_store_ids = _historical_store_ids(db, franchise_id, store_scope, end_date)
+    if historical_store_ids:
+        # DuckDB strftime: Postgres 경로와 동일하게 ISO 주차 사용
+        duck_format = date_format if is_sqlite or period != "week" else "%G-%V"
+        rows = analytics_store.attendance_trends(
+            historical_store_ids,
+            datetime.combine(start_date, datetime.min.time()),
+            datetime.combine(end_date, datetime.max.time()),
+            duck_format
+        )
+        result = [{"period": p, "count": c} for p, c in rows]
+        return _cache_analytics_result(db, cache_key, result, franchise_id, store_scope, end_date)
     
     if is_sqlite:
         period_col = func.strftime(date_format, WaitingList.attended_at).label("period")
@@ -249,13 +383,14 @@ async def get_attendance_trends(
     # 그룹화 및 정렬
     results = query.group_by("period").order_by("period").all()
 
-    return [
+    result = [
         {
             "period": r.period,
             "count": r.count
         }
         for r in results
     ]
+    return _cache_analytics_result(db, cache_key, result, franchise_id, store_scope, end_date)
 
 @router.get("/{franchise_id}/members/{member_id}/history")
 async def get_member_history(
@@ -264,7 +399,7 @@ async def get_member_history(
     start_date: date,
     end_date: date,
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     특정 회원의 출석 이력 조회
@@ -310,17 +445,42 @@ async def get_store_comparison(
     end_date: date,
     store_id: Optional[int] = None,
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     매장별 출석 비교 조회
     """
     allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
 
+    store_scope = _analytics_store_scope(store_id, allowed_store_ids)
+    cache_key = _analytics_cache_key(db, "store_comparison", franchise_id, store_scope, start_date, end_date)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # 프랜차이즈 정보 조회 (이름 제거용)
     franchise = db.query(Franchise).filter(Franchise.id == franchise_id).first()
     franchise_name = franchise.name if franchise else ""
 
+    historical_store_ids = _historical_store_ids(db, franchise_id, store_scope, end_date, active_only=True)
+    if historical_store_ids:
+        counts = analytics_store.store_counts(historical_store_ids, start_date, end_date)
+        stores = db.query(Store.id, Store.name).filter(
+            Store.id.in_(historical_store_ids),
+            Store.franchise_id == franchise_id,
+            Store.is_active == True
+        ).order_by(Store.name).all()
+        result = [
+            {
+                "store_id": sid,
+                "store_name": name,
+                "waiting_count": counts.get(sid, {}).get("waiting", 0),
+                "attendance_count": counts.get(sid, {}).get("attendance", 0)
+            }
+            for sid, name in stores
+        ]
+        return _cache_analytics_result(db, cache_key, result, franchise_id, store_scope, end_date)
+
     # LEFT JOIN을 사용하여 출석 기록이 없는 매장도 포함
     # business_date 기준으로 기간 필터링
     query = db.query(
@@ -356,7 +516,7 @@ async def get_store_comparison(
         Store.name
     ).all()
 
-    return [
+    result = [
         {
             "store_id": r.id,
             "store_name": r.name,
@@ -365,30 +525,10 @@ async def get_store_comparison(
         }
         for r in results
     ]
+    return _cache_analytics_result(db, cache_key, result, franchise_id, store_scope, end_date)
 
-@router.get("/{franchise_id}/waiting/list")
-async def get_waiting_list_details(
-    franchise_id: int,
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    store_id: Optional[int] = None,
-    current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
-):
-    """
-    대기 목록 상세 조회 (전체 매장 또는 특정 매장)
-    - start_date, end_date가 없으면 오늘 날짜 기준
-    - 있으면 해당 기간의 대기 목록 조회
-    """
-    allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
-    
-    # 날짜 기본값 설정
-    today = date.today()
-    if not start_date:
-        start_date = today
-    if not end_date:
-        end_date = today
-    
+def franchise_waiting_query(db: Session, franchise_id: int, start_date: date, end_date: date, store_id: Optional[int], allowed_store_ids: Optional[List[int]]):
+    """프랜차이즈 대기 목록 기본 쿼리 (WaitingList + Store + Member 조인)"""
     query = db.query(
         WaitingList.id,
         WaitingList.waiting_number,
@@ -410,33 +550,87 @@ async def get_waiting_list_details(
         WaitingList.business_date >= start_date,
         WaitingList.business_date <= end_date
     )
-    
+
     if store_id:
         query = query.filter(WaitingList.store_id == store_id)
-        
+
     if allowed_store_ids is not None:
         query = query.filter(Store.id.in_(allowed_store_ids))
 
-    results = query.order_by(
-        WaitingList.created_at
-    ).all()
+    return query
+
+
+def _serialize_franchise_waiting(r) -> dict:
+    return {
+        "id": r.id,
+        "waiting_number": r.waiting_number,
+        "phone": r.phone,
+        "party_size": 1,  # DB에 컬럼이 없어서 기본값 1로 고정
+        "created_at": r.created_at,
+        "business_date": r.business_date,
+        "status": r.status,
+        "store_name": r.store_name,
+        "member_name": r.member_name or "비회원",
+        "member_id": r.member_id,
+        "member_created_at": r.member_created_at
+    }
+
+
+# 대기 목록 커서 정렬 키: (business_date, created_at, id) 오름차순 (미출석 건은 attended_at이 없음)
+WAITING_KEYS = (WaitingList.business_date, not_null_key(WaitingList.created_at), WaitingList.id)
+
+
+def _waiting_row_key(r) -> tuple:
+    return (r.business_date, r.created_at or NULL_DATETIME, r.id)
+
+
+@router.get("/{franchise_id}/waiting/list")
+async def get_waiting_list_details(
+    franchise_id: int,
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    store_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: str = Query("json", enum=["json", "ndjson"]),
+    current_user: User = Depends(require_franchise_admin),
+    db: Session = Depends(get_read_db)
+):
+    """
+    대기 목록 상세 조회 (전체 매장 또는 특정 매장)
+    - start_date, end_date가 없으면 오늘 날짜 기준
+    - 있으면 해당 기간의 대기 목록 조회
+    - limit/cursor 지정 시 키셋 페이지네이션, format=ndjson 이면 스트리밍
+    """
+    allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
     
-    return [
-        {
-            "id": r.id,
-            "waiting_number": r.waiting_number,
-            "phone": r.phone,
-            "party_size": 1,  # DB에 컬럼이 없어서 기본값 1로 고정
-            "created_at": r.created_at,
-            "business_date": r.business_date,
-            "status": r.status,
-            "store_name": r.store_name,
-            "member_name": r.member_name or "비회원",
-            "member_id": r.member_id,
-            "member_created_at": r.member_created_at
-        }
-        for r in results
-    ]
+    # 날짜 기본값 설정
+    today = date.today()
+    if not start_date:
+        start_date = today
+    if not end_date:
+        end_date = today
+
+    if format == "ndjson":
+        return stream_ndjson(
+            lambda s: apply_keyset(
+                franchise_waiting_query(s, franchise_id, start_date, end_date, store_id, allowed_store_ids),
+                WAITING_KEYS, cursor, descending=False
+            ),
+            _serialize_franchise_waiting,
+            session_factory=session_factory_for(db)
+        )
+
+    query = franchise_waiting_query(db, franchise_id, start_date, end_date, store_id, allowed_store_ids)
+
+    if limit or cursor:
+        results, next_cursor = keyset_page(query, WAITING_KEYS, _waiting_row_key, limit or MAX_PAGE_SIZE, cursor, descending=False)
+        set_next_cursor(response, next_cursor)
+    else:
+        results = apply_keyset(query, WAITING_KEYS, descending=False).all()
+
+    return [_serialize_franchise_waiting(r) for r in results]
 
 @router.get("/{franchise_id}/members/new")
 async def get_new_members(
@@ -445,13 +639,19 @@ async def get_new_members(
     end_date: date,
     store_id: Optional[int] = None,
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     신규 회원 목록 조회
     """
     allowed_store_ids = check_franchise_permission(current_user, franchise_id, store_id)
 
+    store_scope = _analytics_store_scope(store_id, allowed_store_ids)
+    cache_key = _analytics_cache_key(db, "new_members", franchise_id, store_scope, start_date, end_date)
+    cached = analytics_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
     # 프랜차이즈 내 모든 매장 ID 조회
     store_ids_query = db.query(Store.id).filter(
         Store.franchise_id == franchise_id,
@@ -488,7 +688,7 @@ async def get_new_members(
     
     results = query.all()
     
-    return [
+    result = [
         {
             "id": r.id,
             "name": r.name,
@@ -498,13 +698,14 @@ async def get_new_members(
         }
         for r in results
     ]
+    return _cache_analytics_result(db, cache_key, result, franchise_id, store_scope, end_date)
 
 @router.get("/{franchise_id}/members/search")
 async def search_members(
     franchise_id: int,
     query: str,
     current_user: User = Depends(require_franchise_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     회원 검색 (프랜차이즈 전체)
@@ -592,7 +793,7 @@ async def get_store_analytics_dashboard(
     end_date: Optional[date] = None,
     period: str = Query("hourly", enum=["hourly", "daily", "weekly", "monthly"]),
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     매장용 분석 대시보드 데이터 조회
@@ -869,7 +1070,7 @@ async def get_store_analytics_dashboard(
 async def get_member_visit_history(
     member_id: int,
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     회원 상세 방문 히스토리 조회 (매장용)
@@ -923,7 +1124,7 @@ async def get_store_new_members(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """지정 기간 내 가입한 신규 회원 리스트 조회"""
     query = db.query(Member).filter(Member.store_id == current_store.id)
@@ -952,7 +1153,7 @@ async def get_attendance_ranking(
     end_date: Optional[date] = None,
     limit: int = Query(50, ge=1),
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """지정 기간 내 출석 횟수 순위 조회"""
     query = db.query(
@@ -989,7 +1190,7 @@ async def get_attendance_ranking(
 async def get_inactive_members(
     days: int = Query(30, ge=1),
     current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """장기 미방문자 조회 (마케팅 활용)"""
     threshold_date = date.today() - timedelta(days=days)
@@ -1033,38 +1234,79 @@ async def get_inactive_members(
     return sorted(result, key=lambda x: x['days_since'] if x['days_since'] else 0, reverse=True)
 
 
-@router.get("/attendance-list")
-async def get_attendance_list(
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    current_store: Store = Depends(get_current_store),
-    db: Session = Depends(get_db)
-):
-    """지정 기간 내 전체 출석 목록 조회"""
-    query = db.query(WaitingList).filter(
-        WaitingList.store_id == current_store.id,
+def store_attendance_query(db: Session, store_id: int, start_date: Optional[date], end_date: Optional[date]):
+    """매장 출석 목록 기본 쿼리 (회원/클래스 정보는 조인으로 함께 조회)"""
+    query = db.query(
+        WaitingList.id,
+        WaitingList.business_date,
+        WaitingList.attended_at,
+        WaitingList.name,
+        WaitingList.phone,
+        WaitingList.class_order,
+        Member.id.label("member_pk"),
+        Member.name.label("member_name"),
+        Member.phone.label("member_phone"),
+        models.ClassInfo.class_name
+    ).outerjoin(
+        Member, WaitingList.member_id == Member.id
+    ).outerjoin(
+        models.ClassInfo, WaitingList.class_id == models.ClassInfo.id
+    ).filter(
+        WaitingList.store_id == store_id,
         WaitingList.status == 'attended'
     )
-    
+
     if start_date:
         query = query.filter(WaitingList.business_date >= start_date)
     if end_date:
         query = query.filter(WaitingList.business_date <= end_date)
-        
-    attendances = query.order_by(desc(WaitingList.business_date), desc(WaitingList.attended_at)).all()
-    
-    result = []
-    for a in attendances:
-        member = db.query(Member).filter(Member.id == a.member_id).first()
-        class_info = db.query(models.ClassInfo).filter(models.ClassInfo.id == a.class_id).first()
-        
-        result.append({
-            "id": a.id,
-            "business_date": a.business_date.strftime("%Y.%m.%d"),
-            "member_name": member.name if member else a.name,
-            "phone": member.phone if member else a.phone,
-            "class_name": class_info.class_name if class_info else f"{a.class_order}교시",
-            "attended_at": a.attended_at.strftime("%H:%M") if a.attended_at else None
-        })
-        
-    return result
+
+    return query
+
+
+def _serialize_store_attendance(r) -> dict:
+    has_member = r.member_pk is not None
+    return {
+        "id": r.id,
+        "business_date": r.business_date.strftime("%Y.%m.%d"),
+        "member_name": r.member_name if has_member else r.name,
+        "phone": r.member_phone if has_member else r.phone,
+        "class_name": r.class_name if r.class_name is not None else f"{r.class_order}교시",
+        "attended_at": r.attended_at.strftime("%H:%M") if r.attended_at else None
+    }
+
+
+@router.get("/attendance-list")
+async def get_attendance_list(
+    response: Response,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    format: str = Query("json", enum=["json", "ndjson"]),
+    current_store: Store = Depends(get_current_store),
+    db: Session = Depends(get_read_db)
+):
+    """
+    지정 기간 내 전체 출석 목록 조회
+    - limit/cursor 지정 시 키셋 페이지네이션 (다음 커서는 X-Next-Cursor 헤더)
+    - format=ndjson 이면 전체 기간을 스트리밍
+    """
+    store_id = current_store.id
+
+    if format == "ndjson":
+        return stream_ndjson(
+            lambda s: apply_keyset(store_attendance_query(s, store_id, start_date, end_date), ATTENDANCE_KEYS, cursor),
+            _serialize_store_attendance,
+            session_factory=session_factory_for(db)
+        )
+
+    query = store_attendance_query(db, store_id, start_date, end_date)
+
+    if limit or cursor:
+        attendances, next_cursor = keyset_page(query, ATTENDANCE_KEYS, _attendance_row_key, limit or MAX_PAGE_SIZE, cursor)
+        set_next_cursor(response, next_cursor)
+    else:
+        attendances = apply_keyset(query, ATTENDANCE_KEYS).all()
+
+    return [_serialize_store_attendance(a) for a in attendances]
@@ -13,6 +13,10 @@ from schemas import (
     StoreSettingsUpdate
 )
 from auth import get_current_user, get_current_store
+from services.business_date import business_date_resolver
+from services.sse_outbox import sse_outbox
+from services.timetable import timetable_resolver
+from services.data_version import data_versions
 
 router = APIRouter()
 
@@ -32,8 +36,10 @@ async def create_store_settings(
 
     db_settings = StoreSettings(**settings.dict(), store_id=current_store.id)
     db.add(db_settings)
+    data_versions.mark(db, current_store.id)
     db.commit()
     db.refresh(db_settings)
+    business_date_resolver.invalidate(current_store.id)
 
     return db_settings
 
@@ -104,6 +110,7 @@ def get_safe_store_settings(db: Session, store_id: int):
                 defer(StoreSettings.registration_message),
                 defer(StoreSettings.max_dashboard_connections),
                 defer(StoreSettings.dashboard_connection_policy),
+                defer(StoreSettings.sse_coalesce_window_ms),
                 defer(StoreSettings.sequential_closing),
                 defer(StoreSettings.business_start_time),
                 defer(StoreSettings.business_end_time),
@@ -199,6 +206,7 @@ def get_safe_store_settings(db: Session, store_id: int):
                 set_default(settings, 'registration_message', "처음 방문하셨네요!\n성함을 입력해 주세요.")
                 set_default(settings, 'max_dashboard_connections', 2)
                 set_default(settings, 'dashboard_connection_policy', "eject_old")
+                set_default(settings, 'sse_coalesce_window_ms', 200)
                 set_default(settings, 'sequential_closing', False)
                 set_default(settings, 'business_start_time', time(9, 0))
                 set_default(settings, 'business_end_time', time(22, 0))
@@ -248,6 +256,11 @@ async def get_store_settings(
     db: Session = Depends(get_db)
 ):
     """매장 설정 조회"""
+    return get_or_create_store_settings(db, current_store)
+
+
+def get_or_create_store_settings(db: Session, current_store: Store):
+    """매장 설정 조회 (없으면 기본 설정 생성), 프론트엔드용 store_code 포함"""
     settings = get_safe_store_settings(db, current_store.id)
     
     if not settings:
@@ -310,6 +323,7 @@ async def update_store_settings(
         setattr(db_settings, field, value)
 
     try:
+        data_versions.mark(db, current_store.id)
         db.commit()
         db.refresh(db_settings)
         
@@ -350,6 +364,7 @@ async def update_store_settings(
             for field, value in update_data.items():
                 setattr(db_settings, field, value)
                 
+            data_versions.mark(db, current_store.id)
             db.commit()
             db.refresh(db_settings)
             
@@ -367,6 +382,7 @@ async def update_store_settings(
                 if hasattr(db_settings, field):
                     setattr(db_settings, field, value)
                 
+            data_versions.mark(db, current_store.id)
             db.commit()
             db.refresh(db_settings)
             
@@ -384,6 +400,10 @@ async def update_store_settings(
                 ip_address=request.client.host
             )
 
+    # 영업일 기준 시간, 이벤트 병합 시간 등 변경 반영
+    business_date_resolver.invalidate(current_store.id)
+    sse_outbox.invalidate_window(current_store.id)
+
     return db_settings
 
 @router.post("/verify-password")
@@ -574,7 +594,10 @@ async def clone_store_settings(
         )
         db.add(new_class)
 
+    data_versions.mark(db, current_store.id)
     db.commit()
+    timetable_resolver.invalidate_classes(current_store.id)
+    business_date_resolver.invalidate(current_store.id)
     
     if target_settings:
         db.refresh(target_settings)
@@ -672,8 +695,10 @@ async def clone_settings_to_target(
         target_settings = StoreSettings(**settings_dict)
         db.add(target_settings)
     
+    data_versions.mark(db, target_store_id)
     db.commit()
     db.refresh(target_settings)
+    business_date_resolver.invalidate(target_store_id)
     
     return {"message": "매장 설정이 성공적으로 복제되었습니다."}
 
@@ -722,6 +747,8 @@ async def clone_classes_to_target(
         )
         db.add(new_class)
     
+    data_versions.mark(db, target_store_id)
     db.commit()
+    timetable_resolver.invalidate_classes(target_store_id)
     
     return {"message": f"{len(source_classes)}개의 클래스가 성공적으로 복제되었습니다."}
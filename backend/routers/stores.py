@@ -22,6 +22,7 @@ from schemas import (
     StoreUpdate
 )
 from auth import get_current_user, require_franchise_admin
+from services.store_codes import store_codes
 
 router = APIRouter()
 
@@ -248,6 +249,7 @@ async def update_store(
     store.updated_at = datetime.now()
 
     db.commit()
+    store_codes.invalidate()
     db.refresh(store)
 
     return store
@@ -281,6 +283,7 @@ async def delete_store(
     store.updated_at = datetime.now()
 
     db.commit()
+    store_codes.invalidate()
 
 
 @router.post("/{store_id}/deactivate", status_code=status.HTTP_204_NO_CONTENT)
@@ -311,6 +314,7 @@ async def deactivate_store(
     store.updated_at = datetime.now()
 
     db.commit()
+    store_codes.invalidate()
 
 
 @router.post("/{store_id}/activate", response_model=StoreSchema)
@@ -344,6 +348,7 @@ async def activate_store(
     store.updated_at = datetime.now()
 
     db.commit()
+    store_codes.invalidate()
     db.refresh(store)
 
     return store
@@ -447,7 +452,9 @@ async def get_store_stats(
     weekly_stats = db.query(
         func.coalesce(func.sum(DailyClosing.total_waiting), 0).label('total_waiting'),
         func.coalesce(func.sum(DailyClosing.total_attended), 0).label('total_attended'),
-        func.coalesce(func.sum(DailyClosing.total_cancelled), 0).label('total_cancelled')
+        func.coalesce(func.sum(DailyClosing.total_cancelled), 0).label('total_cancelled'),
+        func.coalesce(func.sum(DailyClosing.total_called), 0).label('total_called'),
+        func.coalesce(func.sum(DailyClosing.total_no_show), 0).label('total_no_show')
     ).filter(
         DailyClosing.store_id == store_id,
         DailyClosing.business_date >= week_ago,
@@ -463,6 +470,8 @@ async def get_store_stats(
             'total_waiting': today_stats.total_waiting if today_stats else 0,
             'total_attended': today_stats.total_attended if today_stats else 0,
             'total_cancelled': today_stats.total_cancelled if today_stats else 0,
+            'total_called': (today_stats.total_called or 0) if today_stats else 0,
+            'total_no_show': (today_stats.total_no_show or 0) if today_stats else 0,
             'is_open': today_stats.is_closed == False if today_stats else False,
             'opening_time': today_stats.opening_time if today_stats else None,
             'closing_time': today_stats.closing_time if today_stats else None
@@ -473,7 +482,9 @@ async def get_store_stats(
         'weekly': {
             'total_waiting': weekly_stats.total_waiting if weekly_stats else 0,
             'total_attended': weekly_stats.total_attended if weekly_stats else 0,
-            'total_cancelled': weekly_stats.total_cancelled if weekly_stats else 0
+            'total_cancelled': weekly_stats.total_cancelled if weekly_stats else 0,
+            'total_called': weekly_stats.total_called if weekly_stats else 0,
+            'total_no_show': weekly_stats.total_no_show if weekly_stats else 0
         }
     }
 
@@ -5,6 +5,9 @@ from auth import get_current_user, require_system_admin, get_current_store
 from database import get_db
 from models import Store, User
 from sse_manager import sse_manager
+from services.rate_limiter import rate_limiter
+from core.load_shedding import load_monitor
+from core.idempotency import idempotency_store
 
 router = APIRouter()
 
@@ -71,3 +74,35 @@ async def force_disconnect_client(
     await sse_manager.force_disconnect(str(user_store.id), connection_id)
     
     return {"message": "Client disconnected", "connection_id": connection_id}
+
+
+@router.get("/rate-limits")
+async def get_rate_limit_stats(
+    current_user: User = Depends(require_system_admin)
+):
+    """
+    공개/키오스크 엔드포인트 요청 제한 현황 (Superadmin 전용)
+    - 엔드포인트 종류별 허용/차단 건수 및 설정값
+    """
+    return rate_limiter.stats()
+
+
+@router.get("/load")
+async def get_load_status(
+    current_user: User = Depends(require_system_admin)
+):
+    """
+    부하 차단 현황 (Superadmin 전용)
+    - 현재 부하 단계, 이벤트 루프 지연, DB 풀 사용률, 우선순위별 처리/차단 건수
+    """
+    return load_monitor.stats()
+
+
+@router.get("/idempotency")
+async def get_idempotency_status(
+    current_user: User = Depends(require_system_admin)
+):
+    """
+    Idempotency-Key 응답 보관 현황 (Superadmin 전용)
+    """
+    return idempotency_store.stats()
@@ -11,7 +11,7 @@ from sqlalchemy import func, desc
 from datetime import datetime, date
 from typing import List, Optional
 
-from database import get_db, engine
+from database import get_db, engine, get_read_db
 from sqlalchemy import inspect
 from models import Franchise, Store, User, Member, DailyClosing, StoreSettings, WaitingList, WaitingHistory, Notice
 from schemas import (
@@ -37,6 +37,11 @@ from schemas import (
     StoreSettingsUpdate
 )
 from auth import require_system_admin, get_password_hash
+from services.analytics_cache import analytics_cache
+from services.analytics_store import analytics_store
+from services.business_date import business_date_resolver
+from services.daily_counters import sync_daily_counters
+from services.data_version import data_versions
 
 router = APIRouter()
 
@@ -171,7 +176,7 @@ async def get_franchise_users(
 async def get_franchise_stats(
     franchise_id: int,
     current_user: User = Depends(require_system_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """특정 프랜차이즈의 통계 조회"""
     franchise = db.query(Franchise).filter(Franchise.id == franchise_id).first()
@@ -397,7 +402,7 @@ async def create_franchise_admin(
 @router.get("/stats")
 async def get_system_stats(
     current_user: User = Depends(require_system_admin),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """전체 시스템 통계"""
     # 프랜차이즈 수
@@ -502,6 +507,7 @@ async def reset_store_members(
     # 2. 회원 삭제
     deleted_count = db.query(Member).filter(Member.store_id == store_id).delete(synchronize_session=False)
     
+    analytics_cache.invalidate_store(db, store_id, "admin reset members")
     db.commit()
 
     return {"message": f"매장 [{store.name}]의 회원 정보 {deleted_count}건이 초기화되었습니다."}
@@ -526,7 +532,16 @@ async def reset_store_waiting(
     deleted_count = db.query(WaitingList).filter(
         WaitingList.store_id == store_id
     ).delete(synchronize_session=False)
+
+    # 영업 중인 날의 실시간 카운터 초기화
+    for business in db.query(DailyClosing).filter(
+        DailyClosing.store_id == store_id,
+        DailyClosing.is_closed == False
+    ).all():
+        sync_daily_counters(db, business)
     
+    data_versions.mark(db, store_id)
+    analytics_cache.invalidate_store(db, store_id, "admin reset")
     db.commit()
 
     return {"message": f"매장 [{store.name}]의 대기 정보 {deleted_count}건이 초기화되었습니다."}
@@ -558,7 +573,10 @@ async def reset_store_history(
         DailyClosing.store_id == store_id
     ).delete(synchronize_session=False)
     
+    data_versions.mark(db, store_id)
+    analytics_cache.invalidate_store(db, store_id, "admin reset")
     db.commit()
+    business_date_resolver.invalidate(store_id)
 
     return {"message": f"매장 [{store.name}]의 대기 이력 {history_deleted}건, 마감 이력 {closing_deleted}건이 초기화되었습니다."}
 
@@ -1199,7 +1217,7 @@ async def get_analytics_dashboard(
     store_id: int = None,
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     통합 분석 대시보드 데이터 조회
@@ -1240,46 +1258,77 @@ async def get_analytics_dashboard(
         
         open_store_ids = {op.store_id for op in open_ops}
         
-        # 3. Waiting & Attendance Data (Period)
-        waitings = db.query(WaitingList).filter(
-            WaitingList.store_id.in_(target_store_ids),
-            WaitingList.business_date >= start_date,
-            WaitingList.business_date <= end_date
-        ).all()
-        
-        # Calculate Stats
-        total_waiting_cnt = len(waitings)
-        attended_waitings = [w for w in waitings if w.status == 'attended']
-        total_attendance_cnt = len(attended_waitings)
-        
-        # Time Stats
-        wait_times = []
-        for w in attended_waitings:
-            if w.attended_at and w.created_at:
-                mins = (w.attended_at - w.created_at).total_seconds() / 60
-                wait_times.append(mins)
-                
+        from collections import defaultdict
+        store_waiting_cnt = defaultdict(int)
+        store_attendance_cnt = defaultdict(int)
+        store_current_cnt = defaultdict(int)
         w_stats = TimeStats()
-        if wait_times:
-            w_stats.max = int(max(wait_times))
-            w_stats.min = int(min(wait_times))
-            w_stats.avg = round(sum(wait_times) / len(wait_times), 1)
-            
-        a_stats = TimeStats() 
+        a_stats = TimeStats()
+
+        # 과거 기간이고 Parquet 내보내기가 완료된 경우 DuckDB에서 집계
+        use_parquet = end_date < today and analytics_store.covers(db, target_store_ids, end_date)
+
+        if use_parquet:
+            counts = analytics_store.store_counts(target_store_ids, start_date, end_date)
+            for sid, c in counts.items():
+                store_waiting_cnt[sid] = c["waiting"]
+                store_attendance_cnt[sid] = c["attendance"]
+                store_current_cnt[sid] = c["current"]
+            total_waiting_cnt = sum(store_waiting_cnt.values())
+            total_attendance_cnt = sum(store_attendance_cnt.values())
+
+            wait_stats = analytics_store.wait_time_stats(target_store_ids, start_date, end_date)
+            if wait_stats:
+                w_stats.min = int(wait_stats[0])
+                w_stats.max = int(wait_stats[1])
+                w_stats.avg = round(wait_stats[2], 1)
+
+            hourly_map = analytics_store.hourly_counts(target_store_ids, start_date, end_date)
+        else:
+            # 3. Waiting & Attendance Data (Period)
+            waitings = db.query(WaitingList).filter(
+                WaitingList.store_id.in_(target_store_ids),
+                WaitingList.business_date >= start_date,
+                WaitingList.business_date <= end_date
+            ).all()
+
+            # Calculate Stats
+            total_waiting_cnt = len(waitings)
+            attended_waitings = [w for w in waitings if w.status == 'attended']
+            total_attendance_cnt = len(attended_waitings)
+
+            # Time Stats
+            wait_times = []
+            for w in attended_waitings:
+                if w.attended_at and w.created_at:
+                    mins = (w.attended_at - w.created_at).total_seconds() / 60
+                    wait_times.append(mins)
+
+            if wait_times:
+                w_stats.max = int(max(wait_times))
+                w_stats.min = int(min(wait_times))
+                w_stats.avg = round(sum(wait_times) / len(wait_times), 1)
+
+            # 4. Hourly Stats
+            hourly_map = {h: {'waiting': 0, 'attendance': 0} for h in range(24)}
+
+            for w in waitings:
+                # Defensively check created_at
+                if w.created_at:
+                    h = w.created_at.hour
+                    hourly_map[h]['waiting'] += 1
+
+                if w.attended_at:
+                    ah = w.attended_at.hour
+                    hourly_map[ah]['attendance'] += 1
+
+            for w in waitings:
+                store_waiting_cnt[w.store_id] += 1
+                if w.status == 'waiting':
+                     store_current_cnt[w.store_id] += 1
+                if w.status == 'attended':
+                     store_attendance_cnt[w.store_id] += 1
 
-        # 4. Hourly Stats
-        hourly_map = {h: {'waiting': 0, 'attendance': 0} for h in range(24)}
-        
-        for w in waitings:
-            # Defensively check created_at
-            if w.created_at:
-                h = w.created_at.hour
-                hourly_map[h]['waiting'] += 1
-            
-            if w.attended_at:
-                ah = w.attended_at.hour
-                hourly_map[ah]['attendance'] += 1
-                
         hourly_stats_list = [
             HourlyStat(
                 hour=h, 
@@ -1293,18 +1342,6 @@ async def get_analytics_dashboard(
         # 5. Store Stats (Detailed)
         store_stats_list = []
         map_ops = {op.store_id: op for op in open_ops}
-        
-        from collections import defaultdict
-        store_waiting_cnt = defaultdict(int)
-        store_attendance_cnt = defaultdict(int)
-        store_current_cnt = defaultdict(int)
-        
-        for w in waitings:
-            store_waiting_cnt[w.store_id] += 1
-            if w.status == 'waiting':
-                 store_current_cnt[w.store_id] += 1
-            if w.status == 'attended':
-                 store_attendance_cnt[w.store_id] += 1
 
         for s in stores:
             op = map_ops.get(s.id)
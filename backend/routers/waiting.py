@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from core.logger import logger
 from sqlalchemy.orm import Session, joinedload, defer
 from sqlalchemy import func, and_
+from sqlalchemy.exc import IntegrityError
 from datetime import datetime, date, time
 from typing import List, Optional, Dict
 import json
@@ -15,120 +16,20 @@ from schemas import (
     WaitingList as WaitingListSchema,
     WaitingListDetail
 )
-from sse_manager import sse_manager
-from utils import get_today_date, get_kst_now
+from services.sse_outbox import sse_outbox
+from utils import get_kst_now
 from routers.store_settings import get_safe_store_settings
+from services.business_date import get_current_business_date
+from services.daily_counters import record_registration, claim_status_change
+from services.timetable import timetable_resolver, parse_weekday_schedule
+from services.single_flight import single_flight
+from services.data_version import data_versions, etag_headers, is_not_modified, not_modified_response
+from services.fast_json import FastJSONResponse
+from services.projection import ALL_FIELDS, FieldSet, parse_fields
+from services.registration_check import RegistrationSnapshot, load_registration_snapshot, is_duplicate_waiting_error
 
 router = APIRouter()
 
-from sqlalchemy.exc import OperationalError
-
-def get_current_business_date(db: Session, store_id: int) -> date:
-    """
-    현재 영업일 조회 (Sync with daily_closing.py)
-    1. 활성화된 영업일 우선
-    2. 없으면 시간 기반 계산
-    """
-    # 1. 활성화된 영업일 확인
-    active_closing = db.query(DailyClosing).filter(
-        DailyClosing.store_id == store_id,
-        DailyClosing.is_closed == False
-    ).order_by(DailyClosing.business_date.desc()).first()
-
-    if active_closing:
-        return active_closing.business_date
-
-    # 2. 설정 기반 계산
-    start_hour = 7
-    try:
-        # Select specific column to avoid error if new columns are missing in DB
-        start_hour_scalar = db.query(StoreSettings.business_day_start).filter(
-            StoreSettings.store_id == store_id
-        ).scalar()
-        
-        if start_hour_scalar is not None:
-             start_hour = start_hour_scalar
-             
-    except OperationalError:
-        # 컬럼이 없는 경우 기본값 사용 (마이그레이션 과도기 대응)
-        pass
-    except Exception as e:
-        # 기타 에러는 로그만 남기고 기본값 사용
-        logger.error(f"Error fetching business_day_start: {e}")
-        pass
-        
-    return get_today_date(start_hour)
-
-# 요일 매핑
-WEEKDAY_MAP = {
-    0: "mon", 1: "tue", 2: "wed", 3: "thu",
-    4: "fri", 5: "sat", 6: "sun"
-}
-
-DEFAULT_WEEKDAY_SCHEDULE = {
-    "mon": True, "tue": True, "wed": True, "thu": True,
-    "fri": True, "sat": True, "sun": True
-}
-
-def parse_weekday_schedule(schedule_str: str) -> Dict[str, bool]:
-    """JSON 문자열을 weekday_schedule 딕셔너리로 안전하게 변환"""
-    if not schedule_str:
-        return DEFAULT_WEEKDAY_SCHEDULE.copy()
-
-    try:
-        schedule = json.loads(schedule_str)
-        if not isinstance(schedule, dict):
-            return DEFAULT_WEEKDAY_SCHEDULE.copy()
-        return schedule
-    except (json.JSONDecodeError, TypeError, ValueError):
-        return DEFAULT_WEEKDAY_SCHEDULE.copy()
-
-def filter_classes_by_weekday(classes: List[ClassInfo], target_date: date, db: Session, store_id: int) -> List[ClassInfo]:
-    """
-    특정 날짜의 요일에 맞는 클래스만 필터링
-    **공휴일 로직 추가:**
-    1. 해당 날짜가 공휴일(Holiday)인지 확인
-    2. 공휴일이면 -> class_type == 'holiday' 인 클래스만 반환
-    3. 공휴일이 아니면 -> class_type != 'holiday' 중 요일 스케줄이 맞는 것 반환
-    """
-    # 1. 공휴일 여부 확인
-    is_holiday = db.query(Holiday).filter(
-        Holiday.store_id == store_id,
-        Holiday.date == target_date
-    ).first()
-
-    filtered_classes = []
-    
-    if is_holiday:
-        # 공휴일이면 'holiday' 타입만 사용 (TODO: 'all' 타입도 포함할지? 기획상 '공휴일 클래스' 탭이 따로 있으므로 holiday만)
-        for cls in classes:
-            if hasattr(cls, 'class_type') and cls.class_type == 'holiday':
-                filtered_classes.append(cls)
-        return filtered_classes
-
-    # 공휴일이 아니면 기존 로직 (단, holiday 타입은 제외)
-    weekday_idx = target_date.weekday()
-    weekday = WEEKDAY_MAP[weekday_idx]
-    is_weekend = weekday_idx >= 5  # 5: Sat, 6: Sun
-
-    for cls in classes:
-        # 'holiday' 타입은 평일/주말 스케줄에서 제외
-        if hasattr(cls, 'class_type'):
-            if cls.class_type == 'holiday':
-                continue
-            
-            # class_type에 따른 평일/주말 필터링 강제 적용
-            if cls.class_type == 'weekday' and is_weekend:
-                continue
-            if cls.class_type == 'weekend' and not is_weekend:
-                continue
-            
-        schedule = parse_weekday_schedule(cls.weekday_schedule)
-        if schedule.get(weekday, True):
-            filtered_classes.append(cls)
-
-    return filtered_classes
-
 def get_next_waiting_number(db: Session, business_date: date, store_id: int) -> int:
     """다음 대기번호 생성"""
     max_number = db.query(func.max(WaitingList.waiting_number)).filter(
@@ -140,13 +41,7 @@ def get_next_waiting_number(db: Session, business_date: date, store_id: int) ->
 
 def get_available_class(db: Session, business_date: date, store_id: int):
     """배치 가능한 클래스 찾기 - 순차적으로 다음 클래스에 배치 (마감된 교시 제외)"""
-    classes_raw = db.query(ClassInfo).filter(
-        ClassInfo.is_active == True,
-        ClassInfo.store_id == store_id
-    ).order_by(ClassInfo.class_number).all()
-
-    # 헬퍼 함수를 사용하여 오늘 요일에 맞는 클래스만 필터링
-    classes = filter_classes_by_weekday(classes_raw, business_date, db, store_id)
+    classes = timetable_resolver.get_classes(db, store_id, business_date)
 
     if not classes:
         raise HTTPException(status_code=400, detail="오늘 운영하는 클래스가 없습니다.")
@@ -198,8 +93,6 @@ def get_available_class(db: Session, business_date: date, store_id: int):
     raise HTTPException(status_code=400, detail="모든 교시의 정원이 마감되었습니다.")
 
 
-from sse_manager import sse_manager
-
 @router.post("/register", response_model=WaitingListResponse)
 async def register_waiting(
     waiting: WaitingListCreate,
@@ -215,25 +108,15 @@ async def register_waiting(
     current_store.last_heartbeat = datetime.now()
     today = get_current_business_date(db, current_store.id)
 
-    # 영업 중인지 확인
-    business = db.query(DailyClosing).filter(
-        DailyClosing.business_date == today,
-        DailyClosing.is_closed == False,
-        DailyClosing.store_id == current_store.id
-    ).first()
+    # 사전 검사 값 묶음 조회 (영업 여부/중복/대기 인원/대기번호/회원/교시별 인원/마감 교시)
+    snapshot = load_registration_snapshot(db, current_store.id, today, waiting.phone)
 
-    if not business:
+    # 영업 중인지 확인
+    if not snapshot.is_open:
         raise HTTPException(status_code=400, detail="영업 중이 아닙니다. 개점을 먼저 진행해주세요.")
 
     # 이미 대기 중인지 확인
-    existing = db.query(WaitingList).filter(
-        WaitingList.business_date == today,
-        WaitingList.phone == waiting.phone,
-        WaitingList.status == "waiting",
-        WaitingList.store_id == current_store.id
-    ).first()
-
-    if existing:
+    if snapshot.is_duplicate:
         raise HTTPException(status_code=400, detail="이미 대기 중인 번호입니다.\n핸드폰번호를 다시 확인하여 주세요.")
 
     # 매장 설정 조회
@@ -279,13 +162,7 @@ async def register_waiting(
 
         if settings.use_max_waiting_limit and settings.max_waiting_limit > 0:
             # 현재 대기 중인 총 인원 확인
-            current_waiting_count = db.query(func.count(WaitingList.id)).filter(
-                WaitingList.business_date == today,
-                WaitingList.status == "waiting",
-                WaitingList.store_id == current_store.id
-            ).scalar()
-
-            if current_waiting_count >= settings.max_waiting_limit:
+            if snapshot.waiting_count >= settings.max_waiting_limit:
                 raise HTTPException(
                     status_code=400,
                     detail=f"대기 인원이 가득 찼습니다. (최대 {settings.max_waiting_limit}명)"
@@ -294,13 +171,7 @@ async def register_waiting(
     # 2. 마지막 교시 정원 초과 차단 체크
     if settings and settings.block_last_class_registration:
         # 오늘 운영되는 클래스 조회
-        classes_raw = db.query(ClassInfo).filter(
-            ClassInfo.is_active == True,
-            ClassInfo.store_id == current_store.id
-        ).order_by(ClassInfo.class_number).all()
-        
-        # 오늘 요일에 맞는 클래스만 필터링
-        classes = filter_classes_by_weekday(classes_raw, today, db, current_store.id)
+        classes = timetable_resolver.get_classes(db, current_store.id, today)
         
         if classes:
             # 마지막 교시 찾기 (class_number가 가장 큰 것)
@@ -308,12 +179,7 @@ async def register_waiting(
             
             # 마지막 교시의 현재 대기 인원 확인
             # Current count must include waiting and attended users to respect total capacity
-            last_class_count = db.query(func.count(WaitingList.id)).filter(
-                WaitingList.class_id == last_class.id,
-                WaitingList.business_date == today,
-                WaitingList.status.in_(["waiting", "called", "attended"]),
-                WaitingList.store_id == current_store.id
-            ).scalar()
+            last_class_count = snapshot.occupancy.get(last_class.id, 0)
             
             # 정원 초과 시 차단
             if last_class_count >= last_class.max_capacity:
@@ -322,13 +188,11 @@ async def register_waiting(
                     detail="교시 접수가 마감되었습니다."
                 )
 
-    # 회원 정보 조회
-    member = db.query(Member).filter(
-        Member.phone == waiting.phone,
-        Member.store_id == current_store.id
-    ).first()
+    # 회원 정보 (사전 검사 묶음 조회 결과)
+    member_id = snapshot.member_id
+    name = snapshot.member_name if member_id else waiting.name
 
-    is_new_member = (member is None)
+    is_new_member = (member_id is None)
 
     # 자동 회원가입 로직 (auto_register_member 또는 require_member_registration이 활성화된 경우)
     should_auto_register = False
@@ -336,7 +200,7 @@ async def register_waiting(
         should_auto_register = getattr(settings, 'auto_register_member', False) or \
                               getattr(settings, 'require_member_registration', False)
 
-    if not member and should_auto_register:
+    if is_new_member and should_auto_register:
         # 이름이 없는 경우 핸드폰 번호 뒷자리 사용
         member_name = waiting.name if waiting.name else waiting.phone[-4:]
         
@@ -349,34 +213,21 @@ async def register_waiting(
         )
         db.add(new_member)
         db.flush()  # ID 생성을 위해 flush
-        member = new_member
-        print(f"자동 회원가입 완료: {member.name} ({member.phone})")
-
-    member_id = member.id if member else None
-    name = member.name if member else waiting.name
+        member_id = new_member.id
+        name = new_member.name
+        print(f"자동 회원가입 완료: {new_member.name} ({new_member.phone})")
 
     # 다음 대기번호 생성
-    waiting_number = get_next_waiting_number(db, today, current_store.id)
+    waiting_number = snapshot.next_waiting_number
 
     # 배치 가능한 클래스 찾기
-    all_classes_raw = db.query(ClassInfo).filter(
-        ClassInfo.store_id == current_store.id,
-        ClassInfo.is_active == True
-    ).order_by(ClassInfo.class_number).all()
-    
-    # 오늘 요일에 운영되는 클래스만 필터링
-    all_classes = filter_classes_by_weekday(all_classes_raw, today, db, current_store.id)
+    all_classes = timetable_resolver.get_classes(db, current_store.id, today)
 
     if not all_classes:
         raise HTTPException(status_code=400, detail="오늘 운영하는 교시가 없습니다.")
 
-    # 마감된 교시 목록 조회
-    closed_class_ids = [
-        cc.class_id for cc in db.query(ClassClosure).filter(
-            ClassClosure.store_id == current_store.id,
-            ClassClosure.business_date == today
-        ).all()
-    ]
+    # 마감된 교시 목록
+    closed_class_ids = snapshot.closed_class_ids
 
     # 시작 교시 인덱스 결정 및 유효성 검증
     start_index = 0
@@ -409,12 +260,7 @@ async def register_waiting(
             continue
             
         # 2. 정원 체크 (대기 + 호출 + 출석 모두 포함)
-        current_count = db.query(func.count(WaitingList.id)).filter(
-            WaitingList.class_id == cls.id,
-            WaitingList.business_date == today,
-            WaitingList.status.in_(["waiting", "called", "attended"]),
-            WaitingList.store_id == current_store.id
-        ).scalar()
+        current_count = snapshot.occupancy.get(cls.id, 0)
         
         print(f"[REGISTER] Class {cls.id} ({cls.class_name}): {current_count}/{cls.max_capacity}")
         
@@ -422,14 +268,7 @@ async def register_waiting(
             target_class = cls
             
             # 순번은 대기 중인 사람(waiting, called)만 카운트
-            queue_count = db.query(func.count(WaitingList.id)).filter(
-                WaitingList.class_id == cls.id,
-                WaitingList.business_date == today,
-                WaitingList.status.in_(["waiting", "called"]),
-                WaitingList.store_id == current_store.id
-            ).scalar()
-            
-            class_order = queue_count + 1
+            class_order = snapshot.queued.get(cls.id, 0) + 1
             print(f"[REGISTER] Assigned to class {cls.id} ({cls.class_name}) as order {class_order}")
             break
             
@@ -461,8 +300,15 @@ async def register_waiting(
     )
 
     db.add(new_waiting)
-    db.commit()
-    db.refresh(new_waiting)
+    record_registration(db, current_store.id, today)
+    try:
+        db.flush()
+    except IntegrityError as e:
+        # 동시 접수 경합으로 사전 검사를 통과한 중복 대기 (부분 유니크 인덱스)
+        db.rollback()
+        if is_duplicate_waiting_error(e):
+            raise HTTPException(status_code=400, detail="이미 대기 중인 번호입니다.\n핸드폰번호를 다시 확인하여 주세요.")
+        raise
 
     # SSE 브로드캐스트: 새로운 대기자 등록 알림
     # SSE 실패가 등록 자체를 실패하게 하면 안됨 -> try/except 처리
@@ -490,7 +336,8 @@ async def register_waiting(
 
         # SSE 브로드캐스트 분리 전송
         # 1. 관리자(Admin)에게는 무조건 전송 (설정과 무관하게 업데이트)
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="new_user",
             data={
@@ -529,7 +376,8 @@ async def register_waiting(
         }
 
         if should_broadcast_board:
-            await sse_manager.broadcast(
+            sse_outbox.publish(
+                db,
                 store_id=str(current_store.id),
                 event_type="new_user",
                 data=common_data,
@@ -539,7 +387,8 @@ async def register_waiting(
             
         # 3. 접수대(Reception)에게 전송
         if should_broadcast_reception:
-            await sse_manager.broadcast(
+            sse_outbox.publish(
+                db,
                 store_id=str(current_store.id),
                 event_type="new_user",
                 data=common_data,
@@ -551,6 +400,8 @@ async def register_waiting(
         logger.error(f"Failed to broadcast SSE event: {str(e)}")
         # SSE 실패는 무시하고 진행
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
 
     # 응답 메시지 생성
     message = f"대기번호: {waiting_number}번\n{target_class.class_name} {class_order}번째\n대기 등록이 완료되었습니다."
@@ -590,16 +441,21 @@ async def get_next_slot(
     다음 대기 등록 시 배정될 예정인 교시 조회 (Reception Desk용 Single Source of Truth)
     """
     today = get_current_business_date(db, current_store.id)
-    
+    return build_next_slot(db, current_store.id, today)
+
+
+def build_next_slot(db: Session, store_id: int, today: date, settings=None,
+                    snapshot: Optional[RegistrationSnapshot] = None) -> dict:
+    """다음 배정 예정 교시 (대기 인원/교시별 인원/마감 교시는 접수 사전 검사 묶음 조회 재사용)"""
+    if snapshot is None:
+        snapshot = load_registration_snapshot(db, store_id, today, "")
+
     # 총 대기 인원 (waiting only) for overall status
-    total_waiting = db.query(func.count(WaitingList.id)).filter(
-        WaitingList.business_date == today,
-        WaitingList.status == "waiting",
-        WaitingList.store_id == current_store.id
-    ).scalar()
+    total_waiting = snapshot.waiting_count
 
     # Fetch settings
-    settings = get_safe_store_settings(db, current_store.id)
+    if settings is None:
+        settings = get_safe_store_settings(db, store_id)
 
     now_time = get_kst_now().time()
     is_business_hours = True
@@ -618,12 +474,7 @@ async def get_next_slot(
                         is_break_time = True
 
     # 1. Available Classes (Same logic as register_waiting)
-    all_classes_raw = db.query(ClassInfo).filter(
-        ClassInfo.store_id == current_store.id,
-        ClassInfo.is_active == True
-    ).order_by(ClassInfo.class_number).all()
-    
-    classes = filter_classes_by_weekday(all_classes_raw, today, db, current_store.id)
+    classes = timetable_resolver.get_classes(db, store_id, today)
     
     if not classes:
          return {
@@ -638,12 +489,7 @@ async def get_next_slot(
         }
 
     # 2. Closed Classes
-    closed_ids = [
-        cc.class_id for cc in db.query(ClassClosure).filter(
-            ClassClosure.store_id == current_store.id,
-            ClassClosure.business_date == today
-        ).all()
-    ]
+    closed_ids = snapshot.closed_class_ids
     
     # 3. Find First Available Slot (Sequential)
     next_class = None
@@ -655,25 +501,13 @@ async def get_next_slot(
             continue
             
         # Get Occupancy (Waiting + Called + Attended)
-        total_occupancy = db.query(func.count(WaitingList.id)).filter(
-            WaitingList.class_id == cls.id,
-            WaitingList.business_date == today,
-            WaitingList.status.in_(["waiting", "called", "attended"]),
-            WaitingList.store_id == current_store.id
-        ).scalar()
+        total_occupancy = snapshot.occupancy.get(cls.id, 0)
         
         if total_occupancy < cls.max_capacity:
             next_class = cls
             
             # 순번은 대기 중인 사람(waiting, called)만 카운트
-            queue_count = db.query(func.count(WaitingList.id)).filter(
-                WaitingList.class_id == cls.id,
-                WaitingList.business_date == today,
-                WaitingList.status.in_(["waiting", "called"]),
-                WaitingList.store_id == current_store.id
-            ).scalar()
-            
-            next_order = queue_count + 1
+            next_order = snapshot.queued.get(cls.id, 0) + 1
             is_fully_booked = False
             break
             
@@ -771,30 +605,86 @@ async def check_waiting_status(
         "message": f"대기번호 {waiting.waiting_number}번\n{class_info.class_name} {waiting.class_order}번째\n앞에 {ahead_count}명 대기 중"
     }
 
+WAITING_LIST_FIELDS = (
+    "id", "business_date", "waiting_number", "phone", "name", "class_id", "class_order",
+    "member_id", "is_empty_seat", "status", "registered_at", "attended_at", "cancelled_at",
+    "call_count", "last_called_at", "message", "last_month_attendance_count", "revisit_count",
+    "created_at", "updated_at", "class_info", "member", "total_party_size", "party_size_details"
+)
+
+
 @router.get("/list")
 async def get_waiting_list(
+    request: Request,
     business_date: Optional[date] = None,
     status: Optional[str] = None,
     class_id: Optional[int] = None,
+    fields: Optional[str] = None,
+    compact: bool = False,
     db: Session = Depends(get_db),
     current_store: Store = Depends(get_current_store)
 ):
     """
     대기자 목록 조회
     - 날짜별, 상태별, 클래스별 필터링 가능
+    - fields=id,name,... 로 필요한 필드만 조회, compact=true 시 교시 정보를 classes 테이블로 분리
+    - 데이터 버전 ETag 일치 시 304
 
     수동으로 응답 형식을 생성하여 weekday_schedule 파싱 문제 해결
     """
+    field_set = parse_fields(fields, WAITING_LIST_FIELDS)
     if not business_date:
         business_date = get_current_business_date(db, current_store.id)
 
-    # class_info와 member를 eager load
-    query = db.query(WaitingList).options(
-        joinedload(WaitingList.class_info),
-        joinedload(WaitingList.member)
-    ).filter(
+    etag = data_versions.etag(current_store.id, business_date)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    # 직접 만든 dict이므로 jsonable_encoder 변환 없이 바로 직렬화
+    return FastJSONResponse(
+        build_waiting_list(db, current_store.id, business_date, status, class_id, field_set, compact),
+        headers=etag_headers(etag)
+    )
+
+
+def class_info_to_dict(class_info: ClassInfo) -> dict:
+    """대기자 목록용 교시 정보 (weekday_schedule 파싱 포함)"""
+    return {
+        "id": class_info.id,
+        "class_number": class_info.class_number,
+        "class_name": class_info.class_name,
+        "start_time": class_info.start_time,
+        "end_time": class_info.end_time,
+        "max_capacity": class_info.max_capacity,
+        "is_active": class_info.is_active,
+        "weekday_schedule": parse_weekday_schedule(class_info.weekday_schedule) if isinstance(class_info.weekday_schedule, str) else class_info.weekday_schedule,
+        "class_type": class_info.class_type if hasattr(class_info, 'class_type') else 'all',
+        "created_at": class_info.created_at,
+        "updated_at": class_info.updated_at,
+        "current_count": 0  # 이 엔드포인트에서는 current_count 계산하지 않음
+    }
+
+
+def build_waiting_list(db: Session, store_id: int, business_date: date,
+                       status: Optional[str] = None, class_id: Optional[int] = None,
+                       fields: FieldSet = ALL_FIELDS, compact: bool = False):
+    """
+    대기자 목록 생성 (status는 쉼표로 여러 개 지정 가능)
+    - fields: 요청된 필드만 계산 (출석 수 조회, 교시 정보 변환, 메시지 생성 생략 가능)
+    - compact: {"classes": {class_id: 교시 정보}, "items": [...]} 형태로 교시 정보를 한 번만 포함
+    """
+    with_member = fields.wants_any("member", "name")
+    with_class = compact or fields.wants_any("class_info", "message")
+
+    # 필요한 관계만 eager load
+    options = []
+    if with_class:
+        options.append(joinedload(WaitingList.class_info))
+    if with_member:
+        options.append(joinedload(WaitingList.member))
+    query = db.query(WaitingList).options(*options).filter(
         WaitingList.business_date == business_date,
-        WaitingList.store_id == current_store.id
+        WaitingList.store_id == store_id
     )
 
     if status:
@@ -813,12 +703,12 @@ async def get_waiting_list(
         WaitingList.class_order
     ).all()
 
-    # 최근 30일 출석 수 일괄 조회 (N+1 문제 방지)
+    # 최근 30일 출석 수 일괄 조회 (N+1 문제 방지) - 요청된 경우에만
     member_ids = [w.member_id for w in waiting_list if w.member_id]
     member_attendance_counts = {}
     revisit_counts = {}  # 재방문 횟수 (설정 기반)
     
-    if member_ids:
+    if member_ids and fields.wants_any("last_month_attendance_count", "revisit_count"):
         from datetime import timedelta
         
         # 출석 카운트 설정 및 재방문 배지 설정 조회
@@ -827,7 +717,7 @@ async def get_waiting_list(
             StoreSettings.attendance_lookback_days,
             StoreSettings.enable_revisit_badge,
             StoreSettings.revisit_period_days
-        ).filter(StoreSettings.store_id == current_store.id).first()
+        ).filter(StoreSettings.store_id == store_id).first()
         
         # 1. 출석 카운트 (기존 로직)
         count_type = settings_data.attendance_count_type if settings_data else 'days'
@@ -842,21 +732,22 @@ async def get_waiting_list(
             # 최근 N일 (기본 30일)
             start_date = business_date - timedelta(days=lookback_days)
         
-        attendance_counts = db.query(
-            WaitingList.member_id,
-            func.count(WaitingList.id)
-        ).filter(
-            WaitingList.member_id.in_(member_ids),
-            WaitingList.status == 'attended',
-            WaitingList.business_date >= start_date,
-            WaitingList.business_date <= business_date  # 미래 날짜 제외
-        ).group_by(WaitingList.member_id).all()
-        
-        member_attendance_counts = {member_id: count for member_id, count in attendance_counts}
+        if "last_month_attendance_count" in fields:
+            attendance_counts = db.query(
+                WaitingList.member_id,
+                func.count(WaitingList.id)
+            ).filter(
+                WaitingList.member_id.in_(member_ids),
+                WaitingList.status == 'attended',
+                WaitingList.business_date >= start_date,
+                WaitingList.business_date <= business_date  # 미래 날짜 제외
+            ).group_by(WaitingList.member_id).all()
+            
+            member_attendance_counts = {member_id: count for member_id, count in attendance_counts}
         
         # 2. 재방문 카운트 (새로운 로직)
         enable_revisit_badge = settings_data.enable_revisit_badge if settings_data else False
-        if enable_revisit_badge:
+        if enable_revisit_badge and "revisit_count" in fields:
             revisit_period_days = settings_data.revisit_period_days if settings_data else 0
             
             revisit_query = db.query(
@@ -877,42 +768,18 @@ async def get_waiting_list(
             
             revisit_counts = {member_id: count for member_id, count in revisit_results}
 
-    # 수동으로 dict 생성 (weekday_schedule 파싱 포함)
+    # 수동으로 dict 생성 (weekday_schedule 파싱 포함) - 같은 교시 정보는 한 번만 변환
+    class_infos = {}
     result = []
     for waiting in waiting_list:
-        # class_info 변환
-        class_info_dict = {
-            "id": waiting.class_info.id,
-            "class_number": waiting.class_info.class_number,
-            "class_name": waiting.class_info.class_name,
-            "start_time": waiting.class_info.start_time,
-            "end_time": waiting.class_info.end_time,
-            "max_capacity": waiting.class_info.max_capacity,
-            "is_active": waiting.class_info.is_active,
-            "weekday_schedule": parse_weekday_schedule(waiting.class_info.weekday_schedule) if isinstance(waiting.class_info.weekday_schedule, str) else waiting.class_info.weekday_schedule,
-            "class_type": waiting.class_info.class_type if hasattr(waiting.class_info, 'class_type') else 'all',
-            "created_at": waiting.class_info.created_at,
-            "updated_at": waiting.class_info.updated_at,
-            "current_count": 0  # 이 엔드포인트에서는 current_count 계산하지 않음
-        }
-
-        # member 변환 (있는 경우)
-        member_dict = None
-        if waiting.member:
-            member_dict = {
-                "id": waiting.member.id,
-                "name": waiting.member.name,
-                "phone": waiting.member.phone,
-                "created_at": waiting.member.created_at
-            }
+        if with_class and waiting.class_id not in class_infos and (compact or "class_info" in fields):
+            class_infos[waiting.class_id] = class_info_to_dict(waiting.class_info)
 
-        # waiting 정보 + class_info + member
         waiting_dict = {
             "id": waiting.id,
             "business_date": waiting.business_date,
             "waiting_number": waiting.waiting_number,
             "phone": waiting.phone,
-            "name": waiting.member.name if waiting.member and waiting.member.name else waiting.name,
             "class_id": waiting.class_id,
             "class_order": waiting.class_order,
             "member_id": waiting.member_id,
@@ -923,73 +790,130 @@ async def get_waiting_list(
             "cancelled_at": waiting.cancelled_at,
             "call_count": waiting.call_count,
             "last_called_at": waiting.last_called_at,
-            "message": f"대기번호 {waiting.waiting_number}번\n{waiting.class_info.class_name} {waiting.class_order}번째",
             # 최근 30일 출석 수 (회원이 없는 경우 0)
             "last_month_attendance_count": member_attendance_counts.get(waiting.member_id, 0),
             # 재방문 횟수 (설정 미사용 시 0, 회원이면 계산된 값)
             "revisit_count": revisit_counts.get(waiting.member_id, 0),
             "created_at": waiting.created_at,
             "updated_at": waiting.updated_at,
-            "class_info": class_info_dict,
-            "member": member_dict,
             "total_party_size": waiting.total_party_size,
             "party_size_details": waiting.party_size_details
         }
+        if with_member:
+            waiting_dict["name"] = waiting.member.name if waiting.member and waiting.member.name else waiting.name
+            # member 변환 (있는 경우)
+            waiting_dict["member"] = {
+                "id": waiting.member.id,
+                "name": waiting.member.name,
+                "phone": waiting.member.phone,
+                "created_at": waiting.member.created_at
+            } if waiting.member else None
+        if "message" in fields:
+            waiting_dict["message"] = f"대기번호 {waiting.waiting_number}번\n{waiting.class_info.class_name} {waiting.class_order}번째"
+        if "class_info" in fields and not compact:
+            waiting_dict["class_info"] = class_infos[waiting.class_id]
 
-        result.append(waiting_dict)
+        result.append(fields.apply(waiting_dict, compact))
 
+    if compact:
+        return {"classes": class_infos, "items": result}
     return result
 
+BY_CLASS_ITEM_FIELDS = (
+    "id", "waiting_number", "name", "phone", "display_name", "class_order",
+    "registered_at", "member_id", "total_party_size", "party_size_details"
+)
+
+
 @router.get("/list/by-class")
 async def get_waiting_list_by_class(
+    request: Request,
     business_date: Optional[date] = None,
+    fields: Optional[str] = None,
+    compact: bool = False,
     db: Session = Depends(get_db),
     current_store: Store = Depends(get_current_store)
 ):
     """
     클래스별로 그룹화된 대기자 목록 조회
     오늘 요일에 운영되는 클래스만 반환
+    fields=id,display_name,... 로 대기자 항목 필드 선택, compact=true 시 값이 없는 필드 생략
+    데이터 버전 ETag 일치 시 304, 같은 버전의 동시 요청은 한 번만 계산하여 결과 공유
     """
+    field_set = parse_fields(fields, BY_CLASS_ITEM_FIELDS)
     if not business_date:
         business_date = get_current_business_date(db, current_store.id)
 
+    etag = data_versions.etag(current_store.id, business_date)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
+
+    return await single_flight.response(
+        ("waiting_list_by_class", current_store.id, business_date, etag, field_set.fields, compact),
+        build_waiting_list_by_class, current_store.id, business_date, field_set, compact,
+        headers=etag_headers(etag)
+    )
+
+
+def build_waiting_list_by_class(db: Session, store_id: int, business_date: date,
+                                fields: FieldSet = ALL_FIELDS, compact: bool = False) -> List[dict]:
+    """
+    클래스별 대기자 목록 생성
+    - 대기자 전체 1회 조회 + 교시별 정원 점유 인원 GROUP BY 1회 조회 (교시 수와 무관)
+    """
     # 모든 활성 클래스 조회
-    classes_raw = db.query(ClassInfo).filter(
-        ClassInfo.is_active == True,
-        ClassInfo.store_id == current_store.id
-    ).order_by(ClassInfo.class_number).all()
+    classes = timetable_resolver.get_classes(db, store_id, business_date)
 
-    # 헬퍼 함수를 사용하여 오늘 요일에 맞는 클래스만 필터링
-    classes = filter_classes_by_weekday(classes_raw, business_date, db, current_store.id)
+    with_member = fields.wants_any("name", "display_name")
+    query = db.query(WaitingList)
+    if with_member:
+        query = query.options(joinedload(WaitingList.member))
+    waiting_rows = query.filter(
+        WaitingList.business_date == business_date,
+        WaitingList.status == "waiting",
+        WaitingList.store_id == store_id
+    ).order_by(WaitingList.class_id, WaitingList.class_order).all()
 
-    result = []
+    waiting_by_class = {}
+    for w in waiting_rows:
+        waiting_by_class.setdefault(w.class_id, []).append(w)
 
-    for cls in classes:
-        waiting_list = db.query(WaitingList).options(
-            joinedload(WaitingList.member)
-        ).filter(
-            WaitingList.business_date == business_date,
-            WaitingList.class_id == cls.id,
-            WaitingList.status == "waiting",
-            WaitingList.store_id == current_store.id
-        ).order_by(WaitingList.class_order).all()
+    # 총 정원 계산용 (Waiting + Called + Attended)
+    total_counts = dict(db.query(
+        WaitingList.class_id,
+        func.count(WaitingList.id)
+    ).filter(
+        WaitingList.business_date == business_date,
+        WaitingList.status.in_(["waiting", "called", "attended"]),
+        WaitingList.store_id == store_id
+    ).group_by(WaitingList.class_id).all())
+
+    # Member 이름 우선 사용 로직
+    def get_display_name(w):
+        if w.member and w.member.name:
+            return w.member.name
+        return w.name if w.name else w.phone[-4:]
+
+    def to_item(w):
+        item = {
+            "id": w.id,
+            "waiting_number": w.waiting_number,
+            "phone": w.phone,
+            "class_order": w.class_order,
+            "registered_at": w.registered_at,
+            "member_id": w.member_id,
+            "total_party_size": w.total_party_size,
+            "party_size_details": w.party_size_details
+        }
+        if with_member:
+            item["name"] = w.member.name if w.member and w.member.name else w.name
+            item["display_name"] = get_display_name(w)
+        return fields.apply(item, compact)
 
-        # 현재 대기 중인 인원 수 (Display용)
-        current_count = len(waiting_list)
-        
-        # 총 정원 계산용 (Waiting + Called + Attended)
-        total_registered_count = db.query(func.count(WaitingList.id)).filter(
-            WaitingList.class_id == cls.id,
-            WaitingList.business_date == business_date,
-            WaitingList.status.in_(["waiting", "called", "attended"]),
-            WaitingList.store_id == current_store.id
-        ).scalar()
+    result = []
 
-        # Member 이름 우선 사용 로직
-        def get_display_name(w):
-            if w.member and w.member.name:
-                return w.member.name
-            return w.name if w.name else w.phone[-4:]
+    for cls in classes:
+        waiting_list = waiting_by_class.get(cls.id, [])
 
         result.append({
             "class_id": cls.id,
@@ -998,27 +922,15 @@ async def get_waiting_list_by_class(
             "start_time": cls.start_time.strftime("%H:%M"),
             "end_time": cls.end_time.strftime("%H:%M"),
             "max_capacity": cls.max_capacity,
-            "current_count": current_count,
-            "total_count": total_registered_count, # Predict Logic용
-            "waiting_list": [
-                {
-                    "id": w.id,
-                    "waiting_number": w.waiting_number,
-                    "name": w.member.name if w.member and w.member.name else w.name,
-                    "phone": w.phone,
-                    "display_name": get_display_name(w),
-                    "class_order": w.class_order,
-                    "registered_at": w.registered_at,
-                    "member_id": w.member_id,
-                    "total_party_size": w.total_party_size,
-                    "party_size_details": w.party_size_details
-                }
-                for w in waiting_list
-            ]
+            # 현재 대기 중인 인원 수 (Display용)
+            "current_count": len(waiting_list),
+            "total_count": total_counts.get(cls.id, 0), # Predict Logic용
+            "waiting_list": [to_item(w) for w in waiting_list]
         })
 
     return result
 
+
 @router.get("/{waiting_id}", response_model=WaitingListResponse)
 async def get_waiting_detail(
     waiting_id: int,
@@ -1076,9 +988,11 @@ async def cancel_waiting(
     if waiting.status != "waiting":
         raise HTTPException(status_code=400, detail="이미 처리된 대기입니다.")
 
-    waiting.status = "cancelled"
-    waiting.cancelled_at = datetime.now()
+    # 동시 요청 중 먼저 변경한 요청만 처리 (카운터 중복 증감 방지)
+    if not claim_status_change(db, waiting, "cancelled", cancelled_at=datetime.now()):
+        raise HTTPException(status_code=400, detail="이미 처리된 대기입니다.")
 
+    data_versions.mark(db, current_store.id)
     db.commit()
 
     return {"message": "대기가 취소되었습니다."}
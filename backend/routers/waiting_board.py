@@ -1,8 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session, defer, joinedload
 from sqlalchemy import func, and_
 from datetime import datetime, date
-from typing import List, Dict
+from typing import List, Dict, Optional
 import json
 
 from database import get_db
@@ -18,9 +18,17 @@ from schemas import (
     EmptySeatInsert,
     WaitingNameUpdate
 )
-from sse_manager import sse_manager
-from utils import get_today_date
+from services.sse_outbox import sse_outbox
 from routers.store_settings import get_safe_store_settings
+from services.business_date import get_current_business_date
+from services.daily_counters import record_registration, record_status_change, claim_status_change, record_call
+from services.timetable import timetable_resolver, parse_weekday_schedule
+from services.single_flight import single_flight
+from services.board_snapshot import BoardSnapshot, board_snapshots, mask_name, render_board_text
+from services.data_version import data_versions, is_not_modified, not_modified_response
+from services.projection import parse_fields
+from services.store_codes import store_codes
+from services.rate_limiter import rate_limit
 
 import logging
 
@@ -29,121 +37,6 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
-from sqlalchemy.exc import OperationalError
-
-def get_current_business_date(db: Session, store_id: int) -> date:
-    """
-    현재 영업일 조회 (Sync with daily_closing.py)
-    1. 활성화된 영업일 우선
-    2. 없으면 시간 기반 계산
-    """
-    # 1. 활성화된 영업일 확인
-    try:
-        active_closing = db.query(DailyClosing).filter(
-            DailyClosing.store_id == store_id,
-            DailyClosing.is_closed == False
-        ).order_by(DailyClosing.business_date.desc()).first()
-
-        if active_closing:
-            return active_closing.business_date
-    except Exception as e:
-        logger.error(f"Error fetching active daily closing: {e}")
-        pass
-
-    # 2. 설정 기반 계산
-    start_hour = 5 # waiting_board uses 5 as default
-    try:
-        start_hour_scalar = db.query(StoreSettings.business_day_start).filter(
-            StoreSettings.store_id == store_id
-        ).scalar()
-        
-        if start_hour_scalar is not None:
-             start_hour = start_hour_scalar
-             
-    except OperationalError:
-        pass
-    except Exception as e:
-        logger.error(f"Error fetching business_day_start: {e}")
-        pass
-        
-    return get_today_date(start_hour)
-
-# 요일 매핑
-WEEKDAY_MAP = {
-    0: "mon",   # Monday
-    1: "tue",   # Tuesday
-    2: "wed",   # Wednesday
-    3: "thu",   # Thursday
-    4: "fri",   # Friday
-    5: "sat",   # Saturday
-    6: "sun"    # Sunday
-}
-
-DEFAULT_WEEKDAY_SCHEDULE = {
-    "mon": True, "tue": True, "wed": True, "thu": True,
-    "fri": True, "sat": True, "sun": True
-}
-
-def parse_weekday_schedule(schedule_str: str) -> Dict[str, bool]:
-    """
-    JSON 문자열을 weekday_schedule 딕셔너리로 안전하게 변환
-    """
-    if not schedule_str:
-        return DEFAULT_WEEKDAY_SCHEDULE.copy()
-
-    try:
-        schedule = json.loads(schedule_str)
-        if not isinstance(schedule, dict):
-            return DEFAULT_WEEKDAY_SCHEDULE.copy()
-        return schedule
-    except (json.JSONDecodeError, TypeError, ValueError):
-        return DEFAULT_WEEKDAY_SCHEDULE.copy()
-
-def filter_classes_by_weekday(classes: List[ClassInfo], target_date: date, db: Session, store_id: int) -> List[ClassInfo]:
-    """
-    특정 날짜의 요일에 맞는 클래스만 필터링
-    **공휴일 로직 추가:**
-    1. 해당 날짜가 공휴일(Holiday)인지 확인
-    2. 공휴일이면 -> class_type == 'holiday' 인 클래스만 반환
-    3. 공휴일이 아니면 -> class_type != 'holiday' 중 요일 스케줄이 맞는 것 반환
-
-    Args:
-        classes: 필터링할 클래스 목록
-        target_date: 기준 날짜
-        db: DB 세션
-        store_id: 매장 ID
-
-    Returns:
-        해당 날짜(요일/공휴일)에 운영되는 클래스 목록
-    """
-    # 1. 공휴일 여부 확인
-    is_holiday = db.query(Holiday).filter(
-        Holiday.store_id == store_id,
-        Holiday.date == target_date
-    ).first()
-
-    filtered_classes = []
-
-    if is_holiday:
-        # 공휴일이면 'holiday' 타입인 클래스만 반환
-        for cls in classes:
-            if hasattr(cls, 'class_type') and cls.class_type == 'holiday':
-                filtered_classes.append(cls)
-        return filtered_classes
-
-    # 공휴일이 아니면 기존 로직 (단, holiday 타입은 제외)
-    weekday = WEEKDAY_MAP[target_date.weekday()]
-
-    for cls in classes:
-        # 'holiday' 타입은 평일/주말 스케줄에서 제외
-        if hasattr(cls, 'class_type') and cls.class_type == 'holiday':
-            continue
-
-        schedule = parse_weekday_schedule(cls.weekday_schedule)
-        if schedule.get(weekday, True):
-            filtered_classes.append(cls)
-
-    return filtered_classes
 
 def convert_class_to_dict(cls: ClassInfo) -> dict:
     """
@@ -170,9 +63,12 @@ def convert_class_to_dict(cls: ClassInfo) -> dict:
         "updated_at": cls.updated_at
     }
 
-@router.get("/display", response_model=WaitingBoard)
+@router.get("/display", response_model=WaitingBoard, dependencies=[Depends(rate_limit("board"))])
 async def get_waiting_board(
     store_code: str,
+    request: Request,
+    fields: Optional[str] = None,
+    compact: bool = False,
     db: Session = Depends(get_db)
 ):
     """
@@ -180,23 +76,45 @@ async def get_waiting_board(
     - 매장 코드로 매장 조회
     - 매장 설정에 따라 표시할 클래스 개수 결정
     - 대기자 목록을 클래스별로 정렬하여 반환
+    - fields=id,display_text,... 로 대기자 항목 필드 선택, compact=true 시 항목의 교시명/빈 값 생략 (저사양 TV용)
+    - 데이터 버전 ETag 일치 시 304, 아니면 매장별 스냅샷을 그대로 응답 (없으면 동시 요청 중 한 번만 생성)
     """
-    # 매장 코드로 매장 조회
-    current_store = db.query(Store).filter(Store.code == store_code).first()
-    if not current_store:
+    field_set = parse_fields(fields, WaitingBoardItem.model_fields)
+    # 매장 코드로 매장 조회 (캐시)
+    store = store_codes.get(db, store_code)
+    if store is None:
         raise HTTPException(status_code=404, detail="매장을 찾을 수 없습니다")
-    
-    today = get_current_business_date(db, current_store.id)
+    store_id = store.id
+
+    today = get_current_business_date(db, store_id)
+    etag = data_versions.etag(store_id, today)
+    if is_not_modified(request, etag):
+        return not_modified_response(etag)
 
+    snapshot = board_snapshots.get(store_id, etag)
+    if snapshot is None:
+        snapshot = await single_flight.run(
+            ("board_display", store_id, etag), build_board_snapshot, store_id, today, etag
+        )
+    return snapshot.response(field_set, compact)
+
+
+def build_board_snapshot(db: Session, store_id: int, today: date, etag: str) -> BoardSnapshot:
+    """현황판 스냅샷 생성 및 캐시"""
+    return board_snapshots.put(store_id, etag, build_waiting_board(db, store_id, today))
+
+
+def build_waiting_board(db: Session, store_id: int, today: date) -> WaitingBoard:
+    """대기현황판 데이터 생성 (표시 이름, 마스킹, 표시 템플릿 적용)"""
     # 매장 설정 조회
-    settings = get_safe_store_settings(db, current_store.id)
+    settings = get_safe_store_settings(db, store_id)
     if not settings:
         raise HTTPException(status_code=404, detail="매장 설정을 찾을 수 없습니다.")
 
     # 영업 정보 조회
     business = db.query(DailyClosing).filter(
         DailyClosing.business_date == today,
-        DailyClosing.store_id == current_store.id
+        DailyClosing.store_id == store_id
     ).first()
 
     # 대기 중인 목록 조회 (먼저 조회)
@@ -205,7 +123,7 @@ async def get_waiting_board(
     ).filter(
         WaitingList.business_date == today,
         WaitingList.status == "waiting",
-        WaitingList.store_id == current_store.id
+        WaitingList.store_id == store_id
     ).order_by(WaitingList.class_id, WaitingList.class_order).all()
 
     # 대기자가 있는 클래스 ID 목록
@@ -215,25 +133,19 @@ async def get_waiting_board(
     completed_classes = db.query(WaitingList.class_id).filter(
         WaitingList.business_date == today,
         WaitingList.status == "attended",
-        WaitingList.store_id == current_store.id
+        WaitingList.store_id == store_id
     ).distinct().all()
     completed_class_ids = set(c.class_id for c in completed_classes if c.class_id not in classes_with_waiting)
 
     # 마감된 클래스 ID 목록
     closed_classes = db.query(ClassClosure.class_id).filter(
         ClassClosure.business_date == today,
-        ClassClosure.store_id == current_store.id
+        ClassClosure.store_id == store_id
     ).all()
     closed_class_ids = set(c.class_id for c in closed_classes)
 
     # 활성화된 클래스 조회 및 오늘 요일에 맞는 클래스만 필터링
-    all_classes_raw = db.query(ClassInfo).filter(
-        ClassInfo.is_active == True,
-        ClassInfo.store_id == current_store.id
-    ).order_by(ClassInfo.class_number).all()
-
-    # 헬퍼 함수를 사용하여 오늘 요일에 맞는 클래스만 필터링 (공휴일 체크 포함)
-    all_classes = filter_classes_by_weekday(all_classes_raw, today, db, current_store.id)
+    all_classes = timetable_resolver.get_classes(db, store_id, today)
 
     # 완료된 클래스와 마감된 클래스는 제외
     # 대기자가 있는 클래스를 우선 표시하되, 설정된 개수만큼 채우기
@@ -259,9 +171,11 @@ async def get_waiting_board(
     classes = sorted(selected_classes, key=lambda c: c.class_number)
 
     # 표시 데이터 변환
+    class_by_id = {c.id: c for c in classes}
+    enable_masking = bool(settings.enable_privacy_masking)
     board_items = []
     for waiting in waiting_list:
-        class_info = next((c for c in classes if c.id == waiting.class_id), None)
+        class_info = class_by_id.get(waiting.class_id)
         if not class_info:
             continue
 
@@ -269,18 +183,26 @@ async def get_waiting_board(
             display_name = waiting.member.name
         else:
             display_name = waiting.name if waiting.name else waiting.phone[-4:]
+        if enable_masking:
+            display_name = mask_name(display_name)
 
         board_items.append(WaitingBoardItem(
             id=waiting.id,
             waiting_number=waiting.waiting_number,
             display_name=display_name,
+            display_text=render_board_text(
+                settings.board_display_template, display_name, waiting.class_order,
+                waiting.waiting_number, waiting.total_party_size, waiting.party_size_details
+            ),
             class_id=waiting.class_id,
             class_name=class_info.class_name,
             class_order=waiting.class_order,
             is_empty_seat=waiting.is_empty_seat or False,
             status=waiting.status,
             call_count=waiting.call_count,
-            last_called_at=waiting.last_called_at
+            last_called_at=waiting.last_called_at,
+            total_party_size=waiting.total_party_size or 0,
+            party_size_details=waiting.party_size_details
         ))
 
     # ClassInfo 객체들을 dict로 변환 (weekday_schedule 파싱 포함)
@@ -333,12 +255,15 @@ async def update_waiting_status(
     old_class_id = waiting.class_id
     old_business_date = waiting.business_date
 
-    waiting.status = status_update.status
-
+    timestamps = {}
     if status_update.status == "attended":
-        waiting.attended_at = datetime.now()
+        timestamps["attended_at"] = datetime.now()
     elif status_update.status == "cancelled":
-        waiting.cancelled_at = datetime.now()
+        timestamps["cancelled_at"] = datetime.now()
+
+    # 동시 요청 중 먼저 변경한 요청만 처리 (카운터 중복 증감 방지)
+    if not claim_status_change(db, waiting, status_update.status, **timestamps):
+        raise HTTPException(status_code=400, detail="이미 처리된 대기입니다.")
 
     # 해당 클래스의 남은 대기자들 순서 정규화: 1번째, 2번째, 3번째... 순서로 재정렬
     remaining_waitings = db.query(WaitingList).filter(
@@ -351,8 +276,6 @@ async def update_waiting_status(
     for idx, w in enumerate(remaining_waitings, start=1):
         w.class_order = idx
 
-    db.commit()
-
     # SSE 브로드캐스트 분리 전송
     settings = db.query(StoreSettings).options(
         defer(StoreSettings.enable_franchise_monitoring)
@@ -373,7 +296,8 @@ async def update_waiting_status(
         target_franchise_id = franchise_id
 
     # 1. 관리자(Admin)에게는 무조건 전송
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="status_changed",
         data={
@@ -400,7 +324,8 @@ async def update_waiting_status(
     }
 
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="status_changed",
             data=common_data,
@@ -410,7 +335,8 @@ async def update_waiting_status(
 
     # 3. 접수대(Reception)에게 전송
     if should_broadcast_reception:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="status_changed",
             data=common_data,
@@ -418,6 +344,9 @@ async def update_waiting_status(
             target_role='reception'
         )
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {"message": f"상태가 {status_update.status}(으)로 변경되었습니다."}
 
 @router.put("/{waiting_id}/name")
@@ -450,8 +379,6 @@ async def update_waiting_name(
         if member:
             member.name = name_update.name
 
-    db.commit()
-
     # SSE 브로드캐스트 분리 전송
     settings = db.query(StoreSettings).options(
         defer(StoreSettings.enable_franchise_monitoring)
@@ -472,7 +399,8 @@ async def update_waiting_name(
         target_franchise_id = franchise_id
 
     # 1. 관리자(Admin)에게는 무조건 전송
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="name_updated",
         data={
@@ -499,7 +427,8 @@ async def update_waiting_name(
     }
 
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="name_updated",
             data=common_data,
@@ -509,7 +438,8 @@ async def update_waiting_name(
 
     # 3. 접수대(Reception)에게 전송
     if should_broadcast_reception:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="name_updated",
             data=common_data,
@@ -517,6 +447,9 @@ async def update_waiting_name(
             target_role='reception'
         )
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {"message": f"이름이 '{name_update.name}'(으)로 변경되었습니다."}
 
 @router.post("/{waiting_id}/call")
@@ -536,10 +469,7 @@ async def call_waiting(
     if not waiting:
         raise HTTPException(status_code=404, detail="대기자를 찾을 수 없습니다.")
 
-    waiting.call_count += 1
-    waiting.last_called_at = datetime.now()
-
-    db.commit()
+    record_call(db, waiting, datetime.now())
 
     # SSE 브로드캐스트 분리 전송
     settings = db.query(StoreSettings).options(
@@ -560,7 +490,8 @@ async def call_waiting(
         target_franchise_id = franchise_id
         
     # 1. 관리자(Admin) 전송
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="user_called",
         data={
@@ -587,7 +518,8 @@ async def call_waiting(
     }
 
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="user_called",
             data=common_data,
@@ -597,7 +529,8 @@ async def call_waiting(
 
     # 3. 접수대(Reception) 전송
     if should_broadcast_reception:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="user_called",
             data=common_data,
@@ -605,6 +538,9 @@ async def call_waiting(
             target_role='reception'
         )
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {
         "message": f"대기번호 {waiting.waiting_number}번이 호출되었습니다.",
         "call_count": waiting.call_count
@@ -674,8 +610,6 @@ async def swap_waiting_order(
     for idx, waiting in enumerate(normalized_waitings, start=1):
         waiting.class_order = idx
 
-    db.commit()
-
     # SSE 브로드캐스트 분리 전송
     try:
         franchise_id = str(current_store.franchise_id) if current_store.franchise_id else None
@@ -698,7 +632,8 @@ async def swap_waiting_order(
 
         # 1. 관리자(Admin) 전송 - 무조건
         logger.info(f"[SWAP] Broadcasting order_changed to ADMIN: store_id={current_store.id}")
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="order_changed",
             data={
@@ -724,7 +659,8 @@ async def swap_waiting_order(
 
         if should_broadcast_board:
             logger.info(f"[SWAP] Broadcasting order_changed to BOARD: store_id={current_store.id}")
-            await sse_manager.broadcast(
+            sse_outbox.publish(
+                db,
                 store_id=str(current_store.id),
                 event_type="order_changed",
                 data=common_data,
@@ -735,7 +671,8 @@ async def swap_waiting_order(
         # 3. 접수대(Reception) 전송
         if should_broadcast_reception:
             logger.info(f"[SWAP] Broadcasting order_changed to RECEPTION: store_id={current_store.id}")
-            await sse_manager.broadcast(
+            sse_outbox.publish(
+                db,
                 store_id=str(current_store.id),
                 event_type="order_changed",
                 data=common_data,
@@ -745,6 +682,9 @@ async def swap_waiting_order(
     except Exception as e:
         logger.error(f"[SWAP] Failed to broadcast SSE: {e}")
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {"message": "순서가 변경되었습니다."}
 
 @router.put("/{waiting_id}/order")
@@ -801,8 +741,6 @@ async def change_waiting_order(
         # 순서 교체
         waiting.class_order, target.class_order = target.class_order, waiting.class_order
 
-    db.commit()
-
     # SSE 브로드캐스트 분리 전송
     settings = db.query(StoreSettings).options(
         defer(StoreSettings.enable_franchise_monitoring)
@@ -822,7 +760,8 @@ async def change_waiting_order(
         target_franchise_id = franchise_id
 
     # 1. 관리자(Admin) 전송
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="order_changed",
         data={
@@ -847,7 +786,8 @@ async def change_waiting_order(
     }
 
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="order_changed",
             data=common_data,
@@ -857,7 +797,8 @@ async def change_waiting_order(
 
     # 3. 접수대(Reception) 전송
     if should_broadcast_reception:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="order_changed",
             data=common_data,
@@ -865,6 +806,9 @@ async def change_waiting_order(
             target_role='reception'
         )
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {"message": "순서가 변경되었습니다."}
 
 @router.put("/{waiting_id}/move-class")
@@ -939,8 +883,6 @@ async def move_to_another_class(
     for idx, w in enumerate(new_class_waitings, start=1):
         w.class_order = idx
 
-    db.commit()
-
     # SSE 브로드캐스트 분리 전송
     settings = db.query(StoreSettings).options(
         defer(StoreSettings.enable_franchise_monitoring)
@@ -960,7 +902,8 @@ async def move_to_another_class(
         target_franchise_id = franchise_id
         
     # 1. 관리자(Admin) 전송
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="class_moved",
         data={
@@ -989,7 +932,8 @@ async def move_to_another_class(
     }
 
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="class_moved",
             data=common_data,
@@ -999,7 +943,8 @@ async def move_to_another_class(
 
     # 3. 접수대(Reception) 전송
     if should_broadcast_reception:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="class_moved",
             data=common_data,
@@ -1007,6 +952,9 @@ async def move_to_another_class(
             target_role='reception'
         )
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {"message": f"{target_class.class_name}(으)로 이동되었습니다."}
 
 @router.post("/batch-attendance")
@@ -1042,14 +990,7 @@ async def batch_attendance(
 
     # 순차 마감 검증: 이전 교시들이 모두 마감되었는지 확인
     # 오늘 운영되는 모든 클래스 조회
-    all_classes_raw = db.query(ClassInfo).filter(
-        ClassInfo.is_active == True,
-        ClassInfo.store_id == current_store.id
-    ).order_by(ClassInfo.class_number).all()
-    
-    # 오늘 요일에 맞는 클래스만 필터링
-    from routers.waiting import filter_classes_by_weekday
-    all_classes = filter_classes_by_weekday(all_classes_raw, today, db, current_store.id)
+    all_classes = timetable_resolver.get_classes(db, current_store.id, today)
     
     # 현재 마감하려는 클래스보다 앞선 클래스들 찾기
     previous_classes = [c for c in all_classes if c.class_number < class_info.class_number]
@@ -1068,20 +1009,17 @@ async def batch_attendance(
                 detail=f"{prev_class.class_name}이(가) 아직 마감되지 않았습니다. 교시는 순서대로 마감해야 합니다."
             )
 
-    # 해당 클래스의 대기 중인 목록 조회 (카운트용) -> 상태 변경용으로 수정
-    waiting_list = db.query(WaitingList).filter(
+    # 대기자 상태를 'attended'로 변경하고 출석 시간 기록
+    # (조건부 UPDATE - 동시에 처리된 대기는 제외하고 실제 변경 건수만 집계)
+    waiting_count = db.query(WaitingList).filter(
         WaitingList.business_date == today,
         WaitingList.class_id == batch.class_id,
         WaitingList.status == "waiting",
         WaitingList.store_id == current_store.id
-    ).all()
-    
-    waiting_count = len(waiting_list)
-
-    # 대기자 상태를 'attended'로 변경하고 출석 시간 기록
-    for waiting in waiting_list:
-        waiting.status = "attended"
-        waiting.attended_at = datetime.now()
+    ).update(
+        {WaitingList.status: "attended", WaitingList.attended_at: datetime.now()},
+        synchronize_session=False
+    )
 
     # 교시 마감 레코드 생성
     closure = ClassClosure(
@@ -1091,7 +1029,7 @@ async def batch_attendance(
         store_id=current_store.id
     )
     db.add(closure)
-    db.commit()
+    record_status_change(db, current_store.id, today, "waiting", "attended", count=waiting_count)
 
     # SSE 브로드캐스트 분리 전송
     settings = db.query(StoreSettings).options(
@@ -1114,7 +1052,8 @@ async def batch_attendance(
     # [1] class_closed 이벤트 브로드캐스트
     
     # 1. 관리자(Admin) 전송
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="class_closed",
         data={
@@ -1143,7 +1082,8 @@ async def batch_attendance(
     }
 
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="class_closed",
             data=common_data,
@@ -1153,7 +1093,8 @@ async def batch_attendance(
 
     # 3. 접수대(Reception)에게 전송
     if should_broadcast_reception:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="class_closed",
             data=common_data,
@@ -1164,7 +1105,8 @@ async def batch_attendance(
     # [2] batch_attendance 이벤트 브로드캐스트 (출석현황 업데이트용)
     
     # 1. 관리자(Admin) 전송
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="batch_attendance",
         data={
@@ -1191,7 +1133,8 @@ async def batch_attendance(
     }
 
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="batch_attendance",
             data=common_data,
@@ -1201,7 +1144,8 @@ async def batch_attendance(
 
     # 3. 접수대(Reception) 전송
     if should_broadcast_reception:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="batch_attendance",
             data=common_data,
@@ -1209,6 +1153,9 @@ async def batch_attendance(
             target_role='reception'
         )
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {
         "message": f"{class_info.class_name}이(가) 마감되고 {waiting_count}명이 일괄 출석 처리되었습니다.",
         "waiting_count": waiting_count
@@ -1247,7 +1194,6 @@ async def unclose_class(
 
     # 마감 레코드 삭제
     db.delete(closure)
-    db.commit()
 
     # SSE 브로드캐스트: 교시 마감 해제 알림
     settings = db.query(StoreSettings).options(
@@ -1257,7 +1203,8 @@ async def unclose_class(
     franchise_id = str(current_store.franchise_id) if current_store.franchise_id else None
     
     # 1. Admin
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="class_reopened",
         data={
@@ -1277,7 +1224,8 @@ async def unclose_class(
         should_broadcast_reception = getattr(settings, 'enable_reception_desk', True)
         
     if should_broadcast_board:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="class_reopened",
             data={
@@ -1289,7 +1237,8 @@ async def unclose_class(
         )
         
     if should_broadcast_reception:
-        await sse_manager.broadcast(
+        sse_outbox.publish(
+            db,
             store_id=str(current_store.id),
             event_type="class_reopened",
             data={
@@ -1300,6 +1249,9 @@ async def unclose_class(
             target_role='reception'
         )
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {
         "message": f"{class_info.class_name}의 마감이 해제되었습니다."
     }
@@ -1323,13 +1275,7 @@ async def get_next_batch_class(
     closed_class_ids = set(c.class_id for c in closed_class_ids)
 
     # 활성화된 클래스 조회 및 오늘 요일에 맞는 클래스만 필터링
-    classes_raw = db.query(ClassInfo).filter(
-        ClassInfo.is_active == True,
-        ClassInfo.store_id == current_store.id
-    ).order_by(ClassInfo.class_number).all()
-
-    # 헬퍼 함수를 사용하여 오늘 요일에 맞는 클래스만 필터링 (공휴일 체크 포함)
-    classes = filter_classes_by_weekday(classes_raw, today, db, current_store.id)
+    classes = timetable_resolver.get_classes(db, current_store.id, today)
 
     for cls in classes:
         # 마감된 교시는 건너뜀
@@ -1434,6 +1380,7 @@ async def insert_empty_seat(
     )
 
     db.add(empty_seat_entry)
+    record_registration(db, current_store.id, today)
 
     # 해당 클래스의 모든 대기자 순서 정규화: 1번째, 2번째, 3번째... 순서로 재정렬
     all_class_waitings = db.query(WaitingList).filter(
@@ -1446,8 +1393,7 @@ async def insert_empty_seat(
     for idx, w in enumerate(all_class_waitings, start=1):
         w.class_order = idx
 
-    db.commit()
-    db.refresh(empty_seat_entry)
+    db.flush()  # 빈 좌석 ID 확보
 
     # 클래스 정보 조회
     class_info = db.query(ClassInfo).filter(
@@ -1456,7 +1402,8 @@ async def insert_empty_seat(
     ).first()
 
     # SSE 브로드캐스트: 빈 좌석 삽입 알림
-    await sse_manager.broadcast(
+    sse_outbox.publish(
+        db,
         store_id=str(current_store.id),
         event_type="empty_seat_inserted",
         data={
@@ -1467,6 +1414,9 @@ async def insert_empty_seat(
         }
     )
 
+    # 이벤트를 커밋 전에 등록 - 매장 데이터 버전이 같은 트랜잭션에서 증가
+    db.commit()
+
     return {
         "message": f"{class_info.class_name} {base_waiting.class_order}번 뒤에 빈 좌석이 삽입되었습니다.",
         "empty_seat_id": empty_seat_entry.id
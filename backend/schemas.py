@@ -89,6 +89,7 @@ class StoreSettingsBase(BaseModel):
     enable_reception_desk: bool = True  # 대기접수 데스크 사용 여부
     max_dashboard_connections: int = 2  # 동시 대시보드 접속 허용 대수
     dashboard_connection_policy: str = "eject_old"  # eject_old(밀어내기) or block_new(차단)
+    sse_coalesce_window_ms: int = 200  # 대기열 변경 이벤트 병합 시간 (ms, 0이면 병합 안 함)
     
     # 테마 설정
     theme: str = "zinc"  # zinc, blue, green
@@ -222,6 +223,7 @@ class StoreSettingsUpdate(BaseModel):
     enable_reception_desk: Optional[bool] = None
     max_dashboard_connections: Optional[int] = None
     dashboard_connection_policy: Optional[str] = None
+    sse_coalesce_window_ms: Optional[int] = None
     
     # 테마 설정
     theme: Optional[str] = None
@@ -287,6 +289,8 @@ class DailyClosing(DailyClosingBase):
     total_waiting: int
     total_attended: int
     total_cancelled: int
+    total_called: int = 0
+    total_no_show: int = 0
     created_at: datetime
 
     class Config:
@@ -450,7 +454,8 @@ class WaitingListDetail(WaitingList):
 class WaitingBoardItem(BaseModel):
     id: int  # 대기자 고유 ID
     waiting_number: int
-    display_name: str  # 이름 또는 폰번호 뒷자리 4자리
+    display_name: str  # 이름 또는 폰번호 뒷자리 4자리 (마스킹 설정 시 마스킹 적용)
+    display_text: Optional[str] = None  # board_display_template 적용 결과
     class_id: int
     class_name: str
     class_order: int
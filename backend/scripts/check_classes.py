@@ -8,7 +8,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database import SessionLocal
 from models import ClassInfo
-from routers.waiting import filter_classes_by_weekday
+from services.timetable import timetable_resolver
 
 def check_classes(store_id: int):
     db = SessionLocal()
@@ -24,12 +24,7 @@ def check_classes(store_id: int):
         for cls in all_classes:
             print(f"- [{cls.id}] {cls.class_name} ({cls.class_number}교시) Active: {cls.is_active}, Schedule: {cls.weekday_schedule}")
 
-        active_classes = db.query(ClassInfo).filter(
-            ClassInfo.store_id == store_id,
-            ClassInfo.is_active == True
-        ).all()
-        
-        filtered = filter_classes_by_weekday(active_classes, today, db, store_id)
+        filtered = timetable_resolver.get_classes(db, store_id, today)
         
         print(f"Classes available for today ({today.strftime('%A')}): {len(filtered)}")
         for cls in filtered:
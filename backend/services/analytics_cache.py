@@ -0,0 +1,118 @@
+"""
+분석(통계) 결과 캐시
+- 마감된 영업일(DailyClosing.is_closed == True)만 포함하는 기간의 결과는 긴 TTL(closed_ttl) 적용
+- 오늘(또는 아직 마감되지 않은 영업일)이 포함된 기간은 짧은 TTL 적용
+- 키에 조회 범위 매장들의 분석 세대(store_data_version.analytics_version 합)를 포함
+  재개점(마감 취소), 관리자 데이터 초기화, 회원 수정/삭제 시 커밋 전에 invalidate_store()로 세대 증가
+  -> 다른 워커의 캐시도 다음 조회부터 새 키를 사용, Parquet 내보내기 워터마크도 무효 (services/analytics_store)
+- 캐시된 값은 복사본으로 저장/반환 (호출한 쪽에서 수정해도 캐시에 영향 없음)
+"""
+import copy
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Hashable, Iterable, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import DailyClosing, Store, StoreDataVersion
+from services.data_version import increment_version
+from utils import get_kst_now
+from core.logger import logger
+
+
+class AnalyticsCache:
+    """(엔드포인트, 조회 범위, 기간) 단위 분석 결과 캐시"""
+
+    def __init__(self, live_ttl: int = 60, closed_ttl: int = 3600, max_entries: int = 1024):
+        self.live_ttl = live_ttl
+        self.closed_ttl = closed_ttl
+        self.max_entries = max_entries
+        # key: (value, expires_at)
+        self._entries: "OrderedDict[Tuple, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint: str, scope: Hashable, start_date: date, end_date: date, **params) -> Tuple:
+        """캐시 키 생성 (추가 파라미터는 이름순 정렬)"""
+        return (endpoint, scope, start_date, end_date, tuple(sorted(params.items())))
+
+    @staticmethod
+    def generation(db: Session, franchise_id: Optional[int] = None, store_ids: Optional[Iterable[int]] = None) -> int:
+        """조회 범위 매장들의 분석 세대 합 (store_ids가 없으면 프랜차이즈 전체 매장)"""
+        query = db.query(func.coalesce(func.sum(StoreDataVersion.analytics_version), 0))
+        if store_ids is not None:
+            query = query.filter(StoreDataVersion.store_id.in_(list(store_ids)))
+        else:
+            query = query.join(Store, StoreDataVersion.store_id == Store.id).filter(
+                Store.franchise_id == franchise_id
+            )
+        return query.scalar()
+
+    @staticmethod
+    def invalidate_store(db: Session, store_id: int, reason: str = "") -> None:
+        """매장 분석 세대 증가 - 과거 데이터를 바꾸는 트랜잭션에서 커밋 전에 호출 (롤백 시 함께 취소)"""
+        generation = increment_version(db.connection(), int(store_id), column="analytics_version")
+        logger.info(f"[AnalyticsCache] store={store_id} generation={generation} ({reason})")
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: Tuple, value: Any, immutable: bool) -> None:
+        expires_at = time.monotonic() + (self.closed_ttl if immutable else self.live_ttl)
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_all(self, reason: str = "") -> None:
+        """이 프로세스의 캐시 전체 비우기 (다른 워커까지 무효화하려면 invalidate_store 사용)"""
+        with self._lock:
+            count = len(self._entries)
+            self._entries.clear()
+        if count:
+            logger.info(f"[AnalyticsCache] Invalidated {count} entries ({reason})")
+
+    @staticmethod
+    def is_closed_range(
+        db: Session,
+        end_date: date,
+        store_ids: Optional[Iterable[int]] = None,
+        franchise_id: Optional[int] = None
+    ) -> bool:
+        """
+        기간이 모두 마감된 영업일로만 구성되어 있는지 확인
+        - 종료일이 오늘(KST) 이전이고
+        - 해당 범위 매장에 종료일 이전의 미마감 영업일이 없어야 함
+        """
+        if end_date >= get_kst_now().date():
+            return False
+
+        query = db.query(DailyClosing.id).filter(
+            DailyClosing.is_closed == False,
+            DailyClosing.business_date <= end_date
+        )
+        if store_ids is not None:
+            query = query.filter(DailyClosing.store_id.in_(list(store_ids)))
+        elif franchise_id is not None:
+            query = query.join(Store, DailyClosing.store_id == Store.id).filter(
+                Store.franchise_id == franchise_id
+            )
+
+        return query.first() is None
+
+
+analytics_cache = AnalyticsCache()
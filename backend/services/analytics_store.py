@@ -0,0 +1,376 @@
+"""
+분석용 Parquet/DuckDB 저장소
+- 마감된 영업일의 WaitingList를 매장/영업일 단위 Parquet 파일로 야간 내보내기
+- Member, DailyClosing, ClassInfo는 매장 단위 스냅샷으로 덮어쓰기
+- 과거 기간 통계는 DuckDB로 Parquet을 조회하여 운영 DB 부하를 분리
+- duckdb 패키지가 없으면 비활성화되고 모든 통계는 기존처럼 운영 DB에서 계산
+- 야간 내보내기는 다중 워커 중 리더 1개 프로세스만 실행 (services/leader_lock)
+- 매장별 내보내기 완료 영업일(워터마크)은 store_data_version에 내보낼 때의 analytics_version과 함께 저장
+  재개점/관리자 초기화/회원 변경은 같은 트랜잭션에서 analytics_version을 올리므로 (services/analytics_cache)
+  어느 워커에서 변경해도 워터마크가 즉시 무효가 되고 다음 야간 작업에서 전체 다시 내보내기
+
+디렉토리 구조:
+    {ANALYTICS_DIR}/waiting_list/{store_id}/{YYYY-MM-DD}.parquet
+    {ANALYTICS_DIR}/member/{store_id}.parquet
+    {ANALYTICS_DIR}/daily_closing/{store_id}.parquet
+    {ANALYTICS_DIR}/class_info/{store_id}.parquet
+"""
+import asyncio
+import os
+import shutil
+import threading
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import WaitingList, Member, DailyClosing, ClassInfo, StoreDataVersion
+from utils import get_kst_now
+from core.logger import logger
+from services.leader_lock import LeaderLock
+
+try:
+    import duckdb
+except ImportError:  # 선택 의존성
+    duckdb = None
+
+ANALYTICS_DIR = os.getenv("ANALYTICS_PARQUET_DIR", "analytics_data")
+NIGHTLY_EXPORT_HOUR = int(os.getenv("ANALYTICS_EXPORT_HOUR", "4"))  # KST
+ANALYTICS_LOCK_FILE = os.getenv("ANALYTICS_LOCK_FILE", "analytics_export.lock")
+# pg_try_advisory_lock 키 (영업일 전환 스케줄러와 다른 고정값)
+ANALYTICS_ADVISORY_LOCK_KEY = 726_150_029
+# DuckDB에 한 번에 넣을 행 수 (전체 행을 메모리에 올리지 않음)
+WRITE_BATCH_SIZE = 1000
+
+# 테이블별 (컬럼명, DuckDB 타입)
+WAITING_LIST_SCHEMA = [
+    ("id", "INTEGER"), ("store_id", "INTEGER"), ("business_date", "DATE"),
+    ("waiting_number", "INTEGER"), ("phone", "VARCHAR"), ("name", "VARCHAR"),
+    ("total_party_size", "INTEGER"), ("class_id", "INTEGER"), ("class_order", "INTEGER"),
+    ("member_id", "INTEGER"), ("is_empty_seat", "BOOLEAN"), ("status", "VARCHAR"),
+    ("registered_at", "TIMESTAMP"), ("attended_at", "TIMESTAMP"), ("cancelled_at", "TIMESTAMP"),
+    ("call_count", "INTEGER"), ("created_at", "TIMESTAMP"),
+]
+MEMBER_SCHEMA = [
+    ("id", "INTEGER"), ("store_id", "INTEGER"), ("name", "VARCHAR"),
+    ("phone", "VARCHAR"), ("created_at", "TIMESTAMP"),
+]
+DAILY_CLOSING_SCHEMA = [
+    ("id", "INTEGER"), ("store_id", "INTEGER"), ("business_date", "DATE"),
+    ("opening_time", "TIMESTAMP"), ("closing_time", "TIMESTAMP"), ("is_closed", "BOOLEAN"),
+    ("total_waiting", "INTEGER"), ("total_attended", "INTEGER"), ("total_cancelled", "INTEGER"),
+]
+CLASS_INFO_SCHEMA = [
+    ("id", "INTEGER"), ("store_id", "INTEGER"), ("class_number", "INTEGER"),
+    ("class_name", "VARCHAR"), ("class_type", "VARCHAR"), ("is_active", "BOOLEAN"),
+]
+
+
+class AnalyticsStore:
+    """Parquet 내보내기 및 DuckDB 조회 관리자"""
+
+    def __init__(self, base_dir: str = ANALYTICS_DIR):
+        self.base_dir = base_dir
+        self._lock = threading.Lock()
+        self._leader = LeaderLock(ANALYTICS_ADVISORY_LOCK_KEY, ANALYTICS_LOCK_FILE)
+
+    # --- 상태 ---
+    @property
+    def enabled(self) -> bool:
+        return duckdb is not None
+
+    def _path(self, *parts) -> str:
+        return os.path.join(self.base_dir, *[str(p) for p in parts])
+
+    @staticmethod
+    def _watermark(row) -> Optional[date]:
+        """내보내기 완료 영업일 (내보낸 뒤 분석 세대가 바뀌었으면 None)"""
+        if row is None or row.analytics_exported_version != row.analytics_version:
+            return None
+        return row.analytics_exported_through
+
+    def covers(self, db: Session, store_ids: Sequence[int], end_date: date) -> bool:
+        """모든 대상 매장이 end_date까지 내보내기 되었고 이후 무효화되지 않았는지 확인"""
+        if not self.enabled or not store_ids:
+            return False
+        rows = {
+            r.store_id: r for r in db.query(StoreDataVersion).filter(
+                StoreDataVersion.store_id.in_(list(store_ids))
+            ).all()
+        }
+        for store_id in store_ids:
+            exported = self._watermark(rows.get(store_id))
+            if not exported or exported < end_date:
+                return False
+        return True
+
+    @staticmethod
+    def _save_watermark(db: Session, store_id: int, generation: Optional[int], last: date) -> bool:
+        """
+        워터마크 저장 - 내보내기 시작 시점의 분석 세대가 그대로일 때만 (조건부 UPDATE)
+        Returns: 저장 여부 (도중에 무효화되었으면 False - 다음 야간 작업에서 다시 내보내기)
+        """
+        table = StoreDataVersion.__table__
+        values = {"analytics_exported_through": last, "analytics_exported_version": generation or 0}
+        try:
+            if generation is None:
+                # 버전 행이 없던 매장 - 그 사이 생성되었으면 세대를 알 수 없으므로 저장하지 않음
+                db.execute(insert(table).values(store_id=store_id, version=0, analytics_version=0, **values))
+            else:
+                updated = db.execute(
+                    update(table).where(
+                        table.c.store_id == store_id,
+                        table.c.analytics_version == generation
+                    ).values(**values)
+                )
+                if updated.rowcount != 1:
+                    db.rollback()
+                    return False
+            db.commit()
+            return True
+        except IntegrityError:
+            db.rollback()
+            return False
+
+    # --- 내보내기 ---
+    def _write_parquet(self, path: str, schema: List[tuple], rows: Iterable[Sequence[Any]]) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        con = duckdb.connect()
+        try:
+            columns = ", ".join(f"{name} {col_type}" for name, col_type in schema)
+            con.execute(f"CREATE TABLE t ({columns})")
+            placeholders = ", ".join("?" for _ in schema)
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, WRITE_BATCH_SIZE))
+                if not batch:
+                    break
+                con.executemany(f"INSERT INTO t VALUES ({placeholders})", batch)
+            con.execute(f"COPY t TO '{tmp_path}' (FORMAT PARQUET)")
+        finally:
+            con.close()
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _row_values(obj, schema: List[tuple]) -> tuple:
+        return tuple(getattr(obj, name) for name, _ in schema)
+
+    def export_store(self, db: Session, store_id: int, since: Optional[date]) -> Optional[date]:
+        """
+        매장의 마감된 영업일을 내보내기
+        Returns: 마지막으로 내보낸 영업일 (없으면 None)
+        """
+        closed_query = db.query(DailyClosing.business_date).filter(
+            DailyClosing.store_id == store_id,
+            DailyClosing.is_closed == True
+        )
+        if since:
+            closed_query = closed_query.filter(DailyClosing.business_date > since)
+
+        # 미마감 영업일 이전까지만 연속으로 내보내기 (워터마크 이후 재개점 방지)
+        open_date = db.query(DailyClosing.business_date).filter(
+            DailyClosing.store_id == store_id,
+            DailyClosing.is_closed == False
+        ).order_by(DailyClosing.business_date).first()
+        if open_date:
+            closed_query = closed_query.filter(DailyClosing.business_date < open_date[0])
+
+        closed_dates = [d[0] for d in closed_query.order_by(DailyClosing.business_date).all()]
+        if not closed_dates:
+            return None
+
+        for business_date in closed_dates:
+            rows = db.query(WaitingList).filter(
+                WaitingList.store_id == store_id,
+                WaitingList.business_date == business_date
+            ).yield_per(1000)
+            self._write_parquet(
+                self._path("waiting_list", store_id, f"{business_date.isoformat()}.parquet"),
+                WAITING_LIST_SCHEMA,
+                (self._row_values(w, WAITING_LIST_SCHEMA) for w in rows)
+            )
+
+        for model, schema, name in (
+            (Member, MEMBER_SCHEMA, "member"),
+            (DailyClosing, DAILY_CLOSING_SCHEMA, "daily_closing"),
+            (ClassInfo, CLASS_INFO_SCHEMA, "class_info"),
+        ):
+            rows = db.query(model).filter(model.store_id == store_id).yield_per(1000)
+            self._write_parquet(
+                self._path(name, f"{store_id}.parquet"),
+                schema,
+                (self._row_values(r, schema) for r in rows)
+            )
+
+        return closed_dates[-1]
+
+    def export_closed_days(self) -> int:
+        """전체 매장의 마감된 영업일 내보내기 (야간 작업)"""
+        if not self.enabled:
+            return 0
+
+        with self._lock:
+            os.makedirs(self.base_dir, exist_ok=True)
+            exported_stores = 0
+            db = SessionLocal()
+            try:
+                store_ids = [s[0] for s in db.query(DailyClosing.store_id).distinct().all()]
+                for store_id in store_ids:
+                    row = db.execute(
+                        select(StoreDataVersion).where(StoreDataVersion.store_id == store_id)
+                    ).scalar_one_or_none()
+                    generation = row.analytics_version if row is not None else None
+                    since = self._watermark(row)
+                    db.rollback()  # 내보내기 동안 스냅샷/잠금을 유지하지 않음
+                    try:
+                        if since is None:
+                            # 처음 또는 무효화 후 - 이전 파일(삭제된 영업일 포함)을 지우고 전체 다시 내보내기
+                            shutil.rmtree(self._path("waiting_list", store_id), ignore_errors=True)
+                        last = self.export_store(db, store_id, since)
+                    except Exception as e:
+                        db.rollback()
+                        logger.error(f"[AnalyticsStore] Export failed for store {store_id}: {e}")
+                        continue
+                    if last and self._save_watermark(db, store_id, generation, last):
+                        exported_stores += 1
+                    elif last:
+                        logger.info(f"[AnalyticsStore] Store {store_id} invalidated during export - retry next run")
+            finally:
+                db.close()
+
+        logger.info(f"[AnalyticsStore] Nightly export completed ({exported_stores} stores updated)")
+        return exported_stores
+
+    async def run_nightly(self) -> None:
+        """매일 NIGHTLY_EXPORT_HOUR(KST)에 내보내기 실행 (리더 프로세스만)"""
+        if not self.enabled:
+            logger.info("[AnalyticsStore] duckdb not installed - Parquet export disabled")
+            return
+
+        while True:
+            now = get_kst_now()
+            next_run = now.replace(hour=NIGHTLY_EXPORT_HOUR, minute=0, second=0, microsecond=0)
+            if next_run <= now:
+                next_run += timedelta(days=1)
+            await asyncio.sleep((next_run - now).total_seconds())
+            try:
+                if not await asyncio.to_thread(self._leader.acquire):
+                    logger.info("[AnalyticsStore] Not the export leader - skipped")
+                    continue
+                await asyncio.to_thread(self.export_closed_days)
+            except Exception as e:
+                logger.error(f"[AnalyticsStore] Nightly export failed: {e}")
+
+    # --- 조회 ---
+    def _connect(self):
+        con = duckdb.connect()
+        for name in ("member", "daily_closing", "class_info"):
+            if not os.path.isdir(self._path(name)):
+                continue
+            pattern = self._path(name, "*.parquet")
+            con.execute(f"CREATE VIEW {name} AS SELECT * FROM read_parquet('{pattern}')")
+        con.execute(
+            f"CREATE VIEW waiting_list AS SELECT * FROM read_parquet('{self._path('waiting_list', '*', '*.parquet')}')"
+        )
+        return con
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        """DuckDB로 Parquet 조회 (뷰: waiting_list, member, daily_closing, class_info)"""
+        con = self._connect()
+        try:
+            return con.execute(sql, list(params)).fetchall()
+        finally:
+            con.close()
+
+    # --- 통계 쿼리 (과거 기간) ---
+    def attendance_ranking(self, store_ids: Sequence[int], start_at: datetime, end_at: datetime, limit: int) -> List[tuple]:
+        """회원 출석 순위: (member_id, name, phone, store_id, attendance_count, last_attended_at)"""
+        return self.query(f"""
+            SELECT w.member_id, m.name, m.phone, w.store_id,
+                   count(*) AS attendance_count, max(w.attended_at) AS last_attended_at
+            FROM waiting_list w
+            JOIN member m ON m.id = w.member_id
+            WHERE w.status = 'attended'
+              AND w.attended_at BETWEEN ? AND ?
+              AND w.store_id IN ({_id_list(store_ids)})
+            GROUP BY w.member_id, m.name, m.phone, w.store_id
+            ORDER BY attendance_count DESC
+            LIMIT ?
+        """, [start_at, end_at, limit])
+
+    def attendance_trends(self, store_ids: Sequence[int], start_at: datetime, end_at: datetime, date_format: str) -> List[tuple]:
+        """기간별 출석 수: (period, count)"""
+        return self.query(f"""
+            SELECT strftime(attended_at, ?) AS period, count(*) AS count
+            FROM waiting_list
+            WHERE status = 'attended'
+              AND attended_at BETWEEN ? AND ?
+              AND store_id IN ({_id_list(store_ids)})
+            GROUP BY period
+            ORDER BY period
+        """, [date_format, start_at, end_at])
+
+    def store_counts(self, store_ids: Sequence[int], start_date: date, end_date: date) -> Dict[int, Dict[str, int]]:
+        """매장별 대기/출석/대기중 건수 (business_date 기준)"""
+        rows = self.query(f"""
+            SELECT store_id,
+                   count(*) AS waiting_count,
+                   count(*) FILTER (WHERE status = 'attended') AS attendance_count,
+                   count(*) FILTER (WHERE status = 'waiting') AS current_count
+            FROM waiting_list
+            WHERE business_date BETWEEN ? AND ?
+              AND store_id IN ({_id_list(store_ids)})
+            GROUP BY store_id
+        """, [start_date, end_date])
+        return {
+            r[0]: {"waiting": r[1], "attendance": r[2], "current": r[3]}
+            for r in rows
+        }
+
+    def wait_time_stats(self, store_ids: Sequence[int], start_date: date, end_date: date) -> Optional[tuple]:
+        """출석 고객 대기 시간(분): (min, max, avg) - 데이터가 없으면 None"""
+        row = self.query(f"""
+            SELECT min(m), max(m), avg(m), count(*)
+            FROM (
+                SELECT epoch(attended_at - created_at) / 60.0 AS m
+                FROM waiting_list
+                WHERE status = 'attended'
+                  AND attended_at IS NOT NULL AND created_at IS NOT NULL
+                  AND business_date BETWEEN ? AND ?
+                  AND store_id IN ({_id_list(store_ids)})
+            )
+        """, [start_date, end_date])[0]
+        return row[:3] if row[3] else None
+
+    def hourly_counts(self, store_ids: Sequence[int], start_date: date, end_date: date) -> Dict[int, Dict[str, int]]:
+        """시간대별 접수/출석 건수"""
+        hourly_map = {h: {"waiting": 0, "attendance": 0} for h in range(24)}
+        rows = self.query(f"""
+            SELECT 'waiting' AS kind, hour(created_at) AS h, count(*)
+            FROM waiting_list
+            WHERE created_at IS NOT NULL AND business_date BETWEEN ? AND ?
+              AND store_id IN ({_id_list(store_ids)})
+            GROUP BY h
+            UNION ALL
+            SELECT 'attendance' AS kind, hour(attended_at) AS h, count(*)
+            FROM waiting_list
+            WHERE attended_at IS NOT NULL AND business_date BETWEEN ? AND ?
+              AND store_id IN ({_id_list(store_ids)})
+            GROUP BY h
+        """, [start_date, end_date, start_date, end_date])
+        for kind, hour, count in rows:
+            hourly_map[hour][kind] += count
+        return hourly_map
+
+
+def _id_list(store_ids: Sequence[int]) -> str:
+    """IN 절용 매장 ID 목록 (정수만 허용)"""
+    return ", ".join(str(int(s)) for s in store_ids)
+
+
+analytics_store = AnalyticsStore()
@@ -0,0 +1,108 @@
+"""
+대기현황판 스냅샷
+- 매장별로 완성된 현황판(표시 이름, 개인정보 마스킹, board_display_template 적용 결과)을 보관
+- 직렬화된 JSON 바이트를 데이터 버전 ETag와 함께 보관하여 모든 현황판에 그대로 응답
+- 데이터 버전(services/data_version)이 바뀌면 다음 요청 시 다시 생성
+- fields/compact 요청은 보관된 현황판 데이터에서 DB 조회 없이 만들어 스냅샷에 함께 보관
+"""
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+from fastapi.responses import Response
+
+from services.data_version import etag_headers
+from services.projection import FieldSet
+from services.single_flight import render_json
+
+DEFAULT_BOARD_TEMPLATE = "{이름}"
+# 이전 기본값 - 왼쪽에 순번이 이미 표시되므로 이름만 표시 (board-card와 동일)
+LEGACY_BOARD_TEMPLATE = "{순번} {이름}"
+
+
+def mask_name(name: str) -> str:
+    """이름 마스킹 (예: "홍길동" → "홍*동")"""
+    if not name:
+        return ""
+    if len(name) <= 1:
+        return "*"
+    if len(name) == 2:
+        return name[0] + "*"
+    return name[0] + "*" * (len(name) - 2) + name[-1]
+
+
+def render_board_text(template: Optional[str], display_name: str, class_order: int,
+                      waiting_number: int, total_party_size: int = 0,
+                      party_size_details: Optional[str] = None) -> str:
+    """board_display_template 치환 ({순번}, {대기번호}, {이름}, {회원명}, {인원})"""
+    template = template or DEFAULT_BOARD_TEMPLATE
+    if template == LEGACY_BOARD_TEMPLATE:
+        template = DEFAULT_BOARD_TEMPLATE
+    return (
+        template
+        .replace("{순번}", str(class_order))
+        .replace("{대기번호}", str(waiting_number))
+        .replace("{이름}", display_name)
+        .replace("{회원명}", display_name)
+        .replace("{인원}", party_size_details or str(total_party_size or 0))
+    )
+
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    etag: str  # 생성 시점의 데이터 버전 ETag
+    body: bytes
+    board: Any = field(default=None, compare=False)  # 직렬화 전 현황판 데이터 (WaitingBoard)
+    variants: Dict[Any, bytes] = field(default_factory=dict, compare=False)  # (fields, compact): 본문
+
+    def projected_body(self, fields: FieldSet, compact: bool = False) -> bytes:
+        """
+        대기자 항목 필드 선택 / 간결 모드 본문
+        - compact: 항목의 class_name 생략 (classes에서 class_id로 조회), 값이 없는 필드 생략
+        """
+        if fields.fields is None and not compact:
+            return self.body
+        key = (fields.fields, compact)
+        body = self.variants.get(key)
+        if body is None:
+            data = self.board.model_dump(mode="json")
+            items = []
+            for item in data["waiting_list"]:
+                if compact:
+                    item.pop("class_name", None)
+                items.append(fields.apply(item, compact))
+            data["waiting_list"] = items
+            body = self.variants.setdefault(key, render_json(data))
+        return body
+
+    def response(self, fields: Optional[FieldSet] = None, compact: bool = False) -> Response:
+        body = self.projected_body(fields, compact) if fields is not None else self.body
+        return Response(content=body, media_type="application/json", headers=etag_headers(self.etag))
+
+
+class BoardSnapshotCache:
+    """매장별 현황판 스냅샷 캐시"""
+
+    def __init__(self):
+        self._snapshots: Dict[int, BoardSnapshot] = {}
+        self._lock = threading.Lock()
+
+    def get(self, store_id: int, etag: str) -> Optional[BoardSnapshot]:
+        """현재 데이터 버전으로 만든 스냅샷이 있으면 반환"""
+        snapshot = self._snapshots.get(store_id)
+        if snapshot is None or snapshot.etag != etag:
+            return None
+        return snapshot
+
+    def put(self, store_id: int, etag: str, board) -> BoardSnapshot:
+        """
+        현황판 데이터를 직렬화하여 스냅샷 저장
+        - etag는 생성 시작 전에 구한 값이므로 생성 중 변경이 있었다면 다음 요청에서 다시 생성됨
+        """
+        snapshot = BoardSnapshot(etag=etag, body=render_json(board), board=board)
+        with self._lock:
+            self._snapshots[store_id] = snapshot
+        return snapshot
+
+
+board_snapshots = BoardSnapshotCache()
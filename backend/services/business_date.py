@@ -0,0 +1,107 @@
+"""
+영업일 리졸버
+- 매장별 개점 중인 영업일(DailyClosing)과 business_day_start 설정을 메모리에 캐시
+- 개점 중인 영업일이 없으면 캐시된 기준 시간으로 시계 기반 계산 (요청마다 조회하지 않음)
+- 캐시 항목은 다음 business_day_start 시각에 만료되어 영업일 전환 시 자동 갱신
+- 개점/마감/재개점 및 매장 설정 변경 시 무효화
+"""
+import threading
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+from typing import Dict, Optional
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from core.logger import logger
+from models import DailyClosing, StoreSettings
+from utils import get_today_date, get_kst_now
+
+# StoreSettings.business_day_start 기본값과 동일
+DEFAULT_BUSINESS_DAY_START = 7
+# 다중 워커 환경에서 다른 프로세스의 개점/마감을 반영하기 위한 최대 보관 시간 (초)
+BUSINESS_DATE_TTL = 30
+
+
+@dataclass(frozen=True)
+class _BusinessDateEntry:
+    open_date: Optional[date]  # 개점 중인 영업일 (없으면 None)
+    start_hour: int
+    expires_at: datetime  # KST
+
+
+def _next_rollover(now: datetime, start_hour: int) -> datetime:
+    """now 이후 처음 도래하는 business_day_start 시각 (KST)"""
+    if not (0 <= start_hour <= 23):
+        start_hour = DEFAULT_BUSINESS_DAY_START
+    rollover = datetime.combine(now.date(), dt_time(start_hour), tzinfo=now.tzinfo)
+    if now >= rollover:
+        rollover += timedelta(days=1)
+    return rollover
+
+
+class BusinessDateResolver:
+    """매장별 현재 영업일 캐시"""
+
+    def __init__(self):
+        self._entries: Dict[int, _BusinessDateEntry] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, store_id: int, now: datetime) -> _BusinessDateEntry:
+        # 1. 활성화된 영업일 확인 (당일 2회 개점 등 지원)
+        open_date = None
+        try:
+            open_date = db.query(DailyClosing.business_date).filter(
+                DailyClosing.store_id == store_id,
+                DailyClosing.is_closed == False
+            ).order_by(DailyClosing.business_date.desc()).limit(1).scalar()
+        except Exception as e:
+            logger.error(f"Error fetching active daily closing: {e}")
+
+        # 2. 영업일 기준 시간
+        start_hour = DEFAULT_BUSINESS_DAY_START
+        try:
+            start_hour_scalar = db.query(StoreSettings.business_day_start).filter(
+                StoreSettings.store_id == store_id
+            ).scalar()
+            if start_hour_scalar is not None:
+                start_hour = start_hour_scalar
+        except OperationalError:
+            # 컬럼이 없는 경우 기본값 사용 (마이그레이션 과도기 대응)
+            pass
+        except Exception as e:
+            logger.error(f"Error fetching business_day_start: {e}")
+
+        expires_at = min(now + timedelta(seconds=BUSINESS_DATE_TTL), _next_rollover(now, start_hour))
+        return _BusinessDateEntry(open_date=open_date, start_hour=start_hour, expires_at=expires_at)
+
+    def get(self, db: Session, store_id: int) -> date:
+        """
+        현재 영업일 조회
+        1. 활성화된 영업일 우선
+        2. 없으면 business_day_start 기준 시간 계산
+        """
+        now = get_kst_now()
+        entry = self._entries.get(store_id)
+        if entry is None or now >= entry.expires_at:
+            entry = self._load(db, store_id, now)
+            with self._lock:
+                self._entries[store_id] = entry
+
+        if entry.open_date:
+            return entry.open_date
+        return get_today_date(entry.start_hour)
+
+    def invalidate(self, store_id: int) -> None:
+        """개점/마감/재개점, 매장 설정 변경 시 호출"""
+        with self._lock:
+            self._entries.pop(store_id, None)
+
+
+business_date_resolver = BusinessDateResolver()
+
+
+def get_current_business_date(db: Session, store_id: int) -> date:
+    """현재 영업일 조회 (캐시 사용)"""
+    return business_date_resolver.get(db, store_id)
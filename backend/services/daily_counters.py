@@ -0,0 +1,121 @@
+"""
+영업일 실시간 집계 (DailyClosing 카운터)
+- 대기 등록/상태 변경/첫 호출 시 같은 트랜잭션 안에서 DailyClosing 카운터를 증감
+- 상태 변경/호출은 조건부 UPDATE로 선점하고, 실제로 행을 바꾼 요청만 카운터 증감 (동시 요청 중복 집계 방지)
+- 개점/마감 시에는 WaitingList 단일 집계 쿼리로 재계산하여 보정
+- total_cancelled는 마감 통계와 동일하게 취소 + 노쇼를 포함
+"""
+from datetime import date
+
+from sqlalchemy import case, func, update
+from sqlalchemy.orm import Session
+
+from models import DailyClosing, WaitingList
+
+COUNTER_COLUMNS = ("total_waiting", "total_attended", "total_cancelled", "total_called", "total_no_show")
+
+# 상태별로 반영되는 카운터
+STATUS_COUNTERS = {
+    "attended": ("total_attended",),
+    "cancelled": ("total_cancelled",),
+    "no_show": ("total_cancelled", "total_no_show"),
+}
+
+
+def bump_daily_counters(db: Session, store_id: int, business_date: date, **deltas: int) -> None:
+    """
+    DailyClosing 카운터 증감 (commit은 호출자가 수행)
+    - 해당 영업일 레코드가 없으면 아무 작업도 하지 않음 (개점 시 재계산됨)
+    """
+    values = {
+        getattr(DailyClosing, name): func.coalesce(getattr(DailyClosing, name), 0) + delta
+        for name, delta in deltas.items() if delta
+    }
+    if not values:
+        return
+    db.execute(
+        update(DailyClosing)
+        .where(DailyClosing.store_id == store_id, DailyClosing.business_date == business_date)
+        .values(values)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def record_registration(db: Session, store_id: int, business_date: date, count: int = 1) -> None:
+    """대기 등록 (빈 좌석 포함)"""
+    bump_daily_counters(db, store_id, business_date, total_waiting=count)
+
+
+def record_status_change(db: Session, store_id: int, business_date: date,
+                         old_status: str, new_status: str, count: int = 1) -> None:
+    """대기 상태 변경"""
+    if old_status == new_status:
+        return
+    deltas = {}
+    for name in STATUS_COUNTERS.get(old_status, ()):
+        deltas[name] = deltas.get(name, 0) - count
+    for name in STATUS_COUNTERS.get(new_status, ()):
+        deltas[name] = deltas.get(name, 0) + count
+    bump_daily_counters(db, store_id, business_date, **deltas)
+
+
+def record_first_call(db: Session, store_id: int, business_date: date) -> None:
+    """대기자 첫 호출 (호출된 대기 건수)"""
+    bump_daily_counters(db, store_id, business_date, total_called=1)
+
+
+def claim_status_change(db: Session, waiting: WaitingList, new_status: str, **values) -> bool:
+    """
+    대기 상태 변경 (WHERE status = 'waiting' 조건부 UPDATE) 후 카운터 증감
+    Returns: 변경 여부 - 다른 요청이 먼저 처리했으면 False (카운터 변경 없음)
+    """
+    result = db.execute(
+        update(WaitingList)
+        .where(WaitingList.id == waiting.id, WaitingList.status == "waiting")
+        .values(status=new_status, **values)
+    )
+    if result.rowcount != 1:
+        return False
+    record_status_change(db, waiting.store_id, waiting.business_date, "waiting", new_status)
+    return True
+
+
+def record_call(db: Session, waiting: WaitingList, called_at) -> None:
+    """
+    호출 횟수 증가 - 첫 호출(call_count 0 -> 1)은 WHERE call_count = 0 조건부 UPDATE로 선점
+    - 선점한 요청만 total_called 증가, 나머지는 원자적으로 call_count + 1
+    """
+    first = db.execute(
+        update(WaitingList)
+        .where(WaitingList.id == waiting.id, func.coalesce(WaitingList.call_count, 0) == 0)
+        .values(call_count=1, last_called_at=called_at)
+    )
+    if first.rowcount == 1:
+        record_first_call(db, waiting.store_id, waiting.business_date)
+        return
+    db.execute(
+        update(WaitingList)
+        .where(WaitingList.id == waiting.id)
+        .values(call_count=WaitingList.call_count + 1, last_called_at=called_at)
+    )
+
+
+def day_totals(db: Session, store_id: int, business_date: date):
+    """영업일 통계 단일 집계 쿼리 (COUNTER_COLUMNS 라벨)"""
+    return db.query(
+        func.count(WaitingList.id).label("total_waiting"),
+        func.count(case((WaitingList.status == "attended", 1))).label("total_attended"),
+        func.count(case((WaitingList.status.in_(["cancelled", "no_show"]), 1))).label("total_cancelled"),
+        func.count(case((WaitingList.call_count > 0, 1))).label("total_called"),
+        func.count(case((WaitingList.status == "no_show", 1))).label("total_no_show")
+    ).filter(
+        WaitingList.store_id == store_id,
+        WaitingList.business_date == business_date
+    ).one()
+
+
+def sync_daily_counters(db: Session, business: DailyClosing) -> None:
+    """WaitingList 기준으로 카운터 재계산 (commit은 호출자가 수행)"""
+    totals = day_totals(db, business.store_id, business.business_date)
+    for name in COUNTER_COLUMNS:
+        setattr(business, name, getattr(totals, name))
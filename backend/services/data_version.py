@@ -0,0 +1,271 @@
+"""
+매장별 데이터 버전
+- 대기열/클래스/마감/설정 변경 시마다 증가하는 매장별 버전 번호 (store_data_version 테이블, 워커 간 공유)
+- 폴링/현황판/대기 목록/클래스 조회는 버전으로 ETag를 만들어 If-None-Match 일치 시 304 응답
+- 커밋 전에 등록된 SSE 이벤트(sse_outbox)와 mark()로 표시한 매장은 같은 트랜잭션 안에서 버전 증가
+- 이미 커밋된 뒤 등록된 이벤트는 이벤트 루프를 막지 않도록 스레드에서 매장별로 모아 한 번만 증가
+- 변경이 없으면 버전은 바뀌지 않음 - 다른 워커의 변경은 DATA_VERSION_REFRESH_SECONDS마다 DB에서 다시 읽어 반영
+- 버전별 변경 교시를 짧게 기록하고, 롱폴링 요청은 버전이 바뀔 때까지 대기 (wait_for_change)
+"""
+import asyncio
+import os
+import threading
+import time
+from datetime import date
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from core.logger import logger
+from database import SessionLocal, engine
+from models import StoreDataVersion
+from services.sse_outbox import OUTBOX_KEY, OutboxEvent, affected_ids, has_uncommitted_writes, sse_outbox
+
+# 다른 워커의 변경을 확인하는 주기 (초) - 이 시간 동안은 메모리의 버전 사용
+DATA_VERSION_REFRESH = float(os.getenv("DATA_VERSION_REFRESH_SECONDS", "1"))
+# 매장별로 보관할 변경 기록 수
+CHANGE_LOG_SIZE = 64
+
+# 세션 info 키 - mark()로 표시한 매장 ID 집합 / 커밋 트랜잭션에서 증가한 {매장 ID: 버전}
+MARKED_KEY = "data_version_marked"
+BUMPED_KEY = "data_version_bumped"
+
+_table = StoreDataVersion.__table__
+_UNKNOWN = object()
+
+
+def increment_version(conn, store_id: int, column: str = "version") -> int:
+    """매장 버전(column) 1 증가 후 새 버전 반환 (호출한 연결의 트랜잭션에 포함)"""
+    counter = _table.c[column]
+    dialect = conn.dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        upsert = (sqlite_insert if dialect == "sqlite" else pg_insert)(_table).values(store_id=store_id, **{column: 1})
+        upsert = upsert.on_conflict_do_update(
+            index_elements=[_table.c.store_id],
+            set_={column: counter + 1}
+        ).returning(counter)
+        return conn.execute(upsert).scalar_one()
+
+    updated = conn.execute(
+        update(_table).where(_table.c.store_id == store_id).values({column: counter + 1})
+    )
+    if updated.rowcount == 0:
+        conn.execute(insert(_table).values(store_id=store_id, **{column: 1}))
+    return conn.execute(select(counter).where(_table.c.store_id == store_id)).scalar_one()
+
+
+def _store_key(store_id) -> Optional[int]:
+    try:
+        return int(store_id)
+    except (TypeError, ValueError):
+        return None
+
+
+class DataVersions:
+    """매장별 단조 증가 데이터 버전 (공유 카운터의 메모리 캐시)"""
+
+    def __init__(self):
+        # store_id: (version, 마지막으로 DB에서 확인한 시각)
+        self._versions: Dict[int, Tuple[int, float]] = {}
+        # store_id: {version: 변경 교시 ID 또는 None(알 수 없음 - 전체 갱신)}
+        self._changes: Dict[int, Dict[int, Optional[FrozenSet[int]]]] = {}
+        # 롱폴링 대기자 (이벤트 루프 스레드에서만 접근)
+        self._waiters: Dict[int, asyncio.Event] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+        # 커밋 후 증가 대기 중인 매장 (store_id: 변경 교시 또는 None)
+        self._pending_bumps: Dict[int, Optional[FrozenSet[int]]] = {}
+
+    @staticmethod
+    def _load(store_id: int) -> int:
+        with engine.connect() as conn:
+            return conn.execute(
+                select(_table.c.version).where(_table.c.store_id == store_id)
+            ).scalar() or 0
+
+    def _observe(self, store_id: int, version: int, class_ids=_UNKNOWN,
+                 checked_at: Optional[float] = None) -> int:
+        """
+        공유 버전 반영
+        - class_ids: 이 프로세스에서 증가시킨 버전의 변경 교시 (DB에서 읽은 값이면 _UNKNOWN)
+        - 버전이 올라갔으면 롱폴링 대기자 깨우기
+        """
+        with self._lock:
+            prev, prev_checked = self._versions.get(store_id, (None, 0.0))
+            if class_ids is not _UNKNOWN:
+                changes = self._changes.setdefault(store_id, {})
+                changes[version] = class_ids
+                while len(changes) > CHANGE_LOG_SIZE:
+                    changes.pop(min(changes))
+            current = version if prev is None else max(prev, version)
+            self._versions[store_id] = (current, checked_at if checked_at is not None else prev_checked)
+
+        if prev is not None and current > prev and self._loop is not None:
+            # 동기 라우트(스레드풀)에서도 안전하게 대기자 깨우기
+            self._loop.call_soon_threadsafe(self._wake, store_id)
+        return current
+
+    def current(self, store_id: int) -> int:
+        now = time.monotonic()
+        entry = self._versions.get(store_id)
+        if entry and now - entry[1] < DATA_VERSION_REFRESH:
+            return entry[0]
+        return self._observe(store_id, self._load(store_id), checked_at=now)
+
+    def bump(self, store_id, class_ids: Optional[FrozenSet[int]] = None) -> None:
+        """별도 짧은 트랜잭션으로 버전 증가 (class_ids: 변경된 교시, 모르면 None) - 이벤트 루프에서 직접 호출 금지"""
+        store_id = int(store_id)
+        with engine.begin() as conn:
+            version = increment_version(conn, store_id)
+        self._observe(store_id, version, class_ids)
+
+    def mark(self, db, store_id) -> None:
+        """
+        클래스/마감/설정 등 변경을 커밋하기 전에 호출 - 커밋 트랜잭션에서 매장 버전 증가
+        - 커밋할 변경이 없으면 바로 증가 (스레드에서)
+        """
+        store_id = int(store_id)
+        if db is not None and has_uncommitted_writes(db):
+            db.info.setdefault(MARKED_KEY, set()).add(store_id)
+        else:
+            self._bump_later(store_id, None)
+
+    def _bump_later(self, store_id: int, class_ids: Optional[FrozenSet[int]]) -> None:
+        """커밋 후 변경 - 매장별로 모아 한 번만 증가, 이벤트 루프에서는 스레드로 넘김"""
+        with self._lock:
+            if store_id in self._pending_bumps:
+                pending = self._pending_bumps[store_id]
+                self._pending_bumps[store_id] = (
+                    None if pending is None or class_ids is None else pending | class_ids
+                )
+                return
+            self._pending_bumps[store_id] = class_ids
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 동기 라우트(스레드풀)/스크립트 - 현재 스레드에서 바로 증가
+            self._flush_bump(store_id)
+            return
+        # 같은 요청 처리 중 이어지는 이벤트까지 모이도록 현재 단계가 끝난 뒤 스레드로 넘김
+        loop.call_soon(loop.run_in_executor, None, self._flush_bump, store_id)
+
+    def _flush_bump(self, store_id: int) -> None:
+        with self._lock:
+            class_ids = self._pending_bumps.pop(store_id, None)
+        try:
+            self.bump(store_id, class_ids)
+        except Exception as e:
+            logger.error(f"[DataVersion] bump failed store={store_id}: {e}")
+
+    def _on_events(self, store_id: str, items: List[OutboxEvent]) -> None:
+        store_key = _store_key(store_id)
+        if store_key is None:
+            return
+        class_ids = affected_ids(items)[0]
+        class_ids = frozenset(class_ids) if class_ids else None
+        versions = [item.version for item in items if item.version is not None]
+        if len(versions) == len(items):
+            # 커밋 트랜잭션에서 이미 증가
+            self._observe(store_key, max(versions), class_ids)
+        else:
+            self._bump_later(store_key, class_ids)
+
+    def _wake(self, store_id: int) -> None:
+        waiter = self._waiters.pop(store_id, None)
+        if waiter is not None:
+            waiter.set()
+
+    def changed_classes(self, store_id: int, since: int) -> Optional[List[int]]:
+        """
+        since 이후 변경된 교시 ID 목록
+        - 중간 버전 중 이 프로세스가 모르는 버전(다른 워커의 변경)이나 알 수 없는 변경이 있으면 None
+        """
+        version = self.current(store_id)
+        changes = self._changes.get(store_id, {})
+        class_ids = set()
+        for v in range(since + 1, version + 1):
+            if v not in changes or changes[v] is None:
+                return None
+            class_ids |= changes[v]
+        return sorted(class_ids)
+
+    async def wait_for_change(self, store_id: int, since: Optional[int], timeout: float) -> int:
+        """버전이 since와 달라질 때까지 최대 timeout초 대기 후 현재 버전 반환"""
+        self._loop = asyncio.get_running_loop()
+        deadline = self._loop.time() + timeout
+        version = self.current(store_id)
+        while since is not None and version == since:
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            waiter = self._waiters.get(store_id)
+            if waiter is None:
+                waiter = self._waiters[store_id] = asyncio.Event()
+            try:
+                # 다른 워커의 변경은 깨워주지 않으므로 확인 주기마다 다시 확인
+                await asyncio.wait_for(waiter.wait(), min(remaining, max(DATA_VERSION_REFRESH, 0.1)))
+            except asyncio.TimeoutError:
+                pass
+            version = self.current(store_id)
+        return version
+
+    def etag(self, store_id: int, business_date: Optional[date] = None) -> str:
+        return f'"{store_id}-{self.current(store_id)}-{business_date or ""}"'
+
+
+data_versions = DataVersions()
+
+# 커밋된 대기열 변경(SSE 이벤트)마다 버전 반영
+sse_outbox.add_listener(data_versions._on_events)
+
+
+@event.listens_for(SessionLocal, "before_commit")
+def _bump_in_transaction(session):
+    """SSE 이벤트가 보관되었거나 mark()된 세션은 커밋 직전 같은 트랜잭션에서 매장 버전 증가 (매장별 1회)"""
+    items = session.info.get(OUTBOX_KEY) or []
+    marked = session.info.pop(MARKED_KEY, None) or set()
+    if not items and not marked:
+        return
+    versions: Dict[int, int] = {}
+    for item in items:
+        store_key = _store_key(item.store_id)
+        if store_key is None:
+            continue
+        if store_key not in versions:
+            versions[store_key] = increment_version(session.connection(), store_key)
+        item.version = versions[store_key]
+    # 이벤트 없이 표시만 된 매장 - 커밋 후 after_commit에서 반영
+    bumped = {}
+    for store_key in marked - versions.keys():
+        bumped[store_key] = increment_version(session.connection(), store_key)
+    if bumped:
+        session.info[BUMPED_KEY] = bumped
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _observe_committed(session):
+    for store_key, version in (session.info.pop(BUMPED_KEY, None) or {}).items():
+        data_versions._observe(store_key, version, None)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _discard_uncommitted(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(MARKED_KEY, None)
+        session.info.pop(BUMPED_KEY, None)
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    """If-None-Match 헤더에 현재 ETag가 포함되어 있는지 확인"""
+    return etag in request.headers.get("if-none-match", "")
+
+
+def etag_headers(etag: str) -> Dict[str, str]:
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
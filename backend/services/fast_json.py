@@ -0,0 +1,57 @@
+"""
+빠른 JSON 직렬화 (orjson)
+- 직접 만든 dict/list 응답과 SSE 프레임을 jsonable_encoder + json.dumps 대신 orjson으로 직렬화
+- datetime/date/time은 orjson이 isoformat과 같은 형식으로 처리, 그 외 타입만 jsonable_encoder로 변환
+- Pydantic 모델은 model_dump_json (pydantic-core) 사용
+- orjson 미설치 시 기존 json.dumps 경로로 동작
+"""
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    orjson = None
+
+_ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS if orjson else 0
+
+
+def _default(value: Any) -> Any:
+    """orjson이 직접 처리하지 못하는 타입 (Pydantic 모델, Decimal 등)"""
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    return jsonable_encoder(value)
+
+
+def dumps(content: Any) -> bytes:
+    """JSONResponse와 같은 형식(공백 없음, 유니코드 그대로)의 JSON 바이트"""
+    if isinstance(content, BaseModel):
+        return content.model_dump_json().encode("utf-8")
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+def sse_frame(payload: Any) -> str:
+    """SSE data 프레임"""
+    return "data: " + dumps(payload).decode("utf-8") + "\n\n"
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    기본 응답 클래스
+    - 엔드포인트가 직접 반환하면 jsonable_encoder 변환 없이 바로 직렬화 (서버가 만든 신뢰 데이터용)
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -0,0 +1,75 @@
+"""
+다중 워커 리더 선출
+- 여러 워커 중 1개 프로세스만 실행해야 하는 백그라운드 작업용 (영업일 자동 전환, 분석 내보내기)
+- PostgreSQL: 세션 레벨 advisory lock (커넥션을 유지하는 동안 리더)
+- 그 외: 파일 잠금 (fcntl.flock), 파일 잠금 미지원 환경은 단일 프로세스로 간주
+"""
+from sqlalchemy import text
+
+from database import engine
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+class LeaderLock:
+    """작업별 리더십 (advisory lock 키 / 잠금 파일)"""
+
+    def __init__(self, advisory_key: int, lock_file: str):
+        self.advisory_key = advisory_key
+        self.lock_file = lock_file
+        self._leader_conn = None
+        self._lock_file = None
+
+    def acquire(self) -> bool:
+        """리더십 획득 시도 (이미 리더이면 유지 여부 확인)"""
+        if self._leader_conn is not None or self._lock_file is not None:
+            return self.still_held()
+
+        if engine.dialect.name == "postgresql":
+            conn = engine.connect()
+            try:
+                acquired = conn.execute(
+                    text("SELECT pg_try_advisory_lock(:key)"), {"key": self.advisory_key}
+                ).scalar()
+            except Exception:
+                conn.close()
+                raise
+            if not acquired:
+                conn.close()
+                return False
+            # 세션 레벨 잠금이므로 커넥션을 유지하는 동안 리더
+            conn.commit()
+            self._leader_conn = conn
+            return True
+
+        if fcntl is None:
+            # 파일 잠금을 지원하지 않는 환경은 단일 프로세스로 간주
+            return True
+
+        lock_file = open(self.lock_file, "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def still_held(self) -> bool:
+        if self._leader_conn is None:
+            return True
+        try:
+            self._leader_conn.execute(text("SELECT 1"))
+            self._leader_conn.commit()
+            return True
+        except Exception:
+            # 커넥션이 끊기면 잠금도 해제되므로 리더십 재획득 필요
+            try:
+                self._leader_conn.close()
+            except Exception:
+                pass
+            self._leader_conn = None
+            return False
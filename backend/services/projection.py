@@ -0,0 +1,49 @@
+"""
+목록 응답 필드 선택 (sparse fieldsets) / 간결 모드
+- fields=a,b,c : 각 항목에서 지정한 필드만 반환 (id는 항상 포함)
+- compact=true : 항목마다 반복되던 교시 정보를 별도 테이블로 분리하고 값이 없는(null) 필드 생략
+- 저사양 현황판 TV, LTE 태블릿의 전송량/파싱 비용 절감용
+"""
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from fastapi import HTTPException
+
+ALWAYS_INCLUDED = frozenset({"id"})
+
+
+class FieldSet:
+    """요청된 필드 집합 (None이면 전체)"""
+
+    def __init__(self, fields: Optional[FrozenSet[str]] = None):
+        self.fields = fields
+
+    def __contains__(self, name: str) -> bool:
+        return self.fields is None or name in self.fields
+
+    def wants_any(self, *names: str) -> bool:
+        return any(name in self for name in names)
+
+    def apply(self, row: Dict[str, Any], compact: bool = False) -> Dict[str, Any]:
+        """필드 선택 및 간결 모드(null 생략) 적용"""
+        if self.fields is not None:
+            row = {key: value for key, value in row.items() if key in self.fields}
+        if compact:
+            row = {key: value for key, value in row.items() if value is not None}
+        return row
+
+
+ALL_FIELDS = FieldSet()
+
+
+def parse_fields(fields: Optional[str], allowed: Iterable[str]) -> FieldSet:
+    """fields 쿼리 파라미터 파싱 - 지원하지 않는 필드가 있으면 400"""
+    if not fields:
+        return ALL_FIELDS
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 필드입니다: {', '.join(sorted(unknown))}"
+        )
+    return FieldSet(frozenset(requested | ALWAYS_INCLUDED))
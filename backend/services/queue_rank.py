@@ -0,0 +1,136 @@
+"""
+매장별 대기 순위 인덱스
+- 영업일의 대기 중(waiting) 티켓을 한 번의 쿼리로 읽어 대기번호 정렬 목록과 티켓/전화번호 맵으로 보관
+- 앞 대기 팀 수(ahead_count)는 정렬 목록 이분 탐색으로 계산 (COUNT 쿼리 없음)
+- 데이터 버전(services/data_version)이 바뀐 뒤 첫 조회 시 다시 생성 (매장당 변경 1회에 쿼리 1회)
+"""
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass
+from datetime import date, datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from database import SessionLocal
+from models import ClassInfo, WaitingList
+from services.data_version import data_versions
+
+
+@dataclass(frozen=True)
+class TicketPosition:
+    waiting_id: int
+    waiting_number: int
+    phone: str
+    name: Optional[str]
+    class_id: int
+    class_name: Optional[str]
+    class_order: int
+    call_count: int
+    last_called_at: Optional[datetime]
+
+
+@dataclass(frozen=True)
+class StoreQueue:
+    business_date: date
+    version: int
+    numbers: List[int]  # 대기 중 티켓의 대기번호 (오름차순)
+    tickets: Dict[int, TicketPosition]  # waiting_id: 티켓
+    by_phone: Dict[str, int]  # phone: waiting_id (대기번호가 가장 빠른 티켓)
+
+    def ahead_count(self, ticket: TicketPosition) -> int:
+        """앞에 대기 중인 팀 수"""
+        return bisect_left(self.numbers, ticket.waiting_number)
+
+    def find_by_phone(self, phone: str) -> Optional[TicketPosition]:
+        waiting_id = self.by_phone.get(phone)
+        return self.tickets.get(waiting_id) if waiting_id is not None else None
+
+
+class QueueRankIndex:
+    """매장별 대기 순위 인덱스"""
+
+    def __init__(self):
+        self._queues: Dict[int, StoreQueue] = {}
+        self._store_locks: Dict[int, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _load(db: Session, store_id: int, business_date: date, version: int) -> StoreQueue:
+        rows = db.query(
+            WaitingList.id,
+            WaitingList.waiting_number,
+            WaitingList.phone,
+            WaitingList.name,
+            WaitingList.class_id,
+            ClassInfo.class_name,
+            WaitingList.class_order,
+            WaitingList.call_count,
+            WaitingList.last_called_at
+        ).outerjoin(
+            ClassInfo, ClassInfo.id == WaitingList.class_id
+        ).filter(
+            WaitingList.store_id == store_id,
+            WaitingList.business_date == business_date,
+            WaitingList.status == "waiting"
+        ).order_by(WaitingList.waiting_number).all()
+
+        tickets, by_phone = {}, {}
+        for row in rows:
+            ticket = TicketPosition(
+                waiting_id=row.id,
+                waiting_number=row.waiting_number,
+                phone=row.phone,
+                name=row.name,
+                class_id=row.class_id,
+                class_name=row.class_name,
+                class_order=row.class_order,
+                call_count=row.call_count or 0,
+                last_called_at=row.last_called_at
+            )
+            tickets[ticket.waiting_id] = ticket
+            by_phone.setdefault(ticket.phone, ticket.waiting_id)
+
+        return StoreQueue(
+            business_date=business_date,
+            version=version,
+            numbers=[row.waiting_number for row in rows],
+            tickets=tickets,
+            by_phone=by_phone
+        )
+
+    def get(self, store_id: int, business_date: date, db: Optional[Session] = None) -> StoreQueue:
+        """
+        현재 데이터 버전의 대기 순위 조회
+        - db가 없으면 (SSE 스트림 등) 짧은 세션을 열어 다시 생성
+        """
+        version = data_versions.current(store_id)
+        queue = self._queues.get(store_id)
+        if queue and queue.version == version and queue.business_date == business_date:
+            return queue
+
+        with self._lock:
+            store_lock = self._store_locks.setdefault(store_id, threading.Lock())
+        # 같은 매장의 동시 재생성은 1회만 수행
+        with store_lock:
+            queue = self._queues.get(store_id)
+            if queue and queue.version == version and queue.business_date == business_date:
+                return queue
+            if db is not None:
+                queue = self._load(db, store_id, business_date, version)
+            else:
+                session = SessionLocal()
+                try:
+                    queue = self._load(session, store_id, business_date, version)
+                finally:
+                    session.close()
+            self._queues[store_id] = queue
+        return queue
+
+    def locate(self, store_id: int, business_date: date, waiting_id: int,
+               db: Optional[Session] = None) -> Tuple[StoreQueue, Optional[TicketPosition]]:
+        queue = self.get(store_id, business_date, db)
+        return queue, queue.tickets.get(waiting_id)
+
+
+queue_rank = QueueRankIndex()
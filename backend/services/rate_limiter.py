@@ -0,0 +1,221 @@
+"""
+공개/키오스크 엔드포인트 요청 제한 (토큰 버킷)
+- (매장, 클라이언트 IP), 매장, 전체 세 단계 버킷을 모두 통과해야 허용
+- 기본은 프로세스 메모리에 상태 보관, RATE_LIMIT_REDIS_URL 설정 + redis 패키지 설치 시 워커 간 공유
+- 초과 시 429 + Retry-After 응답, 허용/차단 건수는 모니터링용으로 집계
+- BaseHTTPMiddleware는 SSE와 충돌하므로 라우트 의존성(Depends)으로 적용
+"""
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, Request
+
+from core.logger import logger
+
+try:
+    import redis
+except ImportError:  # 선택 의존성
+    redis = None
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() != "false"
+RATE_LIMIT_REDIS_URL = os.getenv("RATE_LIMIT_REDIS_URL")
+# 오래 사용하지 않은 메모리 버킷 정리 주기 (검사 횟수)
+PRUNE_EVERY = 1000
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    rate: float  # 초당 보충 토큰 수
+    burst: int  # 최대 토큰 수
+
+
+def _limit(name: str, rate: float, burst: int) -> RateLimit:
+    """환경 변수 RATE_LIMIT_<NAME>=rate/burst 로 재정의 가능"""
+    value = os.getenv(f"RATE_LIMIT_{name.upper()}")
+    if value:
+        try:
+            rate_str, burst_str = value.split("/")
+            return RateLimit(float(rate_str), int(burst_str))
+        except ValueError:
+            logger.warning(f"[RateLimiter] Invalid RATE_LIMIT_{name.upper()}={value}")
+    return RateLimit(rate, burst)
+
+
+# 엔드포인트 종류별 (클라이언트, 매장) 제한 - 매장 Wi-Fi 고객은 같은 IP를 공유하므로 클라이언트 제한도 여유 있게
+PROFILES: Dict[str, Tuple[RateLimit, RateLimit]] = {
+    "register": (_limit("register_client", 1, 10), _limit("register_store", 5, 50)),
+    "status": (_limit("status_client", 2, 20), _limit("status_store", 30, 300)),
+    "board": (_limit("board_client", 2, 20), _limit("board_store", 20, 200)),
+}
+GLOBAL_LIMIT = _limit("global", 300, 1000)
+
+_REDIS_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local tokens = {}
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2])
+    local burst = tonumber(ARGV[i * 2 + 1])
+    local state = redis.call('HMGET', key, 't', 'u')
+    local t = tonumber(state[1]) or burst
+    local u = tonumber(state[2]) or now
+    t = math.min(burst, t + math.max(0, now - u) * rate)
+    tokens[i] = t
+    if t < 1 then wait = math.max(wait, (1 - t) / rate) end
+end
+for i, key in ipairs(KEYS) do
+    local rate = tonumber(ARGV[i * 2])
+    local burst = tonumber(ARGV[i * 2 + 1])
+    local t = tokens[i]
+    if wait == 0 then t = t - 1 end
+    redis.call('HSET', key, 't', t, 'u', now)
+    redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+return tostring(wait)
+"""
+
+
+class RateLimiter:
+    """다단계 토큰 버킷"""
+
+    def __init__(self):
+        # key: [tokens, updated_at]
+        self._buckets: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self._checks = 0
+        # (profile, scope): 건수 - scope는 allowed 또는 차단된 단계(client/store/global)
+        self._counters: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._redis = None
+        self._script = None
+        if RATE_LIMIT_REDIS_URL and redis is not None:
+            try:
+                self._redis = redis.Redis.from_url(RATE_LIMIT_REDIS_URL, socket_timeout=0.2)
+                self._script = self._redis.register_script(_REDIS_SCRIPT)
+            except Exception as e:
+                logger.error(f"[RateLimiter] Redis unavailable, using in-memory buckets: {e}")
+                self._redis = None
+        elif RATE_LIMIT_REDIS_URL:
+            logger.info("[RateLimiter] redis not installed - using in-memory buckets")
+
+    @property
+    def backend(self) -> str:
+        return "redis" if self._redis is not None else "memory"
+
+    def _take_memory(self, buckets: List[Tuple[str, RateLimit]], now: float) -> Tuple[float, Optional[int]]:
+        """모든 버킷에 토큰이 있으면 1개씩 차감. (대기 시간, 부족한 버킷 인덱스) 반환"""
+        with self._lock:
+            levels = []
+            wait, blocked = 0.0, None
+            for idx, (key, limit) in enumerate(buckets):
+                tokens, updated_at = self._buckets.get(key, (limit.burst, now))
+                tokens = min(limit.burst, tokens + (now - updated_at) * limit.rate)
+                levels.append(tokens)
+                if tokens < 1:
+                    needed = (1 - tokens) / limit.rate
+                    if needed > wait:
+                        wait, blocked = needed, idx
+            for (key, _), tokens in zip(buckets, levels):
+                self._buckets[key] = [tokens if blocked is not None else tokens - 1, now]
+
+            self._checks += 1
+            if self._checks % PRUNE_EVERY == 0:
+                self._prune(now)
+        return wait, blocked
+
+    def _prune(self, now: float) -> None:
+        # 가득 찰 만큼 오래된 버킷은 기본 상태와 같으므로 제거
+        idle = [key for key, (_, updated_at) in self._buckets.items() if now - updated_at > 600]
+        for key in idle:
+            del self._buckets[key]
+
+    def _take_redis(self, buckets: List[Tuple[str, RateLimit]], now: float) -> Tuple[float, Optional[int]]:
+        args = [now]
+        for _, limit in buckets:
+            args.extend([limit.rate, limit.burst])
+        wait = float(self._script(keys=[f"ratelimit:{key}" for key, _ in buckets], args=args))
+        if wait <= 0:
+            return 0.0, None
+        # 공유 저장소에서는 차단 단계를 구분하지 않음
+        return wait, -1
+
+    def check(self, profile: str, store_key: str, client_ip: str) -> float:
+        """허용되면 0, 초과 시 재시도까지 대기 시간(초) 반환"""
+        client_limit, store_limit = PROFILES[profile]
+        buckets = [
+            (f"{profile}:client:{store_key}:{client_ip}", client_limit),
+            (f"{profile}:store:{store_key}", store_limit),
+            ("global", GLOBAL_LIMIT),
+        ]
+        now = time.time()
+        if self._redis is not None:
+            try:
+                wait, blocked = self._take_redis(buckets, now)
+            except Exception as e:
+                logger.warning(f"[RateLimiter] Redis check failed, falling back to memory: {e}")
+                wait, blocked = self._take_memory(buckets, now)
+        else:
+            wait, blocked = self._take_memory(buckets, now)
+
+        if blocked is None:
+            scope = "allowed"
+        else:
+            scope = ("client", "store", "global")[blocked] if blocked >= 0 else "limited"
+        self._counters[(profile, scope)] += 1
+        return wait
+
+    def stats(self) -> dict:
+        """모니터링용 집계"""
+        counters: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for (profile, scope), count in list(self._counters.items()):
+            counters[profile][scope] = count
+        return {
+            "enabled": RATE_LIMIT_ENABLED,
+            "backend": self.backend,
+            "tracked_buckets": len(self._buckets),
+            "limits": {
+                profile: {
+                    "client": {"rate": client.rate, "burst": client.burst},
+                    "store": {"rate": store.rate, "burst": store.burst},
+                }
+                for profile, (client, store) in PROFILES.items()
+            },
+            "global": {"rate": GLOBAL_LIMIT.rate, "burst": GLOBAL_LIMIT.burst},
+            "counters": counters,
+        }
+
+
+rate_limiter = RateLimiter()
+
+
+def client_ip(request: Request) -> str:
+    """
+    클라이언트 IP
+    - X-Forwarded-For는 클라이언트가 임의로 넣을 수 있으므로 직접 읽지 않음 (값을 바꿔 가며 제한 우회 가능)
+    - 프록시 뒤에서는 uvicorn --proxy-headers + FORWARDED_ALLOW_IPS(신뢰 프록시 주소)로 실행하면
+      신뢰 프록시가 추가한 주소가 request.client에 반영됨
+    """
+    return request.client.host if request.client else "unknown"
+
+
+def rate_limit(profile: str):
+    """
+    라우트 의존성 생성
+    - 매장 키: 경로/쿼리의 store_code
+    """
+    async def dependency(request: Request) -> None:
+        if not RATE_LIMIT_ENABLED:
+            return
+        store_key = request.path_params.get("store_code") or request.query_params.get("store_code") or "-"
+        wait = rate_limiter.check(profile, store_key, client_ip(request))
+        if wait > 0:
+            raise HTTPException(
+                status_code=429,
+                detail="요청이 너무 많습니다. 잠시 후 다시 시도해주세요.",
+                headers={"Retry-After": str(max(1, math.ceil(wait)))}
+            )
+    return dependency
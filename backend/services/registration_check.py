@@ -0,0 +1,115 @@
+"""
+대기 접수 사전 검사 묶음 조회
+- 영업 여부, 중복 대기, 대기 인원, 다음 대기번호, 회원 정보를 스칼라 서브쿼리 1회 조회로 가져옴
+- 교시별 점유/대기 인원과 마감 교시는 GROUP BY + UNION ALL 1회 조회로 가져옴
+- 교시 목록은 timetable_resolver, 영업일은 business_date 캐시 사용
+- 중복 대기의 최종 보장은 waiting_list 부분 유니크 인덱스 (uq_waiting_list_active_phone)
+"""
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Dict, Optional, Set
+
+from sqlalchemy import Integer, and_, case, exists, func, literal, select, union_all
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from models import ClassClosure, DailyClosing, Member, WaitingList
+
+# 정원 점유 상태 (대기 + 호출 + 출석) / 순번 계산 상태 (대기 + 호출)
+OCCUPYING_STATUSES = ("waiting", "called", "attended")
+QUEUED_STATUSES = ("waiting", "called")
+ACTIVE_PHONE_INDEX = "uq_waiting_list_active_phone"
+
+
+@dataclass
+class RegistrationSnapshot:
+    is_open: bool
+    is_duplicate: bool
+    waiting_count: int
+    max_waiting_number: int
+    member_id: Optional[int]
+    member_name: Optional[str]
+    occupancy: Dict[int, int] = field(default_factory=dict)  # class_id: 대기+호출+출석
+    queued: Dict[int, int] = field(default_factory=dict)  # class_id: 대기+호출
+    closed_class_ids: Set[int] = field(default_factory=set)
+
+    @property
+    def next_waiting_number(self) -> int:
+        return self.max_waiting_number + 1
+
+
+def load_registration_snapshot(db: Session, store_id: int, business_date: date, phone: str) -> RegistrationSnapshot:
+    """대기 접수에 필요한 검사 값을 2회 조회로 묶어서 반환"""
+    today_waiting = and_(
+        WaitingList.store_id == store_id,
+        WaitingList.business_date == business_date
+    )
+    member = select(Member.id, Member.name).where(
+        Member.store_id == store_id,
+        Member.phone == phone
+    ).order_by(Member.id).limit(1).subquery()
+
+    row = db.execute(select(
+        exists().where(
+            DailyClosing.store_id == store_id,
+            DailyClosing.business_date == business_date,
+            DailyClosing.is_closed == False
+        ).label("is_open"),
+        exists().where(
+            today_waiting,
+            WaitingList.phone == phone,
+            WaitingList.status == "waiting"
+        ).label("is_duplicate"),
+        select(func.count(WaitingList.id)).where(
+            today_waiting,
+            WaitingList.status == "waiting"
+        ).scalar_subquery().label("waiting_count"),
+        select(func.max(WaitingList.waiting_number)).where(
+            today_waiting
+        ).scalar_subquery().label("max_waiting_number"),
+        select(member.c.id).scalar_subquery().label("member_id"),
+        select(member.c.name).scalar_subquery().label("member_name")
+    )).one()
+
+    class_rows = db.execute(union_all(
+        select(
+            WaitingList.class_id.label("class_id"),
+            func.sum(case((WaitingList.status.in_(OCCUPYING_STATUSES), 1), else_=0)).label("occupancy"),
+            func.sum(case((WaitingList.status.in_(QUEUED_STATUSES), 1), else_=0)).label("queued"),
+            literal(0, Integer).label("closed")
+        ).where(today_waiting).group_by(WaitingList.class_id),
+        select(
+            ClassClosure.class_id,
+            literal(0, Integer),
+            literal(0, Integer),
+            literal(1, Integer)
+        ).where(
+            ClassClosure.store_id == store_id,
+            ClassClosure.business_date == business_date
+        )
+    )).all()
+
+    snapshot = RegistrationSnapshot(
+        is_open=bool(row.is_open),
+        is_duplicate=bool(row.is_duplicate),
+        waiting_count=row.waiting_count or 0,
+        max_waiting_number=row.max_waiting_number or 0,
+        member_id=row.member_id,
+        member_name=row.member_name
+    )
+    for class_row in class_rows:
+        if class_row.closed:
+            snapshot.closed_class_ids.add(class_row.class_id)
+        else:
+            snapshot.occupancy[class_row.class_id] = class_row.occupancy or 0
+            snapshot.queued[class_row.class_id] = class_row.queued or 0
+    return snapshot
+
+
+def is_duplicate_waiting_error(error: IntegrityError) -> bool:
+    """부분 유니크 인덱스(같은 영업일 같은 번호 중복 대기) 위반 여부"""
+    message = str(error.orig)
+    return ACTIVE_PHONE_INDEX in message or (
+        # SQLite는 인덱스 이름 대신 컬럼 목록으로 보고
+        "waiting_list.store_id, waiting_list.business_date, waiting_list.phone" in message
+    )
@@ -0,0 +1,174 @@
+"""
+자동 영업일 전환 스케줄러
+- 매 정시(KST)에 business_day_start가 해당 시각인 매장들을 묶어서 처리
+- 지난 영업일이 열려 있으면 auto_closing/closing_action 설정대로 마감 후 새 영업일 개점 (대기자 이월 포함)
+- 열린 지난 영업일이 여러 개면 모두 마감하고, 각 영업일의 대기자를 설정대로 처리 또는 오래된 날부터 이월
+- 전환된 매장마다 화면들이 이미 처리하는 SSE 'queue_changed' 이벤트(전체 다시 로드) 1회 전송 (sse_outbox)
+- 다중 워커 환경에서는 리더 1개 프로세스만 실행
+  (services/leader_lock - PostgreSQL: advisory lock, 그 외: 파일 잠금)
+"""
+import asyncio
+import os
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from core.logger import logger
+from database import SessionLocal
+from models import DailyClosing, Store, StoreSettings
+from services.business_date import DEFAULT_BUSINESS_DAY_START
+from services.leader_lock import LeaderLock
+from services.sse_outbox import COALESCED_EVENT, sse_outbox
+from utils import get_today_date, get_kst_now
+
+ROLLOVER_ENABLED = os.getenv("ROLLOVER_SCHEDULER_ENABLED", "true").lower() != "false"
+ROLLOVER_LOCK_FILE = os.getenv("ROLLOVER_LOCK_FILE", "rollover_scheduler.lock")
+# pg_try_advisory_lock 키 (임의의 고정값)
+ROLLOVER_ADVISORY_LOCK_KEY = 726_150_034
+# 정시 직후 여유 시간 (초) - business_day_start 경계를 확실히 넘긴 뒤 실행
+ROLLOVER_DELAY_SECONDS = 5
+# 리더가 아닐 때 리더십 재시도 간격 (초)
+LEADER_RETRY_SECONDS = 60
+
+
+class RolloverScheduler:
+    """매장별 business_day_start 시각에 영업일 자동 전환"""
+
+    def __init__(self):
+        self._leader = LeaderLock(ROLLOVER_ADVISORY_LOCK_KEY, ROLLOVER_LOCK_FILE)
+
+    # --- 영업일 전환 ---
+    @staticmethod
+    def _store_hours(db: Session, hour: Optional[int] = None) -> List[Tuple[int, int]]:
+        """(store_id, business_day_start) 목록 - hour 지정 시 해당 시각 매장만"""
+        start_hour = func.coalesce(StoreSettings.business_day_start, DEFAULT_BUSINESS_DAY_START)
+        query = db.query(Store.id, start_hour).outerjoin(
+            StoreSettings, StoreSettings.store_id == Store.id
+        ).filter(Store.is_active == True)
+        if hour is not None:
+            query = query.filter(start_hour == hour)
+        return query.all()
+
+    @staticmethod
+    def rollover_store(db: Session, store_id: int, business_date: date) -> bool:
+        """
+        매장 영업일 전환
+        - business_date 이전의 열린 영업일을 마감하고 business_date로 개점
+        Returns: 전환 여부 (열린 지난 영업일이 없으면 False)
+        """
+        from routers.daily_closing import open_business_day, close_business_day, process_pending_waitings
+        from services.daily_counters import sync_daily_counters
+        from services.data_version import data_versions
+
+        stale = db.query(DailyClosing).filter(
+            DailyClosing.store_id == store_id,
+            DailyClosing.is_closed == False,
+            DailyClosing.business_date < business_date
+        ).order_by(DailyClosing.business_date).all()
+
+        if not stale:
+            return False
+
+        for business in stale:
+            close_business_day(db, store_id, business)
+
+        carry_dates = [business.business_date for business in stale]
+        current = db.query(DailyClosing).filter(
+            DailyClosing.store_id == store_id,
+            DailyClosing.business_date == business_date
+        ).first()
+        if current is None:
+            open_business_day(db, store_id, business_date, carry_from=carry_dates)
+        else:
+            # 이미 열린 영업일로 지난 영업일들의 대기자 처리/이월
+            process_pending_waitings(db, store_id, carry_dates, business_date)
+            sync_daily_counters(db, current)
+            data_versions.mark(db, store_id)
+            db.commit()
+        return True
+
+    def run_batch(self, hour: Optional[int] = None) -> List[Tuple[int, date]]:
+        """
+        business_day_start == hour 인 매장들 전환 (hour=None: 전체 매장 점검)
+        Returns: 전환된 (store_id, business_date) 목록
+        """
+        rolled = []
+        db = SessionLocal()
+        try:
+            for store_id, start_hour in self._store_hours(db, hour):
+                business_date = get_today_date(start_hour)
+                try:
+                    if self.rollover_store(db, store_id, business_date):
+                        rolled.append((store_id, business_date))
+                        self._notify(store_id, business_date)
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"[Rollover] Store {store_id} rollover failed: {e}")
+        finally:
+            db.close()
+        return rolled
+
+    @staticmethod
+    def _notify(store_id: int, business_date: date) -> None:
+        """전환된 매장 화면 전체 다시 로드 (queue_changed는 모든 화면이 목록 재조회로 처리)"""
+        sse_outbox.publish(
+            None,
+            store_id=str(store_id),
+            event_type=COALESCED_EVENT,
+            data={
+                "events": ["business_day_reset"],
+                "business_date": business_date.isoformat(),
+                "class_ids": [],
+                "waiting_ids": [],
+                "count": 0
+            }
+        )
+
+    async def _run_and_notify(self, hour: Optional[int]) -> None:
+        rolled = await asyncio.to_thread(self.run_batch, hour)
+        if rolled:
+            logger.info(f"[Rollover] hour={hour} rolled over {len(rolled)} stores")
+
+    async def run(self) -> None:
+        """정시마다 해당 시각 매장 전환 (리더 프로세스만)"""
+        if not ROLLOVER_ENABLED:
+            logger.info("[Rollover] Scheduler disabled")
+            return
+
+        catch_up_done = False
+        while True:
+            try:
+                is_leader = await asyncio.to_thread(self._leader.acquire)
+            except Exception as e:
+                logger.error(f"[Rollover] Leader election failed: {e}")
+                is_leader = False
+
+            if not is_leader:
+                catch_up_done = False
+                await asyncio.sleep(LEADER_RETRY_SECONDS)
+                continue
+
+            # 리더가 된 직후: 중단 중 놓친 전환 처리
+            if not catch_up_done:
+                try:
+                    await self._run_and_notify(None)
+                except Exception as e:
+                    logger.error(f"[Rollover] Catch-up failed: {e}")
+                catch_up_done = True
+
+            now = get_kst_now()
+            next_run = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1, seconds=ROLLOVER_DELAY_SECONDS)
+            await asyncio.sleep((next_run - now).total_seconds())
+
+            if not await asyncio.to_thread(self._leader.still_held):
+                catch_up_done = False
+                continue
+            try:
+                await self._run_and_notify(next_run.hour)
+            except Exception as e:
+                logger.error(f"[Rollover] hour={next_run.hour} failed: {e}")
+
+
+rollover_scheduler = RolloverScheduler()
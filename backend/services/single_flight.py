@@ -0,0 +1,69 @@
+"""
+동일 GET 요청 단일 실행 (single-flight)
+- SSE 브로드캐스트 직후 한 매장의 모든 현황판/관리 화면이 같은 조회를 동시에 요청
+- (엔드포인트, 매장, 파라미터) 키가 같은 요청이 진행 중이면 새로 계산하지 않고 그 결과를 함께 대기
+- 결과는 직렬화된 JSON 바이트로 공유하므로 요청마다 직렬화하지 않음
+- 계산은 스레드에서 실행하여 대기 중인 요청들이 이벤트 루프를 막지 않도록 함
+- 계산 함수는 스레드에서 새로 연 전용 세션을 받음 (먼저 요청한 클라이언트가 끊겨 요청 세션이 닫혀도 영향 없음)
+  키와 인자에는 요청 세션/ORM 객체 대신 ID 등 단순 값만 사용
+"""
+import asyncio
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from fastapi.responses import Response
+
+from core.logger import logger
+from database import SessionLocal
+from services import fast_json
+
+
+def render_json(content: Any) -> bytes:
+    """JSONResponse와 동일한 형식으로 직렬화 (Pydantic 모델 포함, orjson 사용)"""
+    return fast_json.dumps(content)
+
+
+class SingleFlight:
+    """키별 진행 중인 계산 공유"""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+
+    @staticmethod
+    def _call(func: Callable[..., Any], args: tuple) -> Any:
+        db = SessionLocal()
+        try:
+            return func(db, *args)
+        finally:
+            db.close()
+
+    async def _compute(self, key: Hashable, func: Callable[..., Any], args: tuple) -> Any:
+        try:
+            return await asyncio.to_thread(self._call, func, args)
+        finally:
+            self._inflight.pop(key, None)
+
+    async def run(self, key: Hashable, func: Callable[..., Any], *args) -> Any:
+        """
+        func(db, *args) 실행 결과 반환 (db: 계산 스레드 전용 세션)
+        - 같은 키의 계산이 진행 중이면 그 결과를 공유 (예외도 동일하게 전달)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.get_running_loop().create_task(self._compute(key, func, args))
+            self._inflight[key] = task
+        else:
+            logger.debug(f"[SingleFlight] Joined in-flight request {key}")
+        # 먼저 요청한 클라이언트가 끊겨도 함께 대기 중인 요청은 결과를 받도록 보호
+        return await asyncio.shield(task)
+
+    async def do(self, key: Hashable, func: Callable[..., Any], *args) -> bytes:
+        """func(db, *args) 결과를 직렬화한 JSON 바이트 반환 (직렬화까지 공유)"""
+        return await self.run(key, lambda db: render_json(func(db, *args)))
+
+    async def response(self, key: Hashable, func: Callable[..., Any], *args,
+                       headers: Optional[Dict[str, str]] = None) -> Response:
+        """do() 결과를 그대로 JSON 응답으로 반환"""
+        return Response(content=await self.do(key, func, *args), media_type="application/json", headers=headers)
+
+
+single_flight = SingleFlight()
@@ -0,0 +1,287 @@
+"""
+SSE 이벤트 아웃박스
+- 라우터는 sse_manager.broadcast를 직접 await 하지 않고 publish()로 이벤트만 등록
+- 커밋되지 않은 변경이 있는 세션에서 등록된 이벤트는 세션에 보관했다가 커밋 후 전송, 롤백 시 폐기
+- 이미 커밋된 상태(또는 세션 없음)에서 등록된 이벤트는 바로 전송 대기열에 추가
+- 실제 전송(fan-out)은 백그라운드 디스패처 태스크가 수행하므로 HTTP 응답 지연에 포함되지 않음
+- 대기열 변경 이벤트는 매장별 병합 시간(StoreSettings.sse_coalesce_window_ms) 동안 모아
+  'queue_changed' 이벤트 1건으로 전송 (첫 이벤트는 즉시 전송, 호출 등 긴급 이벤트는 병합하지 않음)
+"""
+import asyncio
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from core.logger import logger
+from database import SessionLocal
+from models import StoreSettings
+from sse_manager import sse_manager
+
+OUTBOX_KEY = "sse_outbox"
+WRITES_KEY = "sse_outbox_has_writes"
+
+# 병합 대상 이벤트 (화면에서 목록을 다시 불러오기만 하는 이벤트)
+COALESCE_EVENTS = {
+    "new_user", "status_changed", "order_changed", "class_moved",
+    "empty_seat_inserted", "batch_attendance", "name_updated"
+}
+COALESCED_EVENT = "queue_changed"
+# 매장 설정이 없을 때 기본 병합 시간 (ms, 0이면 병합 안 함)
+DEFAULT_COALESCE_WINDOW_MS = int(os.getenv("SSE_COALESCE_WINDOW_MS", "200"))
+# 매장별 병합 시간 설정 캐시 유지 시간 (초)
+COALESCE_SETTINGS_TTL = 60
+
+# (store_id, target_role, franchise_id)
+CoalesceKey = Tuple[str, Optional[str], Optional[str]]
+
+
+@dataclass
+class OutboxEvent:
+    store_id: str
+    event_type: str
+    data: Optional[dict] = None
+    franchise_id: Optional[str] = None
+    target_role: Optional[str] = None
+    version: Optional[int] = None  # 커밋 트랜잭션에서 증가한 매장 데이터 버전 (services/data_version)
+
+
+def has_uncommitted_writes(db: Session) -> bool:
+    """세션에 아직 커밋되지 않은 변경(flush 포함)이 있는지"""
+    return bool(db.info.get(WRITES_KEY) or db.new or db.dirty or db.deleted)
+
+
+def affected_ids(items: List[OutboxEvent]) -> Tuple[Set, Set]:
+    """이벤트 데이터에서 영향받은 교시 ID(*class_id)와 대기 ID(waiting_id, target_id) 추출"""
+    class_ids, waiting_ids = set(), set()
+    for item in items:
+        for field, value in (item.data or {}).items():
+            if value is None:
+                continue
+            if field.endswith("class_id"):
+                class_ids.add(value)
+            elif field in ("waiting_id", "target_id"):
+                waiting_ids.add(value)
+    return class_ids, waiting_ids
+
+
+class SSEOutbox:
+    """커밋 후 SSE 이벤트 전송 디스패처"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        # 병합 창이 열려 있는 키별 대기 이벤트
+        self._pending: Dict[CoalesceKey, List[OutboxEvent]] = {}
+        # store_id: (loaded_at, window_seconds)
+        self._windows: Dict[str, Tuple[float, float]] = {}
+        # 전송 확정 시 (매장 ID, 해당 매장 이벤트 목록)으로 호출되는 콜백 (데이터 버전 등)
+        self._listeners: List[Callable[[str, List[OutboxEvent]], None]] = []
+
+    def start(self) -> None:
+        """디스패처 태스크 시작 (이벤트 루프 안에서 호출)"""
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._task = self._loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        while True:
+            item = await self._queue.get()
+            try:
+                await self._dispatch(item)
+            except Exception as e:
+                logger.error(f"[SSEOutbox] Broadcast failed: {e}")
+
+    # --- 병합 ---
+    @staticmethod
+    def _load_window(store_id: str) -> float:
+        db = SessionLocal()
+        try:
+            window_ms = db.query(StoreSettings.sse_coalesce_window_ms).filter(
+                StoreSettings.store_id == int(store_id)
+            ).scalar()
+        except (OperationalError, ValueError):
+            # 컬럼 미생성(마이그레이션 과도기) 등은 기본값 사용
+            window_ms = None
+        finally:
+            db.close()
+        if window_ms is None:
+            window_ms = DEFAULT_COALESCE_WINDOW_MS
+        return max(window_ms, 0) / 1000
+
+    async def _coalesce_window(self, store_id: str) -> float:
+        now = time.monotonic()
+        cached = self._windows.get(store_id)
+        if cached and now - cached[0] < COALESCE_SETTINGS_TTL:
+            return cached[1]
+        window = await asyncio.to_thread(self._load_window, store_id)
+        self._windows[store_id] = (now, window)
+        return window
+
+    def invalidate_window(self, store_id: int) -> None:
+        """매장 설정 변경 시 호출"""
+        self._windows.pop(str(store_id), None)
+
+    async def _dispatch(self, item: OutboxEvent) -> None:
+        if item.event_type not in COALESCE_EVENTS:
+            await self._deliver(item)
+            return
+
+        key = (item.store_id, item.target_role, item.franchise_id)
+        if key in self._pending:
+            # 병합 창이 열려 있으면 모았다가 창이 닫힐 때 전송
+            self._pending[key].append(item)
+            return
+
+        window = await self._coalesce_window(item.store_id)
+        if window <= 0:
+            await self._deliver(item)
+            return
+
+        # 첫 이벤트는 즉시 전송하고 병합 창 시작
+        self._pending[key] = []
+        await self._deliver(item)
+        self._loop.create_task(self._flush_loop(key, window))
+
+    async def _flush_loop(self, key: CoalesceKey, window: float) -> None:
+        """창이 닫힐 때마다 모인 이벤트 전송, 모인 이벤트가 없으면 창 종료"""
+        while True:
+            await asyncio.sleep(window)
+            items = self._pending.get(key)
+            if not items:
+                self._pending.pop(key, None)
+                return
+            self._pending[key] = []
+            try:
+                await self._deliver(items[0] if len(items) == 1 else self._merge(items))
+            except Exception as e:
+                logger.error(f"[SSEOutbox] Coalesced broadcast failed: {e}")
+
+    @staticmethod
+    def _merge(items: List[OutboxEvent]) -> OutboxEvent:
+        """여러 이벤트를 queue_changed 1건으로 병합 (영향받은 교시/대기 ID 목록 포함)"""
+        event_types = []
+        for item in items:
+            if item.event_type not in event_types:
+                event_types.append(item.event_type)
+        class_ids, waiting_ids = affected_ids(items)
+        first = items[0]
+        return OutboxEvent(
+            store_id=first.store_id,
+            event_type=COALESCED_EVENT,
+            data={
+                "events": event_types,
+                "class_ids": sorted(class_ids),
+                "waiting_ids": sorted(waiting_ids),
+                "count": len(items)
+            },
+            franchise_id=first.franchise_id,
+            target_role=first.target_role
+        )
+
+    async def _deliver(self, item: OutboxEvent) -> None:
+        await sse_manager.broadcast(
+            store_id=item.store_id,
+            event_type=item.event_type,
+            data=item.data,
+            franchise_id=item.franchise_id,
+            target_role=item.target_role
+        )
+
+    def add_listener(self, callback: Callable[[str, List[OutboxEvent]], None]) -> None:
+        """이벤트 전송이 확정될 때(커밋 후) 매장 ID와 해당 매장 이벤트 목록으로 호출할 콜백 등록"""
+        self._listeners.append(callback)
+
+    def _notify_listeners(self, items: List[OutboxEvent]) -> None:
+        by_store: Dict[str, List[OutboxEvent]] = {}
+        for item in items:
+            by_store.setdefault(item.store_id, []).append(item)
+        for store_id, store_items in by_store.items():
+            for callback in self._listeners:
+                try:
+                    callback(store_id, store_items)
+                except Exception as e:
+                    logger.error(f"[SSEOutbox] Listener failed: {e}")
+
+    def _enqueue(self, items: List[OutboxEvent]) -> None:
+        self._notify_listeners(items)
+        if self._loop is None:
+            try:
+                self.start()
+            except RuntimeError:
+                # 이벤트 루프 밖(스크립트 등)에서는 전송할 대상이 없음
+                logger.warning(f"[SSEOutbox] No running loop - dropped {len(items)} events")
+                return
+        for item in items:
+            # 동기 라우트(스레드풀)에서도 안전하게 전달
+            self._loop.call_soon_threadsafe(self._queue.put_nowait, item)
+
+    @staticmethod
+    def _has_uncommitted_writes(db: Session) -> bool:
+        return has_uncommitted_writes(db)
+
+    def publish(
+        self,
+        db: Optional[Session],
+        store_id: str,
+        event_type: str,
+        data: dict = None,
+        franchise_id: str = None,
+        target_role: str = None
+    ) -> None:
+        """
+        SSE 이벤트 등록 (sse_manager.broadcast와 동일한 인자)
+        - db에 커밋되지 않은 변경이 있으면 커밋 후 전송, 롤백 시 폐기
+        """
+        item = OutboxEvent(
+            store_id=store_id,
+            event_type=event_type,
+            data=data,
+            franchise_id=franchise_id,
+            target_role=target_role
+        )
+        if db is not None and self._has_uncommitted_writes(db):
+            db.info.setdefault(OUTBOX_KEY, []).append(item)
+        else:
+            self._enqueue([item])
+
+
+sse_outbox = SSEOutbox()
+
+
+# --- 세션 이벤트 (트랜잭션 경계 추적) ---
+@event.listens_for(SessionLocal, "after_flush")
+def _mark_flush(session, flush_context):
+    session.info[WRITES_KEY] = True
+
+
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _mark_bulk_write(orm_execute_state):
+    if orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert:
+        orm_execute_state.session.info[WRITES_KEY] = True
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _dispatch_after_commit(session):
+    session.info.pop(WRITES_KEY, None)
+    items = session.info.pop(OUTBOX_KEY, None)
+    if items:
+        sse_outbox._enqueue(items)
+
+
+@event.listens_for(SessionLocal, "after_transaction_end")
+def _discard_uncommitted(session, transaction):
+    # 커밋 시에는 after_commit에서 이미 비워지므로 남아 있으면 롤백/세션 종료
+    if transaction.parent is not None:
+        return
+    session.info.pop(WRITES_KEY, None)
+    items = session.info.pop(OUTBOX_KEY, None)
+    if items:
+        logger.info(f"[SSEOutbox] Discarded {len(items)} events of rolled-back transaction")
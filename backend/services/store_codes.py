@@ -0,0 +1,54 @@
+"""
+매장 코드 캐시
+- 공개 엔드포인트(현황판, QR 대기 조회 등)의 매장 코드 → 매장 정보 조회를 메모리에 캐시
+- 매장 코드/이름/활성 상태는 거의 바뀌지 않으므로 TTL만 적용
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models import Store
+
+# 매장 코드 캐시 유지 시간 (초)
+STORE_CODE_TTL = 300
+
+
+@dataclass(frozen=True)
+class StoreRef:
+    id: int
+    name: str
+    is_active: bool
+
+
+class StoreCodeCache:
+    """매장 코드별 매장 정보 캐시"""
+
+    def __init__(self):
+        # store_code: (loaded_at, StoreRef)
+        self._stores: Dict[str, Tuple[float, StoreRef]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, db: Session, store_code: str) -> Optional[StoreRef]:
+        """매장 코드로 매장 조회 (없으면 None)"""
+        now = time.monotonic()
+        entry = self._stores.get(store_code)
+        if entry and now - entry[0] < STORE_CODE_TTL:
+            return entry[1]
+        row = db.query(Store.id, Store.name, Store.is_active).filter(Store.code == store_code).first()
+        if row is None:
+            return None
+        store = StoreRef(id=row.id, name=row.name, is_active=bool(row.is_active))
+        with self._lock:
+            self._stores[store_code] = (now, store)
+        return store
+
+    def invalidate(self) -> None:
+        """매장 정보 변경 시 호출"""
+        with self._lock:
+            self._stores.clear()
+
+
+store_codes = StoreCodeCache()
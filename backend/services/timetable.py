@@ -0,0 +1,177 @@
+"""
+일별 시간표(운영 클래스) 리졸버
+- 매장의 활성 클래스를 한 번 조회하여 요일 스케줄을 비트마스크로 미리 변환
+- (매장, 날짜) 단위로 공휴일 여부를 반영한 운영 클래스 목록을 캐시
+- 클래스 변경(class_management, 설정 복제) 및 공휴일 변경 시 무효화
+"""
+import json
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from datetime import time as dt_time
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from models import ClassInfo, Holiday
+
+# 요일 매핑
+WEEKDAY_MAP = {
+    0: "mon", 1: "tue", 2: "wed", 3: "thu",
+    4: "fri", 5: "sat", 6: "sun"
+}
+
+DEFAULT_WEEKDAY_SCHEDULE = {
+    "mon": True, "tue": True, "wed": True, "thu": True,
+    "fri": True, "sat": True, "sun": True
+}
+
+# 다중 워커 환경에서 다른 프로세스의 변경을 반영하기 위한 최대 보관 시간 (초)
+TIMETABLE_TTL = 300
+# 매장별로 보관할 날짜 수
+MAX_DATES_PER_STORE = 7
+
+
+def parse_weekday_schedule(schedule_str: str) -> Dict[str, bool]:
+    """JSON 문자열을 weekday_schedule 딕셔너리로 안전하게 변환"""
+    if not schedule_str:
+        return DEFAULT_WEEKDAY_SCHEDULE.copy()
+
+    try:
+        schedule = json.loads(schedule_str)
+        if not isinstance(schedule, dict):
+            return DEFAULT_WEEKDAY_SCHEDULE.copy()
+        return schedule
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return DEFAULT_WEEKDAY_SCHEDULE.copy()
+
+
+def weekday_mask(schedule_str: str) -> int:
+    """weekday_schedule JSON을 요일 비트마스크로 변환 (bit 0 = 월요일, 누락된 요일은 운영으로 간주)"""
+    schedule = parse_weekday_schedule(schedule_str)
+    mask = 0
+    for idx, key in WEEKDAY_MAP.items():
+        if schedule.get(key, True):
+            mask |= 1 << idx
+    return mask
+
+
+@dataclass(frozen=True)
+class CompiledClass:
+    """캐시용 클래스 스냅샷 (ClassInfo와 동일한 속성으로 읽기 전용 접근)"""
+    id: int
+    store_id: int
+    class_number: int
+    class_name: str
+    start_time: dt_time
+    end_time: dt_time
+    max_capacity: int
+    is_active: bool
+    weekday_schedule: str
+    class_type: str
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+    weekday_mask: int
+
+    @classmethod
+    def from_model(cls, c: ClassInfo) -> "CompiledClass":
+        return cls(
+            id=c.id,
+            store_id=c.store_id,
+            class_number=c.class_number,
+            class_name=c.class_name,
+            start_time=c.start_time,
+            end_time=c.end_time,
+            max_capacity=c.max_capacity,
+            is_active=c.is_active,
+            weekday_schedule=c.weekday_schedule,
+            class_type=c.class_type or 'all',
+            created_at=c.created_at,
+            updated_at=c.updated_at,
+            weekday_mask=weekday_mask(c.weekday_schedule)
+        )
+
+    def runs_on(self, target_date: date, is_holiday: bool) -> bool:
+        """
+        해당 날짜 운영 여부
+        - 공휴일: holiday 타입만 운영
+        - 평일/주말: holiday 타입 제외, class_type(weekday/weekend) 및 요일 스케줄 적용
+        """
+        if is_holiday:
+            return self.class_type == 'holiday'
+        if self.class_type == 'holiday':
+            return False
+
+        weekday_idx = target_date.weekday()
+        is_weekend = weekday_idx >= 5  # 5: Sat, 6: Sun
+        if self.class_type == 'weekday' and is_weekend:
+            return False
+        if self.class_type == 'weekend' and not is_weekend:
+            return False
+        return bool(self.weekday_mask & (1 << weekday_idx))
+
+
+class TimetableResolver:
+    """(매장, 날짜)별 운영 클래스 목록 캐시"""
+
+    def __init__(self):
+        # store_id: (loaded_at, [CompiledClass]) - class_number 순 활성 클래스
+        self._classes: Dict[int, Tuple[float, List[CompiledClass]]] = {}
+        # store_id: {date: (loaded_at, is_holiday, [CompiledClass])}
+        self._timetables: Dict[int, Dict[date, Tuple[float, bool, List[CompiledClass]]]] = {}
+        self._lock = threading.Lock()
+
+    def _active_classes(self, db: Session, store_id: int, now: float) -> List[CompiledClass]:
+        entry = self._classes.get(store_id)
+        if entry and now - entry[0] < TIMETABLE_TTL:
+            return entry[1]
+
+        classes = [
+            CompiledClass.from_model(c)
+            for c in db.query(ClassInfo).filter(
+                ClassInfo.is_active == True,
+                ClassInfo.store_id == store_id
+            ).order_by(ClassInfo.class_number).all()
+        ]
+        with self._lock:
+            self._classes[store_id] = (now, classes)
+        return classes
+
+    def get_classes(self, db: Session, store_id: int, target_date: date) -> List[CompiledClass]:
+        """해당 날짜에 운영되는 클래스 목록 (class_number 순)"""
+        now = time.monotonic()
+        store_entries = self._timetables.get(store_id, {})
+        entry = store_entries.get(target_date)
+        if entry and now - entry[0] < TIMETABLE_TTL:
+            return entry[2]
+
+        classes = self._active_classes(db, store_id, now)
+        is_holiday = db.query(Holiday.id).filter(
+            Holiday.store_id == store_id,
+            Holiday.date == target_date
+        ).first() is not None
+
+        timetable = [c for c in classes if c.runs_on(target_date, is_holiday)]
+
+        with self._lock:
+            store_entries = self._timetables.setdefault(store_id, {})
+            store_entries[target_date] = (now, is_holiday, timetable)
+            if len(store_entries) > MAX_DATES_PER_STORE:
+                for old_date in sorted(store_entries)[:-MAX_DATES_PER_STORE]:
+                    del store_entries[old_date]
+        return timetable
+
+    def invalidate_classes(self, store_id: int) -> None:
+        """클래스 추가/수정/삭제 시 호출"""
+        with self._lock:
+            self._classes.pop(store_id, None)
+            self._timetables.pop(store_id, None)
+
+    def invalidate_holidays(self, store_id: int) -> None:
+        """공휴일 추가/삭제 시 호출"""
+        with self._lock:
+            self._timetables.pop(store_id, None)
+
+
+timetable_resolver = TimetableResolver()
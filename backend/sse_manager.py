@@ -2,11 +2,12 @@ from typing import Dict, Set, Optional, List
 import asyncio
 from fastapi import Request
 from starlette.responses import StreamingResponse
-import json
 from dataclasses import dataclass, field
 from datetime import datetime
 import uuid
 
+from services.fast_json import sse_frame
+
 @dataclass
 class ConnectionInfo:
     queue: asyncio.Queue
@@ -329,7 +330,7 @@ async def event_generator(queue: asyncio.Queue, store_id: str = None, connection
         # 연결 확인용 초기 메시지 (정상 연결일 때만)
         if connection_id:
             initial_message = {"event": "connected", "data": {}}
-            yield f"data: {json.dumps(initial_message)}\n\n"
+            yield sse_frame(initial_message)
 
         while True:
             try:
@@ -342,7 +343,7 @@ async def event_generator(queue: asyncio.Queue, store_id: str = None, connection
                 # 강제 종료 / 접속 거부 시그널 처리
                 if event_type in ["force_disconnect", "connection_rejected"]:
                     payload = {"event": event_type, "data": data}
-                    yield f"data: {json.dumps(payload)}\n\n"
+                    yield sse_frame(payload)
                     # 스트림 종료 (서버 측 연결 끊기)
                     break
 
@@ -350,11 +351,11 @@ async def event_generator(queue: asyncio.Queue, store_id: str = None, connection
                 if "store_id" in message:
                     payload["store_id"] = message["store_id"]
                 
-                yield f"data: {json.dumps(payload)}\n\n"
+                yield sse_frame(payload)
                 
             except asyncio.TimeoutError:
                 ping_message = {"event": "ping", "data": {"timestamp": asyncio.get_event_loop().time()}}
-                yield f"data: {json.dumps(ping_message)}\n\n"
+                yield sse_frame(ping_message)
 
     except asyncio.CancelledError:
         # 클라이언트 연결 종료 시 정리
@@ -107,7 +107,8 @@ function handleSSEMessage(message) {
             break;
 
         case 'batch_attendance':
-            // 일괄 출석 처리 시: 해당 탭이 활성화되어 있으면 업데이트
+        case 'queue_changed':
+            // 일괄 출석 처리, 병합된 대기열 변경 시: 해당 탭이 활성화되어 있으면 업데이트
             console.log('일괄 출석 처리 이벤트');
             if (currentTab === 'waiting_status') {
                 loadWaitingStatus();
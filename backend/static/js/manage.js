@@ -7,6 +7,28 @@ function getHeaders() {
     return headers;
 }
 
+// 대기열 변경 요청 Idempotency-Key (재시도 시 서버가 첫 응답을 재생)
+function newIdempotencyKey() {
+    if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+        return window.crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+}
+
+// 응답을 받기 전까지 같은 동작(대기자 + 처리 내용)은 같은 키 재사용 (재클릭/재시도 중복 방지)
+const pendingActionKeys = new Map();
+// 서버가 아직 첫 요청을 처리 중이거나 일시적으로 거절한 응답 - 다음 재시도도 같은 키 사용
+const RETRYABLE_STATUSES = new Set([408, 409, 425, 429, 503]);
+
+function actionKey(action) {
+    if (!pendingActionKeys.has(action)) pendingActionKeys.set(action, newIdempotencyKey());
+    return pendingActionKeys.get(action);
+}
+
+function settleActionKey(action, response) {
+    if (!RETRYABLE_STATUSES.has(response.status)) pendingActionKeys.delete(action);
+}
+
 // Variables
 let classes = [];
 let currentClassId = null;
@@ -292,6 +314,11 @@ function handleSSEMessage(message) {
             updateWaitingOrder();
             debouncedUpdateClassCounts();
             break;
+        case 'queue_changed':
+            updateWaitingOrder();
+            debouncedUpdateClassCounts();
+            debouncedLoadBatchInfo();
+            break;
         case 'member_updated':
             if (currentClassId) selectClass(currentClassId);
             break;
@@ -604,10 +631,12 @@ async function updateStatus(waitingId, status) {
     showConfirmModal(statusText, `${statusText} 처리하시겠습니까?`, async function () {
         const item = document.querySelector(`[data-waiting-id="${waitingId}"]`);
         if (item) item.classList.add('updating');
+        const action = `status:${waitingId}:${status}`;
         try {
             const response = await fetch(`/api/board/${waitingId}/status`, {
-                method: 'PUT', headers: getHeaders({ 'Content-Type': 'application/json' }), body: JSON.stringify({ status: status })
+                method: 'PUT', headers: { ...getHeaders(), 'Idempotency-Key': actionKey(action) }, body: JSON.stringify({ status: status })
             });
+            settleActionKey(action, response);
             if (response.ok) console.log(`${statusText} 처리 완료`);
             else {
                 const error = await response.json();
@@ -621,8 +650,10 @@ async function callWaiting(waitingId) {
     showConfirmModal('호출', '호출하시겠습니까?', async function () {
         const item = document.querySelector(`[data-waiting-id="${waitingId}"]`);
         if (item) { item.classList.add('highlight'); setTimeout(() => item.classList.remove('highlight'), 1500); }
+        const action = `call:${waitingId}`;
         try {
-            const response = await fetch(`/api/board/${waitingId}/call`, { method: 'POST', headers: getHeaders() });
+            const response = await fetch(`/api/board/${waitingId}/call`, { method: 'POST', headers: { ...getHeaders(), 'Idempotency-Key': actionKey(action) } });
+            settleActionKey(action, response);
             if (response.ok) console.log('호출 완료');
             else { const error = await response.json(); showNotificationModal('오류', error.detail || '호출 실패'); }
         } catch (error) { console.error('호출 실패:', error); }
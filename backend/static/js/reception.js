@@ -192,6 +192,23 @@ async function updateDate() {
 
 let isRegistrationClosed = false; // 접수 마감 상태 추적
 
+// 응답을 받지 못한 접수 재시도 시 같은 Idempotency-Key 재사용 (중복 접수 방지)
+let pendingRegistration = null; // { body, key }
+
+function newIdempotencyKey() {
+    if (window.crypto && typeof window.crypto.randomUUID === 'function') {
+        return window.crypto.randomUUID();
+    }
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+}
+
+function registrationKey(body) {
+    if (!pendingRegistration || pendingRegistration.body !== body) {
+        pendingRegistration = { body, key: newIdempotencyKey() };
+    }
+    return pendingRegistration.key;
+}
+
 // 오디오 컨텍스트 초기화 (Web Audio API)
 let audioContext = null;
 let speechSynthesisReady = false;
@@ -471,13 +488,17 @@ async function submitReception() {
     submitBtn.textContent = '접수 중...';
 
     try {
+        const body = JSON.stringify(payload);
         const response = await fetch('/api/waiting/register', {
             method: 'POST',
             headers: getHeaders({
-                'Content-Type': 'application/json'
+                'Content-Type': 'application/json',
+                'Idempotency-Key': registrationKey(body)
             }),
-            body: JSON.stringify(payload)
+            body
         });
+        // 응답을 받았으면 재시도 대상 아님
+        pendingRegistration = null;
 
         if (response.ok) {
             const result = await response.json();
@@ -798,6 +819,10 @@ async function init() {
                             console.log('[SSE] 📥 status_change event detected');
                             debouncedLoadWaitingStatus();
                         }
+                        else if (data.event === 'queue_changed') {
+                            console.log('[SSE] 📥 queue_changed event detected');
+                            debouncedLoadWaitingStatus();
+                        }
                         else if (data.event === 'class_closed' || data.event === 'class_reopened') {
                             console.log('[SSE] 📥 class status changed');
                             debouncedLoadWaitingStatus();
@@ -165,6 +165,11 @@ function handleSSEMessage(message) {
             break;
 
 
+        case 'queue_changed':
+            // 병합된 대기열 변경 이벤트 - 전체 다시 로드
+            debouncedLoadWaitingBoard();
+            break;
+
         case 'class_closed':
             // 교시 마감 - 전체 다시 로드 (마감된 교시 숨김 처리)
             console.log('교시 마감:', message.data);
@@ -0,0 +1,97 @@
+"""
+테스트 공통 설정
+- 임시 SQLite DB를 사용하도록 DATABASE_URL을 모듈 import 전에 지정
+- 실행: cd backend && python -m pytest -q tests
+"""
+import os
+import sys
+import tempfile
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+os.chdir(BACKEND_DIR)
+
+_db_dir = tempfile.mkdtemp(prefix="waiting-test-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ.setdefault("LOAD_SHEDDING_ENABLED", "false")
+
+import pytest  # noqa: E402
+
+from database import Base, SessionLocal, engine  # noqa: E402
+import models  # noqa: E402
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _create_tables():
+    Base.metadata.create_all(bind=engine)
+    yield
+
+
+@pytest.fixture(autouse=True)
+def _reset_event_loop_state():
+    """asyncio.run()마다 새 이벤트 루프 - 이전 테스트의 닫힌 루프를 SSE 아웃박스/데이터 버전이 쓰지 않도록 초기화"""
+    yield
+    from services.data_version import data_versions
+    from services.sse_outbox import sse_outbox
+    sse_outbox._task = sse_outbox._loop = sse_outbox._queue = None
+    sse_outbox._pending.clear()
+    data_versions._loop = None
+    data_versions._waiters.clear()
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+@pytest.fixture
+def store(db):
+    """테스트 매장 (테스트마다 새 매장)"""
+    franchise = models.Franchise(name="F", code=f"F{os.urandom(4).hex()}")
+    db.add(franchise)
+    db.flush()
+    store = models.Store(franchise_id=franchise.id, name="S", code=f"S{os.urandom(4).hex()}")
+    db.add(store)
+    db.commit()
+    return store
+
+
+@pytest.fixture
+def class_info(db, store):
+    """테스트 매장의 교시"""
+    from datetime import time
+    cls = models.ClassInfo(store_id=store.id, class_number=1, class_name="1교시",
+                           start_time=time(10, 0), end_time=time(11, 0), max_capacity=20)
+    db.add(cls)
+    db.commit()
+    return cls
+
+
+@pytest.fixture
+def make_waiting(db, store, class_info):
+    """대기자 생성 함수 (business_date, waiting_number, status 등 지정)"""
+    def make(business_date, waiting_number, status="waiting", phone=None, **fields):
+        waiting = models.WaitingList(
+            store_id=store.id, business_date=business_date, waiting_number=waiting_number,
+            phone=phone or f"010{os.urandom(4).hex()}", class_id=class_info.id,
+            class_order=waiting_number, status=status, **fields
+        )
+        db.add(waiting)
+        db.commit()
+        return waiting
+    return make
+
+
+@pytest.fixture
+def make_settings(db, store):
+    """매장 설정 생성 함수"""
+    def make(**fields):
+        settings = models.StoreSettings(store_id=store.id, store_name=store.name, **fields)
+        db.add(settings)
+        db.commit()
+        return settings
+    return make
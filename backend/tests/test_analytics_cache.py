@@ -0,0 +1,54 @@
+"""분석 캐시 - 워커 간 공유 세대로 무효화, 마감 기간도 TTL 적용, 복사본 반환"""
+from datetime import date
+
+from services.analytics_cache import AnalyticsCache
+
+START, END = date(2024, 1, 1), date(2024, 1, 31)
+
+
+def _key(cache, db, store):
+    generation = cache.generation(db, store_ids=(store.id,))
+    return cache.make_key("attendance_ranking", (store.franchise_id, (store.id,), generation), START, END)
+
+
+def test_invalidate_store_reaches_other_worker(db, store):
+    worker, other_worker = AnalyticsCache(), AnalyticsCache()
+    worker.set(_key(worker, db, store), [{"name": "홍길동"}], immutable=True)
+    assert worker.get(_key(worker, db, store)) == [{"name": "홍길동"}]
+
+    # 다른 워커에서 회원 수정 트랜잭션이 커밋됨
+    store.name = store.name + "!"
+    other_worker.invalidate_store(db, store.id, "member updated")
+    db.commit()
+
+    assert worker.get(_key(worker, db, store)) is None
+
+
+def test_rolled_back_invalidation_keeps_entries(db, store):
+    cache = AnalyticsCache()
+    cache.set(_key(cache, db, store), [1], immutable=True)
+
+    cache.invalidate_store(db, store.id, "rolled back")
+    db.rollback()
+
+    assert cache.get(_key(cache, db, store)) == [1]
+
+
+def test_closed_range_entries_expire(db, store):
+    cache = AnalyticsCache(closed_ttl=0)
+    key = _key(cache, db, store)
+    cache.set(key, [1], immutable=True)
+    assert cache.get(key) is None
+
+
+def test_returns_copies(db, store):
+    cache = AnalyticsCache()
+    key = _key(cache, db, store)
+    result = [{"name": "홍길동", "count": 3}]
+    cache.set(key, result, immutable=False)
+    result[0]["count"] = 99
+
+    cached = cache.get(key)
+    assert cached == [{"name": "홍길동", "count": 3}]
+    cached.append({"name": "other"})
+    assert cache.get(key) == [{"name": "홍길동", "count": 3}]
@@ -0,0 +1,50 @@
+"""Parquet 내보내기 워터마크 - DB에 분석 세대와 함께 저장, 다른 워커의 무효화 즉시 반영"""
+from datetime import date
+
+import pytest
+
+from services import analytics_store as analytics_store_module
+from services.analytics_cache import analytics_cache
+from services.analytics_store import AnalyticsStore
+
+EXPORTED = date(2024, 1, 31)
+
+
+@pytest.fixture
+def exporter(monkeypatch, tmp_path):
+    # 워터마크 판정만 확인 (Parquet 읽기/쓰기 없음)
+    monkeypatch.setattr(analytics_store_module, "duckdb", object())
+    return AnalyticsStore(base_dir=str(tmp_path))
+
+
+def test_watermark_covers_until_invalidated(db, store, exporter):
+    assert not exporter.covers(db, [store.id], EXPORTED)
+
+    assert exporter._save_watermark(db, store.id, None, EXPORTED)
+    assert exporter.covers(db, [store.id], EXPORTED)
+    assert not exporter.covers(db, [store.id], date(2024, 2, 1))
+
+    # 다른 워커에서 재개점 - 같은 트랜잭션에서 세대 증가
+    store.name = store.name + "!"
+    analytics_cache.invalidate_store(db, store.id, "reopen")
+    db.commit()
+
+    assert not exporter.covers(db, [store.id], EXPORTED)
+
+
+def test_invalidation_during_export_discards_watermark(db, store, exporter):
+    store.name = store.name + "!"
+    analytics_cache.invalidate_store(db, store.id, "reopen")
+    db.commit()
+    generation = analytics_cache.generation(db, store_ids=[store.id])
+
+    # 내보내는 동안 무효화됨
+    store.name = store.name + "!"
+    analytics_cache.invalidate_store(db, store.id, "admin reset")
+    db.commit()
+
+    assert not exporter._save_watermark(db, store.id, generation, EXPORTED)
+    assert not exporter.covers(db, [store.id], EXPORTED)
+
+    assert exporter._save_watermark(db, store.id, generation + 1, EXPORTED)
+    assert exporter.covers(db, [store.id], EXPORTED)
@@ -0,0 +1,68 @@
+"""개점 시 지난 영업일 대기자 처리 - 이월 번호 재발급, 자동 마감 집계"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import models
+from routers.daily_closing import open_business_day
+
+TODAY = date(2024, 6, 2)
+YESTERDAY = TODAY - timedelta(days=1)
+
+
+def _closing(db, store, business_date, **fields):
+    closing = models.DailyClosing(store_id=store.id, business_date=business_date,
+                                  opening_time=datetime.now(), is_closed=False, **fields)
+    db.add(closing)
+    db.commit()
+    return closing
+
+
+def _rows(db, store, business_date):
+    db.expire_all()
+    return db.query(models.WaitingList).filter(
+        models.WaitingList.store_id == store.id,
+        models.WaitingList.business_date == business_date
+    ).order_by(models.WaitingList.waiting_number).all()
+
+
+def test_carry_over_numbers_after_existing_target_rows(db, store, make_waiting, make_settings):
+    make_settings(auto_closing=False)
+    _closing(db, store, YESTERDAY)
+    # 개점일에 이미 등록된 대기 (처리된 건 포함)
+    existing = [make_waiting(TODAY, 1), make_waiting(TODAY, 2, status="attended")]
+    # 지난 영업일 미처리 대기 - 번호 순서와 등록 순서가 다름
+    later = make_waiting(YESTERDAY, 5)
+    earlier = make_waiting(YESTERDAY, 2)
+    cancelled = make_waiting(YESTERDAY, 3, status="cancelled")
+
+    business = open_business_day(db, store.id, TODAY)
+
+    rows = _rows(db, store, TODAY)
+    assert [w.id for w in rows] == [w.id for w in existing] + [earlier.id, later.id]
+    assert [w.waiting_number for w in rows] == [1, 2, 3, 4]
+    assert [w.id for w in _rows(db, store, YESTERDAY)] == [cancelled.id]
+    assert business.total_waiting == 4
+    assert business.total_attended == 1
+
+
+@pytest.mark.parametrize("closing_action, attended, cancelled", [
+    ("attended", 3, 1),
+    ("reset", 1, 3),
+])
+def test_auto_close_updates_previous_day_counts(db, store, make_waiting, make_settings,
+                                                closing_action, attended, cancelled):
+    make_settings(auto_closing=True, closing_action=closing_action)
+    previous = _closing(db, store, YESTERDAY, total_waiting=0, total_attended=0, total_cancelled=0)
+    make_waiting(YESTERDAY, 1)
+    make_waiting(YESTERDAY, 2)
+    make_waiting(YESTERDAY, 3, status="attended")
+    make_waiting(YESTERDAY, 4, status="cancelled")
+
+    business = open_business_day(db, store.id, TODAY)
+
+    assert all(w.status != "waiting" for w in _rows(db, store, YESTERDAY))
+    db.refresh(previous)
+    assert (previous.total_waiting, previous.total_attended, previous.total_cancelled) == (4, attended, cancelled)
+    assert _rows(db, store, TODAY) == []
+    assert business.total_waiting == 0
@@ -0,0 +1,66 @@
+"""영업일 카운터 - 동시 상태 변경/호출은 실제로 행을 바꾼 요청만 집계"""
+from datetime import date, datetime
+
+import pytest
+
+import models
+from database import SessionLocal
+from services.daily_counters import claim_status_change, record_call
+
+TODAY = date(2024, 5, 1)
+
+
+@pytest.fixture
+def business_day(db, store):
+    closing = models.DailyClosing(store_id=store.id, business_date=TODAY, is_closed=False,
+                                  total_waiting=1, total_attended=0, total_cancelled=0,
+                                  total_called=0, total_no_show=0)
+    db.add(closing)
+    db.commit()
+    return closing
+
+
+@pytest.fixture
+def other_db():
+    """동시에 처리 중인 다른 요청의 세션"""
+    session = SessionLocal()
+    yield session
+    session.close()
+
+
+def _counters(db, closing):
+    db.expire_all()
+    return db.get(models.DailyClosing, closing.id)
+
+
+def test_concurrent_status_change_counted_once(db, other_db, business_day, make_waiting):
+    waiting = make_waiting(TODAY, 1)
+    # 두 요청 모두 상태 확인을 통과한 뒤
+    mine = db.get(models.WaitingList, waiting.id)
+    theirs = other_db.get(models.WaitingList, waiting.id)
+    assert mine.status == theirs.status == "waiting"
+
+    assert claim_status_change(other_db, theirs, "attended", attended_at=datetime.now())
+    other_db.commit()
+    assert not claim_status_change(db, mine, "cancelled", cancelled_at=datetime.now())
+    db.commit()
+
+    closing = _counters(db, business_day)
+    assert (closing.total_attended, closing.total_cancelled) == (1, 0)
+    assert db.get(models.WaitingList, waiting.id).status == "attended"
+
+
+def test_concurrent_first_call_counted_once(db, other_db, business_day, make_waiting):
+    waiting = make_waiting(TODAY, 1)
+    mine = db.get(models.WaitingList, waiting.id)
+    theirs = other_db.get(models.WaitingList, waiting.id)
+    assert not mine.call_count and not theirs.call_count
+
+    record_call(other_db, theirs, datetime.now())
+    other_db.commit()
+    record_call(db, mine, datetime.now())
+    db.commit()
+
+    closing = _counters(db, business_day)
+    assert closing.total_called == 1
+    assert db.get(models.WaitingList, waiting.id).call_count == 2
@@ -0,0 +1,134 @@
+"""매장 데이터 버전 - 변경이 있을 때만 증가, 워커 간 공유"""
+import asyncio
+
+import pytest
+
+from services import data_version
+from services.data_version import DataVersions, data_versions
+from services.sse_outbox import OutboxEvent, sse_outbox
+
+
+@pytest.fixture(autouse=True)
+def _always_refresh(monkeypatch):
+    # 매 조회마다 DB의 공유 버전을 다시 읽도록 (캐시 만료 상황)
+    monkeypatch.setattr(data_version, "DATA_VERSION_REFRESH", 0)
+
+
+def _mutate(db, store, class_id=None):
+    """대기열 변경 + SSE 이벤트 등록 후 커밋"""
+    store.name = store.name + "!"
+    sse_outbox.publish(db, str(store.id), "status_changed", {"class_id": class_id, "waiting_id": 1})
+    db.commit()
+
+
+def test_idle_store_keeps_etag(store):
+    first = data_versions.etag(store.id)
+    for _ in range(5):
+        assert data_versions.etag(store.id) == first
+
+
+def test_mutation_changes_etag(db, store):
+    before = data_versions.current(store.id)
+    etag = data_versions.etag(store.id)
+
+    _mutate(db, store, class_id=7)
+
+    assert data_versions.current(store.id) == before + 1
+    assert data_versions.etag(store.id) != etag
+    assert data_versions.changed_classes(store.id, before) == [7]
+
+
+def test_rollback_does_not_bump(db, store):
+    before = data_versions.current(store.id)
+    store.name = "rolled back"
+    sse_outbox.publish(db, str(store.id), "status_changed", {"class_id": 1})
+    db.rollback()
+    assert data_versions.current(store.id) == before
+
+
+def test_explicit_bump(store):
+    before = data_versions.current(store.id)
+    data_versions.bump(store.id)
+    assert data_versions.current(store.id) == before + 1
+    assert data_versions.changed_classes(store.id, before) is None
+
+
+def test_several_events_one_transaction_bump_once(db, store):
+    before = data_versions.current(store.id)
+    store.name = store.name + "!"
+    for role in ("admin", "board", "reception"):
+        sse_outbox.publish(db, str(store.id), "status_changed", {"class_id": 4}, target_role=role)
+    db.commit()
+    assert data_versions._load(store.id) == before + 1
+
+
+def test_mark_bumps_in_commit_transaction(db, store):
+    before = data_versions.current(store.id)
+    store.name = store.name + "?"
+    data_versions.mark(db, store.id)
+    assert data_versions._load(store.id) == before
+    db.commit()
+    assert data_versions._load(store.id) == before + 1
+    assert data_versions.current(store.id) == before + 1
+
+    store.name = "rolled back"
+    data_versions.mark(db, store.id)
+    db.rollback()
+    db.commit()
+    assert data_versions._load(store.id) == before + 1
+
+
+def test_events_after_commit_bump_once_off_loop(store):
+    before = data_versions.current(store.id)
+    items = [OutboxEvent(store_id=str(store.id), event_type="status_changed", data={"class_id": 1})]
+
+    async def scenario():
+        for _ in range(3):
+            data_versions._on_events(str(store.id), items)
+        # 이벤트 루프에서는 DB 쓰기를 하지 않음
+        assert data_versions._load(store.id) == before
+        for _ in range(50):
+            await asyncio.sleep(0.02)
+            if data_versions._load(store.id) != before:
+                break
+
+    asyncio.run(scenario())
+    assert data_versions._load(store.id) == before + 1
+
+
+def test_version_shared_between_workers(db, store):
+    other_worker = DataVersions()
+    assert other_worker.current(store.id) == data_versions.current(store.id)
+
+    _mutate(db, store, class_id=3)
+
+    assert other_worker.current(store.id) == data_versions.current(store.id)
+    # 다른 워커는 변경 교시를 모르므로 전체 갱신
+    assert other_worker.changed_classes(store.id, data_versions.current(store.id) - 1) is None
+
+
+def test_long_poll_times_out_without_change(store):
+    since = data_versions.current(store.id)
+    version = asyncio.run(data_versions.wait_for_change(store.id, since, timeout=0.3))
+    assert version == since
+
+
+def test_long_poll_sees_other_worker_change(db, store):
+    other_worker = DataVersions()
+    since = other_worker.current(store.id)
+
+    async def scenario():
+        waiting = asyncio.create_task(other_worker.wait_for_change(store.id, since, timeout=5))
+        await asyncio.sleep(0.05)
+        await asyncio.to_thread(_mutate, db, store, 2)
+        return await waiting
+
+    assert asyncio.run(scenario()) == since + 1
+
+
+def test_long_poll_endpoint_reports_no_change(store):
+    from routers.polling import wait_for_change
+
+    since = data_versions.current(store.id)
+    result = asyncio.run(wait_for_change(store.id, since=since, timeout=1))
+    assert result == {"version": since, "changed": False, "class_ids": []}
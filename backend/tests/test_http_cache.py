@@ -0,0 +1,77 @@
+"""정적 파일 캐시 헤더 - 버전 URL 장기 캐시, 버전 없는 파일 짧은 max-age, 해시는 스레드에서 계산"""
+import asyncio
+import threading
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from core import http_cache
+from core.http_cache import IMMUTABLE_CACHE_CONTROL, STATIC_CACHE_CONTROL, HashedStaticFiles
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / "app.js").write_text("console.log('hi');")
+    return tmp_path
+
+
+def _get(static_dir, url, headers=None):
+    app = FastAPI()
+    app.mount("/static", HashedStaticFiles(directory=str(static_dir)), name="static")
+
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.get(url, headers=headers or {})
+    return asyncio.run(send())
+
+
+def test_unversioned_file_gets_short_max_age(static_dir):
+    response = _get(static_dir, "/static/app.js")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == STATIC_CACHE_CONTROL
+
+    cached = _get(static_dir, "/static/app.js", {"If-None-Match": response.headers["etag"]})
+    assert cached.status_code == 304
+
+
+def test_versioned_url_is_immutable(static_dir):
+    digest = http_cache.file_hash(str(static_dir / "app.js"))
+    response = _get(static_dir, f"/static/app.js?v={digest[:http_cache.VERSION_LENGTH]}")
+    assert response.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+    stale = _get(static_dir, "/static/app.js?v=000000000000")
+    assert stale.headers["cache-control"] == STATIC_CACHE_CONTROL
+
+
+def test_hash_computed_off_event_loop(static_dir, monkeypatch):
+    threads = []
+    original = http_cache.file_hash
+
+    def spy(path, stat_result=None):
+        if path not in http_cache._hashes:
+            threads.append(threading.current_thread())
+        return original(path, stat_result)
+
+    monkeypatch.setattr(http_cache, "file_hash", spy)
+    (static_dir / "new.js").write_text("1")
+    assert _get(static_dir, "/static/new.js").status_code == 200
+    assert threads and all(thread is not threading.main_thread() for thread in threads)
+
+
+def test_static_url_is_served_immutable(static_dir, monkeypatch):
+    monkeypatch.setattr(http_cache, "STATIC_DIR", str(static_dir))
+    url = http_cache.static_url("app.js")
+    assert url.startswith("/static/app.js?v=")
+    assert _get(static_dir, url).headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+    assert http_cache.static_url("missing.js") == "/static/missing.js"
+
+
+def test_templates_use_content_hash_versions():
+    from main import templates
+
+    html = templates.env.get_template("index.html").render()
+    expected = http_cache.static_url("js/index.js")
+    assert f'src="{expected}"' in html
+    assert "?v=4" not in html
@@ -0,0 +1,92 @@
+"""Idempotency-Key 미들웨어 - 재생, 처리 중 재시도 대기, 다른 본문 422"""
+import asyncio
+import os
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from core.idempotency import IdempotencyMiddleware
+
+
+@pytest.fixture
+def app():
+    inner = FastAPI()
+    inner.state.calls = 0
+
+    @inner.put("/api/board/{waiting_id}/status")
+    async def update_status(waiting_id: int, body: dict):
+        inner.state.calls += 1
+        await asyncio.sleep(0.1)  # 처리 중 재시도가 도착할 시간
+        return {"waiting_id": waiting_id, "status": body["status"], "call": inner.state.calls}
+
+    wrapped = IdempotencyMiddleware(inner)
+    wrapped.state = inner.state
+    return wrapped
+
+
+def _request(app, key, status="attended", waiting_id=1):
+    async def send():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await client.put(
+                f"/api/board/{waiting_id}/status",
+                json={"status": status},
+                headers={"Idempotency-Key": key, "X-Store-Id": "1"},
+            )
+    return send()
+
+
+def _key():
+    return f"test-{os.urandom(8).hex()}"
+
+
+def test_retry_replays_first_response(app):
+    key = _key()
+
+    async def scenario():
+        first = await _request(app, key)
+        second = await _request(app, key)
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.status_code == second.status_code == 200
+    assert second.json() == first.json()
+    assert second.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert app.state.calls == 1
+
+
+def test_in_flight_retry_waits_for_first(app):
+    key = _key()
+
+    async def scenario():
+        return await asyncio.gather(_request(app, key), _request(app, key))
+
+    first, second = asyncio.run(scenario())
+    assert first.json() == second.json()
+    assert app.state.calls == 1
+    assert [r.headers.get("idempotent-replayed") for r in (first, second)].count("true") == 1
+
+
+def test_same_key_different_body_rejected(app):
+    key = _key()
+
+    async def scenario():
+        first = await _request(app, key, status="attended")
+        second = await _request(app, key, status="cancelled")
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert first.status_code == 200
+    assert second.status_code == 422
+    assert app.state.calls == 1
+
+
+def test_different_keys_execute_separately(app):
+    async def scenario():
+        await _request(app, _key())
+        await _request(app, _key())
+
+    asyncio.run(scenario())
+    assert app.state.calls == 2
@@ -0,0 +1,44 @@
+"""부하 차단 - 리포트/분석 요청 low 분류, 읽기 전용 풀 사용률 반영"""
+from types import SimpleNamespace
+
+import pytest
+
+import database
+from core.load_shedding import CRITICAL, LOW, NORMAL, classify, load_monitor
+
+
+@pytest.mark.parametrize("method, path, priority", [
+    ("GET", "/api/attendance/status", LOW),
+    ("GET", "/api/attendance/ranking", LOW),
+    ("GET", "/api/attendance/individual/3", LOW),
+    ("GET", "/api/system/stats", LOW),
+    ("GET", "/api/system/stats/dashboard", LOW),
+    ("GET", "/api/system/franchises/1/stats", LOW),
+    ("GET", "/api/system/load", NORMAL),
+    ("GET", "/api/system/franchises/1", NORMAL),
+    ("GET", "/api/waiting/list", NORMAL),
+    ("PUT", "/api/board/1/status", CRITICAL),
+])
+def test_classify(method, path, priority):
+    assert classify(method, path) == priority
+
+
+class _Pool:
+    def __init__(self, checked_out, size=5, overflow=5):
+        self._checked_out, self._size, self._max_overflow = checked_out, size, overflow
+
+    def size(self):
+        return self._size
+
+    def checkedout(self):
+        return self._checked_out
+
+
+def test_pool_usage_includes_read_replica(monkeypatch):
+    monkeypatch.setattr(database, "engine", SimpleNamespace(pool=_Pool(1)))
+    monkeypatch.setattr(database, "read_engine", SimpleNamespace(pool=_Pool(9)))
+    assert load_monitor.pool_usage() == pytest.approx(0.9)
+    assert load_monitor.level == "elevated"
+
+    monkeypatch.setattr(database, "read_engine", None)
+    assert load_monitor.pool_usage() == pytest.approx(0.1)
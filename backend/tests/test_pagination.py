@@ -0,0 +1,88 @@
+"""키셋 커서 - 잘못된 커서는 400, NDJSON 스트리밍은 넘겨받은 세션 팩토리 사용"""
+import asyncio
+import base64
+import json
+
+import pytest
+from fastapi import HTTPException
+
+import database
+from core.pagination import decode_cursor, encode_cursor, stream_ndjson
+from database import SessionLocal, session_factory_for
+
+
+def _cursor(values) -> str:
+    return base64.urlsafe_b64encode(json.dumps(values).encode()).decode().rstrip("=")
+
+
+def test_round_trip():
+    from datetime import date, datetime
+    values = [date(2026, 10, 19), datetime(2026, 10, 19, 9, 30), 42]
+    assert decode_cursor(encode_cursor(values), 3) == values
+
+
+@pytest.mark.parametrize("values", [
+    [{"x": 1}, 1],
+    [[1, 2], 1],
+    [{"dt": 5}, 1],
+    [{"d": "not-a-date"}, 1],
+    [1],
+])
+def test_invalid_cursor_rejected(values):
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(_cursor(values), 2)
+    assert exc.value.status_code == 400
+
+
+def test_stream_uses_given_session_factory():
+    opened = []
+
+    def factory():
+        session = SessionLocal()
+        opened.append(session)
+        return session
+
+    def build_query(db):
+        return db.query(database.Base.metadata.tables["store"].c.id)
+
+    response = stream_ndjson(build_query, lambda row: {"id": row.id}, session_factory=factory)
+
+    async def consume():
+        return [chunk async for chunk in response.body_iterator]
+
+    asyncio.run(consume())
+    assert len(opened) == 1
+
+
+def test_session_factory_for_primary_session(db):
+    assert session_factory_for(db) is SessionLocal
+
+
+
+@pytest.mark.parametrize("descending", [False, True])
+def test_nullable_key_pages_every_row_once(db, store, make_waiting, descending):
+    from datetime import date, datetime
+    from models import WaitingList
+    from routers.statistics import WAITING_KEYS, _waiting_row_key, franchise_waiting_query
+    from core.pagination import keyset_page
+
+    day = date(2024, 3, 1)
+    # 기본값(CURRENT_TIMESTAMP) 2건, 직접 지정 2건, NULL 3건
+    rows = [make_waiting(day, n) for n in (1, 2)]
+    rows += [make_waiting(day, n, created_at=datetime(2024, 3, 1, 13 - n, 30, 0, 1)) for n in (3, 4)]
+    nulls = [make_waiting(day, n).id for n in (5, 6, 7)]
+    db.query(WaitingList).filter(WaitingList.id.in_(nulls)).update(
+        {WaitingList.created_at: None}, synchronize_session=False
+    )
+    db.commit()
+    ids = [w.id for w in rows] + nulls
+
+    seen, cursor = [], None
+    for _ in range(len(ids)):
+        query = franchise_waiting_query(db, store.franchise_id, day, day, store.id, None)
+        page, cursor = keyset_page(query, WAITING_KEYS, _waiting_row_key, 2, cursor, descending=descending)
+        seen.extend(r.id for r in page)
+        if not cursor:
+            break
+
+    assert sorted(seen) == sorted(ids)
@@ -0,0 +1,43 @@
+"""요청 제한 - 클라이언트가 보낸 X-Forwarded-For로 클라이언트 버킷을 우회할 수 없음"""
+import asyncio
+import os
+
+import httpx
+from fastapi import Depends, FastAPI
+
+from services.rate_limiter import PROFILES, rate_limit
+
+app = FastAPI()
+
+
+@app.post("/api/public/waiting/{store_code}/register", dependencies=[Depends(rate_limit("register"))])
+async def register(store_code: str):
+    return {"ok": True}
+
+
+def _statuses(count: int, store_code: str, forwarded=None):
+    async def scenario():
+        transport = httpx.ASGITransport(app=app, client=("203.0.113.7", 50000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            statuses = []
+            for i in range(count):
+                headers = {"X-Forwarded-For": forwarded(i)} if forwarded else {}
+                response = await client.post(f"/api/public/waiting/{store_code}/register", headers=headers)
+                statuses.append((response.status_code, response.headers.get("retry-after")))
+            return statuses
+    return asyncio.run(scenario())
+
+
+def test_spoofed_forwarded_for_shares_client_bucket():
+    burst = PROFILES["register"][0].burst
+    statuses = _statuses(burst + 1, f"S{os.urandom(4).hex()}", forwarded=lambda i: f"198.51.100.{i}")
+    assert [status for status, _ in statuses[:burst]] == [200] * burst
+    assert statuses[-1][0] == 429
+
+
+def test_client_limit_returns_retry_after():
+    burst = PROFILES["register"][0].burst
+    statuses = _statuses(burst + 1, f"S{os.urandom(4).hex()}")
+    status, retry_after = statuses[-1]
+    assert status == 429
+    assert int(retry_after) >= 1
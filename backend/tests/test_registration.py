@@ -0,0 +1,94 @@
+"""대기 접수 중복 방지 - 사전 검사를 통과한 동시 중복 접수는 부분 유니크 인덱스로 400"""
+import asyncio
+from datetime import datetime
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+
+import models
+from database import SessionLocal
+from routers import waiting as waiting_router
+from schemas import WaitingListCreate
+from services.business_date import get_current_business_date
+
+PHONE = "01055556666"
+
+
+@pytest.fixture
+def business_date(db, store, class_info, make_settings):
+    make_settings()
+    today = get_current_business_date(db, store.id)
+    db.add(models.DailyClosing(store_id=store.id, business_date=today,
+                               opening_time=datetime.now(), is_closed=False))
+    db.commit()
+    return today
+
+
+def _insert_waiting(store, class_info, today, phone=PHONE):
+    """다른 요청이 먼저 커밋한 같은 번호의 대기"""
+    other = SessionLocal()
+    try:
+        other.add(models.WaitingList(store_id=store.id, business_date=today, waiting_number=99,
+                                     phone=phone, class_id=class_info.id, class_order=1, status="waiting"))
+        other.commit()
+    finally:
+        other.close()
+
+
+def test_index_rejects_duplicate_active_phone(db, store, class_info, business_date):
+    _insert_waiting(store, class_info, business_date)
+    db.add(models.WaitingList(store_id=store.id, business_date=business_date, waiting_number=100,
+                              phone=PHONE, class_id=class_info.id, class_order=2, status="waiting"))
+    with pytest.raises(IntegrityError):
+        db.flush()
+    db.rollback()
+
+
+def test_concurrent_duplicate_register_returns_400(db, store, class_info, business_date, monkeypatch):
+    record_registration = waiting_router.record_registration
+
+    def race(db, store_id, today, *args, **kwargs):
+        # 사전 검사 통과 후 flush 전에 다른 요청의 같은 번호 접수가 커밋됨
+        _insert_waiting(store, class_info, today)
+        return record_registration(db, store_id, today, *args, **kwargs)
+
+    monkeypatch.setattr(waiting_router, "record_registration", race)
+
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(waiting_router.register_waiting(WaitingListCreate(phone=PHONE), db, store))
+    assert exc.value.status_code == 400
+
+    db.expire_all()
+    rows = db.query(models.WaitingList).filter_by(store_id=store.id, phone=PHONE, status="waiting").all()
+    assert len(rows) == 1
+
+
+def test_ensure_indexes_names_duplicate_rows(db, store, class_info, business_date, caplog):
+    from sqlalchemy import inspect, text
+    from core.db_auto_migrator import ensure_indexes
+    from database import engine
+
+    with engine.begin() as conn:
+        conn.execute(text("DROP INDEX uq_waiting_list_active_phone"))
+    try:
+        # 인덱스가 없던 시기에 쌓인 중복 대기
+        _insert_waiting(store, class_info, business_date)
+        _insert_waiting(store, class_info, business_date)
+        ids = sorted(w.id for w in db.query(models.WaitingList).filter_by(store_id=store.id, phone=PHONE))
+
+        with caplog.at_level("WARNING", logger="db_migrator"):
+            ensure_indexes(models.WaitingList)
+
+        names = {index["name"] for index in inspect(engine).get_indexes("waiting_list")}
+        assert "uq_waiting_list_active_phone" not in names
+        warning = next(r.getMessage() for r in caplog.records if r.levelname == "WARNING")
+        assert "uq_waiting_list_active_phone" in warning
+        assert PHONE in warning and str(ids) in warning
+    finally:
+        db.query(models.WaitingList).filter_by(store_id=store.id, phone=PHONE).delete()
+        db.commit()
+        ensure_indexes(models.WaitingList)
+
+    names = {index["name"] for index in inspect(engine).get_indexes("waiting_list")}
+    assert "uq_waiting_list_active_phone" in names
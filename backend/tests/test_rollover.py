@@ -0,0 +1,78 @@
+"""자동 영업일 전환 - 열린 지난 영업일 여러 개 처리, 화면 갱신 이벤트"""
+from datetime import date, datetime, timedelta
+
+import models
+from services import rollover_scheduler as rollover_module
+from services.rollover_scheduler import RolloverScheduler
+
+TODAY = date(2026, 10, 19)
+
+
+def _open_day(db, store, business_date):
+    db.add(models.DailyClosing(store_id=store.id, business_date=business_date,
+                               opening_time=datetime.now(), is_closed=False))
+    db.commit()
+
+
+def _waitings(db, store, business_date, status="waiting"):
+    db.expire_all()
+    return db.query(models.WaitingList).filter(
+        models.WaitingList.store_id == store.id,
+        models.WaitingList.business_date == business_date,
+        models.WaitingList.status == status
+    ).order_by(models.WaitingList.waiting_number).all()
+
+
+def test_carries_every_stale_day_in_order(db, store, make_waiting, make_settings):
+    make_settings(auto_closing=False)
+    day1, day2 = TODAY - timedelta(days=2), TODAY - timedelta(days=1)
+    for day in (day1, day2):
+        _open_day(db, store, day)
+    old = [make_waiting(day1, 1, phone="01000000001"), make_waiting(day1, 2, phone="01000000002")]
+    make_waiting(day1, 3, status="attended")
+    new = [make_waiting(day2, 1, phone="01000000003")]
+
+    assert RolloverScheduler.rollover_store(db, store.id, TODAY)
+
+    carried = _waitings(db, store, TODAY)
+    assert [w.id for w in carried] == [w.id for w in old + new]
+    assert [w.waiting_number for w in carried] == [1, 2, 3]
+    assert _waitings(db, store, day1) == [] and _waitings(db, store, day2) == []
+    stale = db.query(models.DailyClosing).filter(
+        models.DailyClosing.store_id == store.id,
+        models.DailyClosing.business_date < TODAY
+    ).all()
+    assert all(business.is_closed for business in stale)
+    today = db.query(models.DailyClosing).filter_by(store_id=store.id, business_date=TODAY).one()
+    assert not today.is_closed and today.total_waiting == 3
+
+
+def test_carries_into_already_open_day(db, store, make_waiting, make_settings):
+    make_settings(auto_closing=False)
+    day1 = TODAY - timedelta(days=1)
+    _open_day(db, store, day1)
+    _open_day(db, store, TODAY)
+    make_waiting(TODAY, 1, phone="01000000011")
+    pending = make_waiting(day1, 1, phone="01000000012")
+
+    assert RolloverScheduler.rollover_store(db, store.id, TODAY)
+
+    carried = _waitings(db, store, TODAY)
+    assert [w.waiting_number for w in carried] == [1, 2]
+    assert carried[-1].id == pending.id
+
+
+def test_rollover_publishes_queue_changed(db, store, make_settings, monkeypatch):
+    make_settings(auto_closing=True)
+    _open_day(db, store, TODAY - timedelta(days=1))
+    published = []
+    monkeypatch.setattr(rollover_module.sse_outbox, "publish",
+                        lambda db, **kwargs: published.append(kwargs))
+    monkeypatch.setattr(rollover_module, "get_today_date", lambda start_hour: TODAY)
+
+    rolled = RolloverScheduler().run_batch()
+
+    assert (store.id, TODAY) in rolled
+    event = next(e for e in published if e["store_id"] == str(store.id))
+    assert event["event_type"] == "queue_changed"
+    assert event["data"]["business_date"] == TODAY.isoformat()
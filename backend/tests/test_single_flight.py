@@ -0,0 +1,43 @@
+"""single-flight - 계산 전용 세션, 먼저 요청한 클라이언트가 끊겨도 함께 대기한 요청은 결과 수신"""
+import asyncio
+import threading
+import time
+
+from sqlalchemy import text
+
+from services.single_flight import SingleFlight
+
+
+def test_compute_gets_own_session_and_closes_it():
+    flight = SingleFlight()
+    sessions = []
+
+    def compute(db, value):
+        sessions.append((db, threading.current_thread()))
+        return db.execute(text("SELECT :v"), {"v": value}).scalar()
+
+    assert asyncio.run(flight.run(("k", 1), compute, 7)) == 7
+    db, thread = sessions[0]
+    assert thread is not threading.main_thread()
+    assert not db.in_transaction()  # 계산이 끝나면 세션 종료
+
+
+def test_cancelled_first_caller_does_not_break_joined_requests():
+    flight = SingleFlight()
+    calls = []
+
+    def compute(db, store_id):
+        calls.append(store_id)
+        time.sleep(0.2)
+        return db.execute(text("SELECT :v"), {"v": store_id}).scalar()
+
+    async def scenario():
+        first = asyncio.create_task(flight.run(("board", 3), compute, 3))
+        await asyncio.sleep(0.05)
+        joined = asyncio.create_task(flight.run(("board", 3), compute, 3))
+        await asyncio.sleep(0.01)
+        first.cancel()  # 먼저 요청한 클라이언트 연결 끊김
+        return await joined
+
+    assert asyncio.run(scenario()) == 3
+    assert calls == [3]
@@ -42,6 +42,38 @@ function StatusContent({ storeCode }: { storeCode: string }) {
         }
     }, [searchParams]);
 
+    // Live ticket channel: server pushes position changes and calls instead of polling
+    const waitingId = statusData?.found ? statusData.waiting_id : null;
+    useEffect(() => {
+        if (!waitingId || !phone) return;
+
+        const params = new URLSearchParams({ phone });
+        const es = new EventSource(`/api/public/waiting/${storeCode}/ticket/${waitingId}/stream?${params.toString()}`);
+
+        es.onmessage = (event) => {
+            try {
+                const message = JSON.parse(event.data);
+                switch (message.event) {
+                    case 'ticket_status':
+                        setStatusData((prev: any) => prev ? { ...prev, ...message.data } : prev);
+                        break;
+                    case 'ticket_called':
+                        setStatusData((prev: any) => prev ? { ...prev, ...message.data } : prev);
+                        toast.success('입장 차례입니다! 매장으로 와주세요.');
+                        break;
+                    case 'ticket_closed':
+                        es.close();
+                        checkStatus(phone);
+                        break;
+                }
+            } catch (e) {
+                console.error('[Ticket] Failed to parse message', e);
+            }
+        };
+
+        return () => es.close();
+    }, [storeCode, waitingId]);
+
     if (searched && statusData && statusData.found) {
         return (
             <Card className="w-full max-w-md shadow-lg border-primary/20">
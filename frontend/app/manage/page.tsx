@@ -17,7 +17,7 @@ import { useState } from 'react';
 function ManageContent() {
     usePolling(5000); // Poll every 5 seconds
     const searchParams = useSearchParams();
-    const { fetchStoreStatus, fetchClasses, setStoreId, isLoading, isConnected } = useWaitingStore();
+    const { bootstrap, setStoreId, isLoading, isConnected } = useWaitingStore();
     const [hasIdentity, setHasIdentity] = useState(false);
 
     useEffect(() => {
@@ -25,10 +25,9 @@ function ManageContent() {
         if (storeId) {
             setStoreId(storeId);
         }
-        // Fetch Store Info and Classes
-        fetchStoreStatus();
-        fetchClasses();
-    }, [searchParams, setStoreId, fetchStoreStatus, fetchClasses]);
+        // Fetch Store Info, Classes and the current class list in one request
+        bootstrap();
+    }, [searchParams, setStoreId, bootstrap]);
 
     // Manual polling removed - replaced by usePolling (SWR)
 
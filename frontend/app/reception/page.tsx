@@ -5,7 +5,7 @@ import useSWR from 'swr';
 import { Button } from '@/components/ui/button';
 import { toast } from 'sonner';
 import { Dialog, DialogContent, DialogHeader, DialogTitle, DialogDescription } from '@/components/ui/dialog';
-import api from '@/lib/api';
+import api, { newIdempotencyKey } from '@/lib/api';
 import { useWaitingStore } from '@/lib/store/useWaitingStore';
 import { Delete, Check, AlertCircle, UserRound, Loader2 } from 'lucide-react';
 import { GlobalLoader } from "@/components/ui/GlobalLoader";
@@ -75,10 +75,11 @@ export default function ReceptionPage() {
         }
     }, []);
 
-    const loadStoreSettings = useCallback(async () => {
+    // 초기 상태 일괄 조회 (매장 설정 + 다음 배정 교시)
+    const loadBootstrap = useCallback(async () => {
         try {
-            const storeRes = await api.get('/store');
-            const storeData = Array.isArray(storeRes.data) ? storeRes.data[0] : storeRes.data;
+            const { data } = await api.get('/bootstrap/reception');
+            const storeData = data.store;
             setStoreName(storeData?.name || storeData?.store_name || '매장 정보 없음');
             if (storeData) {
                 setStoreSettings(storeData);
@@ -86,6 +87,7 @@ export default function ReceptionPage() {
                     setKeypadStyle(storeData.keypad_style);
                 }
             }
+            setWaitingStatus(data.next_slot);
         } catch (error) {
             console.error('[ReceptionSettings] Load failed:', error);
         }
@@ -139,14 +141,14 @@ export default function ReceptionPage() {
             poll();
         }
 
-        // Initial settings load
-        loadStoreSettings();
+        // Initial settings + status load
+        loadBootstrap();
 
         return () => {
             isActive = false;
             clearTimeout(timeoutId);
         };
-    }, [loadStatus, setStoreId, isConnected]);
+    }, [loadStatus, loadBootstrap, setStoreId, isConnected]);
 
     // SWR Polling Implementation
     const fetchStatusSWR = useCallback(async () => {
@@ -404,6 +406,8 @@ export default function ReceptionPage() {
 
     // Timeout reference to clear existing timers
     const modalTimeoutRef = useRef<NodeJS.Timeout | null>(null);
+    // 응답을 받지 못한 접수 재시도 시 같은 Idempotency-Key 재사용 (중복 접수 방지)
+    const pendingRegistrationRef = useRef<{ body: string; key: string } | null>(null);
 
     const processRegistration = async (targetPhone: string, name?: string, partySizeTotals: number = 0, partySizeDetails: any = {}) => {
         setIsSubmitting(true);
@@ -423,7 +427,14 @@ export default function ReceptionPage() {
                 payload.party_size_details = JSON.stringify(partySizeDetails);
             }
 
-            const { data } = await api.post('/waiting/register', payload);
+            const body = JSON.stringify(payload);
+            if (pendingRegistrationRef.current?.body !== body) {
+                pendingRegistrationRef.current = { body, key: newIdempotencyKey() };
+            }
+            const { data } = await api.post('/waiting/register', payload, {
+                headers: { 'Idempotency-Key': pendingRegistrationRef.current.key }
+            });
+            pendingRegistrationRef.current = null;
             setResultDialog({ open: true, data });
             setPhoneNumber('');
             setMemberName(''); // Clear member name
@@ -487,6 +498,8 @@ export default function ReceptionPage() {
 
         } catch (error) {
             const err = error as any;
+            // 서버 응답을 받았으면 재시도 대상 아님 (네트워크 오류만 같은 키 유지)
+            if (err.response) pendingRegistrationRef.current = null;
             const errorMessage = err.response?.data?.detail || '접수에 실패했습니다.';
 
             // Show large modal for Duplicate or Business Logic Errors (400)
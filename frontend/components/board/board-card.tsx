@@ -66,7 +66,8 @@ export function BoardCard({ item }: BoardCardProps) {
 
     const finalName = enableMasking ? maskName(item.display_name) : item.display_name;
 
-    let displayText = template
+    // Server renders template + masking into display_text; compute locally only for older payloads
+    const displayText = item.display_text ?? template
         .replace(/{순번}/g, String(item.class_order))
         .replace(/{대기번호}/g, String(item.waiting_number))
         .replace(/{이름}/g, finalName)
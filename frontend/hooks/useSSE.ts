@@ -10,6 +10,7 @@ export function useSSE() {
         setConnected,
         setConnectionBlockState,
         refreshAll, // Use optimized refresh
+        bootstrap,
         handleClassClosed,
         handleClassReopened,
         selectedStoreId
@@ -55,6 +56,7 @@ export function useSSE() {
         }
 
         let reconnectTimeout: NodeJS.Timeout;
+        let hasOpened = false;
 
         const connectSSE = () => {
             // Get token
@@ -108,6 +110,11 @@ export function useSSE() {
             es.onopen = () => {
                 console.log('[SSE] Connection opened successfully');
                 setConnected(true);
+                // 재연결 시 끊긴 동안의 변경을 한 번의 요청으로 다시 동기화 (관리자 화면)
+                if (hasOpened && currentRole === 'admin') {
+                    bootstrap();
+                }
+                hasOpened = true;
             };
 
             es.onmessage = (event) => {
@@ -150,6 +157,7 @@ export function useSSE() {
                         case 'class_moved':
                         case 'empty_seat_inserted':
                         case 'batch_attendance':
+                        case 'queue_changed':
                             debouncedRefresh();
                             break;
                         case 'class_closed':
@@ -198,5 +206,5 @@ export function useSSE() {
                 clearTimeout(reconnectTimeout);
             }
         };
-    }, [selectedStoreId, setConnected, debouncedRefresh]);
+    }, [selectedStoreId, setConnected, debouncedRefresh, bootstrap]);
 }
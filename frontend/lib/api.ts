@@ -1,5 +1,5 @@
 
-import axios from 'axios';
+import axios, { InternalAxiosRequestConfig } from 'axios';
 
 // Create a configured axios instance
 export const api = axios.create({
@@ -10,6 +10,50 @@ export const api = axios.create({
     withCredentials: true,
 });
 
+// 대기열 변경 요청 (Idempotency-Key로 재시도 시 첫 응답 재생)
+const IDEMPOTENT_PATHS = /^\/(waiting|board)(\/|$)|^\/public\/waiting\/[^/]+\/register$/;
+
+export const newIdempotencyKey = (): string => {
+    if (typeof crypto !== 'undefined' && typeof crypto.randomUUID === 'function') {
+        return crypto.randomUUID();
+    }
+    // 비보안(HTTP) 환경 대체
+    return `${Date.now().toString(36)}-${Math.random().toString(36).slice(2)}${Math.random().toString(36).slice(2)}`;
+};
+
+// 응답을 받기 전까지 같은 동작(메서드 + 경로 + 본문, 예: 대기자 ID + 변경할 상태)은 같은 키 재사용
+// - 응답 없이 실패한 요청을 다시 누르거나 재시도해도 서버가 첫 처리 결과를 재생
+const IDEMPOTENCY_KEY_TTL_MS = 5 * 60 * 1000; // 서버 보관 시간(IDEMPOTENCY_TTL)과 동일
+// 서버가 아직 첫 요청을 처리 중이거나 일시적으로 거절한 응답 - 다음 재시도도 같은 키 사용
+const RETRYABLE_STATUSES = new Set([408, 409, 425, 429, 503]);
+const pendingActionKeys = new Map<string, { key: string; createdAt: number }>();
+
+declare module 'axios' {
+    interface InternalAxiosRequestConfig {
+        idempotencyAction?: string;
+    }
+}
+
+const actionKey = (action: string): string => {
+    const now = Date.now();
+    pendingActionKeys.forEach((entry, id) => {
+        if (now - entry.createdAt > IDEMPOTENCY_KEY_TTL_MS) pendingActionKeys.delete(id);
+    });
+    let entry = pendingActionKeys.get(action);
+    if (!entry) {
+        entry = { key: newIdempotencyKey(), createdAt: now };
+        pendingActionKeys.set(action, entry);
+    }
+    return entry.key;
+};
+
+const settleActionKey = (config: InternalAxiosRequestConfig | undefined, status?: number) => {
+    if (!config?.idempotencyAction) return;
+    // 응답이 없었거나(네트워크 오류/타임아웃) 재시도 대상 응답이면 키 유지
+    if (status === undefined || RETRYABLE_STATUSES.has(status)) return;
+    pendingActionKeys.delete(config.idempotencyAction);
+};
+
 // Request interceptor to add baseURL and auth headers
 api.interceptors.request.use(
     (config) => {
@@ -26,7 +70,15 @@ api.interceptors.request.use(
             }
         }
 
-        // 2. Add X-Store-Id and Authorization headers (Browser only)
+        // 2. Idempotency-Key for queue mutations (reused per logical action until a response arrives)
+        const method = (config.method || 'get').toUpperCase();
+        if (method !== 'GET' && config.url && IDEMPOTENT_PATHS.test(config.url) && !config.headers['Idempotency-Key']) {
+            const body = typeof config.data === 'string' ? config.data : JSON.stringify(config.data ?? null);
+            config.idempotencyAction = `${method} ${config.url} ${body}`;
+            config.headers['Idempotency-Key'] = actionKey(config.idempotencyAction);
+        }
+
+        // 3. Add X-Store-Id and Authorization headers (Browser only)
         if (typeof window !== 'undefined') {
             const storeId = localStorage.getItem('selected_store_id');
             if (storeId) {
@@ -47,8 +99,12 @@ api.interceptors.request.use(
 
 // Response interceptor for global error handling
 api.interceptors.response.use(
-    (response) => response,
+    (response) => {
+        settleActionKey(response.config, response.status);
+        return response;
+    },
     (error) => {
+        settleActionKey(error.config, error.response?.status);
         // Handle 401 Unauthorized
         if (error.response?.status === 401) {
             console.warn('[API] 401 Unauthorized - Redirecting to login');
@@ -82,6 +82,28 @@ export interface StoreSettings {
     [key: string]: any;
 }
 
+interface ClassSummary {
+    class_id: number;
+    class_name: string;
+    class_number: number;
+    start_time: string;
+    end_time: string;
+    max_capacity: number;
+    current_count: number;
+    total_count?: number;
+}
+
+const toClassInfo = (cls: ClassSummary): ClassInfo => ({
+    id: cls.class_id,
+    class_name: cls.class_name,
+    class_number: cls.class_number,
+    start_time: cls.start_time,
+    end_time: cls.end_time,
+    max_capacity: cls.max_capacity,
+    current_count: cls.current_count,
+    total_count: cls.total_count || cls.current_count
+});
+
 interface WaitingState {
     // Data
     classes: ClassInfo[];
@@ -114,6 +136,7 @@ interface WaitingState {
     selectClass: (classId: number) => void;
     fetchWaitingList: (classId: number) => Promise<void>;
     fetchStoreStatus: () => Promise<void>;
+    bootstrap: () => Promise<void>; // Whole screen state in one request (load / reconnect)
     setStoreId: (id: string) => void; // Added for reactive state
 
     // Real-time Event Handlers
@@ -198,6 +221,44 @@ export const useWaitingStore = create<WaitingState>((set, get) => ({
         }
     },
 
+    bootstrap: async () => {
+        try {
+            // 매장 설정, 영업일, 교시 현황, 마감 교시, 선택 교시 대기자 목록을 한 번에 조회
+            const { currentClassId } = get();
+            const { data } = await api.get('/bootstrap/manager', {
+                params: currentClassId ? { class_id: currentClassId } : undefined
+            });
+            const storeData = data.store;
+
+            if (storeData && storeData.store_id && !get().selectedStoreId) {
+                const idStr = String(storeData.store_id);
+                if (typeof window !== 'undefined') {
+                    localStorage.setItem('selected_store_id', idStr);
+                }
+                set({ selectedStoreId: idStr });
+            }
+
+            const classId: number | null = data.current_class_id;
+            set((state) => ({
+                storeName: storeData?.store_name || '매장 정보 없음',
+                storeSettings: storeData,
+                businessDate: data.business.display_date || '미개점',
+                sequentialClosing: storeData?.sequential_closing ?? false,
+                revisitBadgeStyle: storeData?.revisit_badge_style ?? 'indigo_solid',
+                classes: data.classes.map(toClassInfo),
+                closedClasses: new Set<number>(data.closed_class_ids),
+                currentClassId: classId,
+                waitingList: classId ? { ...state.waitingList, [classId]: data.waiting_list } : state.waitingList,
+                syncToken: data.sync_token
+            }));
+        } catch (error) {
+            console.error('[Store] Bootstrap failed, falling back to individual requests:', error);
+            await Promise.all([get().fetchStoreStatus(), get().fetchClasses()]);
+        } finally {
+            set({ isLoading: false });
+        }
+    },
+
     fetchClasses: async () => {
         try {
             console.log("Fetching classes...");
@@ -214,25 +275,7 @@ export const useWaitingStore = create<WaitingState>((set, get) => ({
                 console.warn("No classes returned from API");
             }
 
-            const classesData: ClassInfo[] = res.data.map((cls: {
-                class_id: number;
-                class_name: string;
-                class_number: number;
-                start_time: string;
-                end_time: string;
-                max_capacity: number;
-                current_count: number;
-                total_count?: number;
-            }) => ({
-                id: cls.class_id,
-                class_name: cls.class_name,
-                class_number: cls.class_number,
-                start_time: cls.start_time,
-                end_time: cls.end_time,
-                max_capacity: cls.max_capacity,
-                current_count: cls.current_count,
-                total_count: cls.total_count || cls.current_count
-            }));
+            const classesData: ClassInfo[] = res.data.map(toClassInfo);
 
             set({
                 classes: classesData,